@@ -0,0 +1,72 @@
+"""
+Compares posting custom events through pygame's queue against the window's event bus.
+
+4 producer threads each post 50,000 events as fast as they can, while the loop handles them,
+until every event was handled, lost, dropped or merged.
+Once pygame's queue is full, posting raises and the event is lost, so "lost" counts events that never reached the handler,
+the loop drains pygame's queue in batches(`batch_events`). The bus is measured with a 4096 event queue, with each overflow policy.
+"""
+from common import headless_window, report, timed
+import asyncio
+import threading
+import pygame
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.events.bus import Overflow
+
+THREADS = 4
+PER_THREAD = 50_000
+
+@dataclass
+class Progress(events.Event):
+    done: int
+
+window = headless_window()
+window.set_debug(False)
+window.batch_events = True
+
+def merge(older: events.Event, newer: events.Event) -> events.Event:
+    return newer
+
+def measure(policy: Overflow | None) -> list[object]:
+    if policy is not None:
+        window.bus.configure(Progress, 4096, policy, merge)
+    total = THREADS * PER_THREAD
+    received = 0
+    lost = [0] * THREADS
+    def on_progress(event: Progress) -> None:
+        nonlocal received
+        received += 1
+    def produce(index: int) -> None:
+        for done in range(PER_THREAD):
+            try:
+                window.post_event(Progress(done))
+            except pygame.error:
+                lost[index] += 1
+    def accounted() -> int:
+        return received + sum(lost) + window.bus.total_dropped + window.bus.coalesced.total()
+    async def main() -> None:
+        workers = [threading.Thread(target=produce, args=(index,)) for index in range(THREADS)]
+        for worker in workers:
+            worker.start()
+        while accounted() < total:
+            await asyncio.sleep(0.001)
+        for worker in workers:
+            worker.join()
+    window.bus.dropped.clear()
+    window.bus.coalesced.clear()
+    window.register_event_handler(Progress, on_progress)
+    try:
+        elapsed = timed(lambda: window.run_until_complete(main()))
+    finally:
+        window.unregister_event_handler(Progress, on_progress)
+        if policy is not None:
+            window.bus.remove(Progress)
+    return [
+        "pygame queue" if policy is None else f"bus, {policy.value}",
+        f"{total / elapsed:,.0f}", f"{received:,}", f"{total - received:,}",
+    ]
+
+if __name__ == "__main__":
+    rows = [measure(None), measure(Overflow.BLOCK), measure(Overflow.DROP_OLDEST), measure(Overflow.COALESCE)]
+    report(f"{THREADS} threads posting {PER_THREAD:,} events each", ["route", "events/s", "handled", "lost, dropped or merged"], rows)
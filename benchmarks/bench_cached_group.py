@@ -0,0 +1,43 @@
+"""
+Compares drawing a static form of 300 `Text` and `Box` widgets with a `Group`, which draws every widget each frame,
+and a `CachedGroup`, which renders them once into a surface and blits it.
+
+The best of 5 runs of 200 frames is reported, and the cached group's first(missed) draw is reported separately.
+"""
+from common import headless_window, timed, report
+from asyncui.display import Color
+from asyncui.graphics import Group, CachedGroup, Box, Text
+from asyncui.resources.fonts import FontManager
+
+FRAMES = 200
+REPEATS = 5
+
+window = headless_window((1280, 720))
+font = FontManager().load_system_font('arial')
+
+def form() -> list[Box | Text]:
+    widgets: list[Box | Text] = []
+    for index in range(150):
+        x, y = index % 5 * 250, index // 5 * 24
+        widgets.append(Box((x, y), (240, 22), Color(230, 230, 230)))
+        widgets.append(Text((x + 4, y + 2), font, 18, Color.BLACK, f"Field {index}: value"))
+    return widgets
+
+def frame_time(group: Group[Box | Text]) -> float:
+    surface = window.window
+    def frames() -> None:
+        for _ in range(FRAMES):
+            group.draw(surface, window.scale_factor)
+    return min(timed(frames) for _ in range(REPEATS)) / FRAMES
+
+if __name__ == "__main__":
+    plain = Group((10, 0), form())
+    plain.draw(window.window, 1)
+    cached = CachedGroup((10, 0), form())
+    first = timed(lambda: cached.draw(window.window, 1))
+    rows = [
+        ["Group", f"{frame_time(plain) * 1000:.3f}", "-", "-"],
+        ["CachedGroup", f"{frame_time(cached) * 1000:.3f}", f"{first * 1000:.2f}", f"{cached.cache_bytes / 1024:.0f}"],
+    ]
+    report(f"drawing a form of {len(plain)} widgets, ms per frame", ["group", "frame", "first draw", "cache KiB"], rows)
+    print(cached)
@@ -0,0 +1,66 @@
+"""
+Measures callback throughput of the Window loop, headless.
+
+Compares scheduling callbacks through the ready queue(`Window.call_soon`) against the old path,
+where every callback was posted to SDL's queue as an `ExecuteCallbackEvent`.
+
+Workloads:
+    chain - every callback schedules the next one, like the steps of a task
+    fan-out - a batch of callbacks is scheduled at once, like futures completing together
+    task steps - a task awaiting `asyncio.sleep(0)` repeatedly
+"""
+from common import headless_window, timed, report
+import asyncio
+from typing import Callable
+from asyncui.window import ExecuteCallbackEvent
+
+CALLBACKS = 50_000
+# SDL's queue is bounded, so the old path can only fan out this many callbacks at once
+FAN_OUT = 10_000
+
+window = headless_window()
+window.set_debug(False)
+
+Scheduler = Callable[[Callable[[], None]], object]
+def legacy(callback: Callable[[], None]) -> None:
+    window.post_event(ExecuteCallbackEvent(asyncio.Handle(callback, (), window, None)))
+def ready_queue(callback: Callable[[], None]) -> None:
+    window.call_soon(callback)
+
+def chain(schedule: Scheduler) -> None:
+    remaining = CALLBACKS
+    def step() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if remaining:
+            schedule(step)
+        else:
+            window.stop()
+    schedule(step)
+    window.run()
+
+def fan_out(schedule: Scheduler) -> None:
+    remaining = FAN_OUT
+    def step() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            window.stop()
+    for _ in range(FAN_OUT):
+        schedule(step)
+    window.run()
+
+async def steps() -> None:
+    for _ in range(CALLBACKS):
+        await asyncio.sleep(0)
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:,.0f}"
+
+if __name__ == "__main__":
+    rows = [
+        ["chain", rate(CALLBACKS, timed(lambda: chain(legacy))), rate(CALLBACKS, timed(lambda: chain(ready_queue)))],
+        ["fan-out", rate(FAN_OUT, timed(lambda: fan_out(legacy))), rate(FAN_OUT, timed(lambda: fan_out(ready_queue)))],
+        ["task steps", "", rate(CALLBACKS, timed(lambda: window.run_until_complete(steps())))],
+    ]
+    report("Callbacks per second", ["workload", "SDL event", "ready queue"], rows)
@@ -0,0 +1,56 @@
+"""
+Compares presenting full frames with `pygame.display.flip()` against damage tracking,
+which redraws and presents only the damaged rects, on a 1920x1080 window.
+
+The UI is a dashboard of 800 labelled cells and an input box, each frame either the input box's cursor blinks,
+or one cell's label changes. The best of 3 runs of 100 frames is reported.
+"""
+from common import headless_window, timed, report
+import pygame
+from asyncui.display import Color, drawable_renderer, damage
+from asyncui.graphics import Group, Box, Text, InputBox, InputBoxDisplay
+from asyncui.resources.fonts import FontManager
+from asyncui.window import Renderer
+
+FRAMES = 100
+REPEATS = 3
+
+window = headless_window((1920, 1080))
+font = FontManager().load_system_font('arial')
+
+cells: list[Box | Text] = []
+for index in range(800):
+    x, y = index % 40 * 48, 40 + index // 40 * 52
+    cells.append(Box((x, y), (46, 50), Color(200, 200, 200)))
+    cells.append(Text((x + 4, y + 14), font, 20, Color.BLACK, str(index)))
+search = InputBox(InputBoxDisplay((0, 0), Text(..., font, 30, Color.BLACK, "search"), Box(..., (400, 36), Color.WHITE), 6), lambda text: None, lambda text: None)
+ui = Group((0, 0), [Box((0, 0), (1920, 1080), Color(40, 40, 40)), *cells, search])
+# The group holds repositioned copies of it's widgets
+input_box = ui.widgets[-1]
+assert isinstance(input_box, InputBox)
+
+def blink(frame: int) -> None:
+    input_box.text_box = input_box.text_box.change_cursor_shown(frame % 2 == 0)
+def relabel(frame: int) -> None:
+    index = 2 + frame % 800 * 2
+    old = ui.widgets[index]
+    assert isinstance(old, Text)
+    ui.widgets[index] = new = old.changeText(str(frame))
+    damage(old, new)
+
+def rate(change: str, damage_tracking: bool) -> str:
+    renderer = Renderer(60, drawable_renderer(ui), damage_tracking)
+    window.renderer = renderer
+    update = blink if change == "cursor blink" else relabel
+    renderer.render_frame(window)
+    def frames() -> None:
+        for frame in range(FRAMES):
+            update(frame)
+            renderer.render_frame(window)
+    elapsed = min(timed(frames) for _ in range(REPEATS))
+    window.renderer = None
+    return f"{elapsed / FRAMES * 1000:.2f}"
+
+if __name__ == "__main__":
+    rows = [[change, rate(change, False), rate(change, True)] for change in ("cursor blink", "one label")]
+    report("ms per frame, 1920x1080", ["change", "full flip", "damage tracking"], rows)
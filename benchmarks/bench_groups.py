@@ -0,0 +1,44 @@
+"""
+Measures enabling and disabling a `Group` of buttons, like switching between pages of a UI.
+
+The first enable registers the buttons' handlers in the group's `HandlerGroup`,
+after that toggling the group flips the `HandlerGroup`'s flag and updates a count per event type,
+the best of 5 toggles is reported.
+Also measures what the disabled handlers cost the dispatcher, as they stay registered.
+"""
+from common import headless_window, timed, report
+import pygame
+from asyncui import events
+from asyncui.display import Color
+from asyncui.graphics import Group, Button, Box
+
+REPEATS = 5
+EVENTS = 200
+
+window = headless_window()
+window.set_debug(False)
+
+def buttons(count: int) -> Group[Button]:
+    return Group((0, 0), [Button((index % 64 * 10, index // 64 * 10), Box(..., (10, 10), Color.BLACK), lambda: None) for index in range(count)]) #type: ignore
+
+def toggle(count: int) -> list[str]:
+    group = buttons(count)
+    first = timed(group.enable)
+    group.disable()
+    def flip() -> None:
+        group.enable()
+        group.disable()
+    toggled = min(timed(flip) for _ in range(REPEATS)) / 2
+    # Misses every button, so only the dispatcher's cost is measured
+    press = events.marshal(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(1000, 1000), button=1, touch=False))
+    assert press is not None
+    def dispatch() -> None:
+        for _ in range(EVENTS):
+            window._handle_event(press)
+    disabled = min(timed(dispatch) for _ in range(REPEATS)) / EVENTS
+    group.handler_group.close()
+    return [f"{first * 1000:.2f}", f"{toggled * 1000:.4f}", f"{disabled * 1e6:.1f}"]
+
+if __name__ == "__main__":
+    rows = [[count, *toggle(count)] for count in (10, 500, 10_000)]
+    report("toggling a group of buttons", ["buttons", "first enable (ms)", "toggle (ms)", "click, disabled (us)"], rows)
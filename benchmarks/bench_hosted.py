@@ -0,0 +1,99 @@
+"""
+Compares input latency and CPU use between the Window's own event loop and hosted mode.
+
+Each mode runs in it's own interpreter, since the window is a singleton. In both, a 60 FPS renderer draws to the screen,
+first with no input, then while a thread posts a timestamped event every 2 milliseconds,
+whose handler records how long ago it was posted. CPU use is process time over wall time for each phase.
+
+    PYTHONPATH=src python benchmarks/bench_hosted.py
+"""
+from common import report
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+SECONDS = 3
+INTERVAL = 0.002
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+def child(mode: str) -> None:
+    import pygame
+    from asyncui import events
+    from asyncui.window import Window
+
+    @dataclass
+    class Stamp(events.Event):
+        sent: float
+
+    pygame.init()
+    window = Window(pygame.display.set_mode((1280, 720)), (1280, 720), "benchmark", hosted=mode == 'hosted')
+    window.set_debug(False)
+    latencies: list[float] = []
+    def on_stamp(event: Stamp) -> None:
+        latencies.append(time.perf_counter() - event.sent)
+    def render(window: Window) -> None:
+        window.window.fill((0, 0, 0))
+        for x in range(0, 1280, 8):
+            pygame.draw.line(window.window, (255, 255, 255), (x, 0), (1280 - x, 720))
+    def post(stop: threading.Event) -> None:
+        while not stop.is_set():
+            window.post_event(Stamp(time.perf_counter()))
+            time.sleep(INTERVAL)
+
+    async def phase(with_input: bool) -> float:
+        stop = threading.Event()
+        thread = threading.Thread(target=post, args=(stop,))
+        if with_input:
+            thread.start()
+        cpu, wall = time.process_time(), time.perf_counter()
+        await asyncio.sleep(SECONDS)
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+        stop.set()
+        if with_input:
+            thread.join()
+        return cpu / wall * 100
+    async def main() -> dict[str, float]:
+        window.register_event_handler(Stamp, on_stamp)
+        window.start_renderer(60, render)
+        if mode == 'hosted':
+            asyncio.create_task(window.host())
+        # Let everything start up first
+        await asyncio.sleep(0.5)
+        idle = await phase(False)
+        busy = await phase(True)
+        milliseconds = [latency * 1000 for latency in latencies]
+        window.stop()
+        return {
+            'idle_cpu': idle, 'input_cpu': busy,
+            'p50': statistics.median(milliseconds), 'p99': percentile(milliseconds, 99), 'max': max(milliseconds),
+        }
+
+    if mode == 'hosted':
+        results = asyncio.run(main())
+    else:
+        results = window.run_until_complete(main())
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+        sys.exit()
+    rows = []
+    for mode in ('native', 'hosted'):
+        output = subprocess.run([sys.executable, __file__, mode], env=os.environ, capture_output=True, text=True, check=True).stdout
+        results = json.loads(output.splitlines()[-1])
+        rows.append([
+            mode,
+            f"{results['p50']:.3f}", f"{results['p99']:.3f}", f"{results['max']:.3f}",
+            f"{results['idle_cpu']:.1f}%", f"{results['input_cpu']:.1f}%",
+        ])
+    report("input latency (milliseconds) and CPU use with a 60 FPS renderer",
+           ["mode", "p50", "p99", "max", "idle CPU", "input CPU"], rows)
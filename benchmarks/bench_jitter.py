@@ -0,0 +1,65 @@
+"""
+Measures how late `asyncio.sleep(1/120)` wakes up in the Window loop, and the CPU used while sleeping.
+
+Compares pygame's millisecond wait alone(`precise_wait = 0`) against finishing the wait with `time.sleep`,
+both idle and while a thread posts 1000 mouse motion events per second.
+"""
+from common import headless_window, report
+import asyncio
+import statistics
+import threading
+import time
+import pygame
+from asyncui import events
+
+SLEEPS = 600
+INTERVAL = 1/120
+
+window = headless_window()
+window.set_debug(False)
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+async def sleeps() -> list[float]:
+    lateness: list[float] = []
+    for _ in range(SLEEPS):
+        start = time.perf_counter()
+        await asyncio.sleep(INTERVAL)
+        lateness.append(time.perf_counter() - start - INTERVAL)
+    return lateness
+
+def measure(precise_wait: float, with_input: bool) -> list[object]:
+    window.precise_wait = precise_wait
+    stop = threading.Event()
+    def move_mouse() -> None:
+        while not stop.is_set():
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0), touch=False))
+            time.sleep(0.001)
+    def on_motion(event: events.MouseMove) -> None:
+        pass
+    thread = threading.Thread(target=move_mouse)
+    if with_input:
+        window.register_event_handler(events.MouseMove, on_motion)
+        thread.start()
+    cpu, wall = time.process_time(), time.perf_counter()
+    lateness = window.run_until_complete(sleeps())
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    if with_input:
+        stop.set()
+        thread.join()
+        window.unregister_event_handler(events.MouseMove, on_motion)
+
+    microseconds = [late * 1_000_000 for late in lateness]
+    return [
+        "pygame wait" if precise_wait == 0 else f"precise last {precise_wait * 1000:g} ms",
+        "1000 motion/s" if with_input else "idle",
+        f"{statistics.median(microseconds):.0f}",
+        f"{percentile(microseconds, 99):.0f}",
+        f"{min(microseconds):.0f}",
+        f"{cpu / wall * 100:.1f}%",
+    ]
+
+if __name__ == "__main__":
+    rows = [measure(precise_wait, with_input) for with_input in (False, True) for precise_wait in (0, 0.002)]
+    report("asyncio.sleep(1/120) lateness (microseconds)", ["wait", "load", "p50", "p99", "min", "CPU"], rows)
@@ -0,0 +1,39 @@
+"""
+Measures `events.marshal` throughput and the memory held by each marshalled event.
+
+Memory is measured with `tracemalloc`, as the bytes allocated per event for a list of marshalled events,
+it does not include the pygame event each one was marshalled from.
+"""
+from common import report
+import time
+import tracemalloc
+import pygame
+from asyncui import events
+
+MARSHALS = 200_000
+KEPT = 10_000
+
+samples = {
+    'KeyDown': pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=pygame.KMOD_LSHIFT | pygame.KMOD_CAPS, unicode='A', scancode=4, window=None),
+    'MouseMove': pygame.event.Event(pygame.MOUSEMOTION, pos=(100, 200), rel=(3, -1), buttons=(1, 0, 0), touch=False, window=None),
+}
+
+def throughput(event: pygame.event.Event) -> float:
+    marshal = events.marshal
+    start = time.perf_counter()
+    for _ in range(MARSHALS):
+        marshal(event)
+    return MARSHALS / (time.perf_counter() - start)
+
+def memory(event: pygame.event.Event) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [events.marshal(event) for _ in range(KEPT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds a pointer per event
+    return (after - before) / len(kept) - 8
+
+if __name__ == "__main__":
+    rows = [[name, f"{throughput(event):,.0f}", f"{memory(event):.0f}"] for name, event in samples.items()]
+    report("events.marshal", ["event", "events/s", "bytes/event"], rows)
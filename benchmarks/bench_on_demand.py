@@ -0,0 +1,74 @@
+"""
+Measures the CPU used by `examples/menus.py`, rendering at a fixed 15 FPS and rendering on demand(capped at 15 FPS),
+and without rendering, which is what the event loop itself uses.
+
+Each mode runs the example in a child process, with the renderer's mode forced and `Window.run` replaced by a scenario:
+idle for 3 seconds, then active for 3 seconds, clicking the options menu open and closed every 100ms.
+CPU is the process's CPU time divided by the wall time, so 100% is one core.
+"""
+import common  # noqa: F401 - sets the dummy video driver
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import runpy
+import pygame
+from typing import Any, Callable
+from common import report
+from asyncui.window import Window, Renderer
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), '..', 'examples', 'menus.py')
+SECONDS = 3.0
+
+def child(mode: str) -> None:
+    frames = 0
+    start_renderer = Window.start_renderer
+    def forced(self: Window, fps: int, renderer: Callable[[Window], None], damage_tracking: bool = False, on_demand: bool = False) -> Renderer:
+        def counted(window: Window) -> None:
+            nonlocal frames
+            frames += 1
+            renderer(window)
+        if mode == "no renderer":
+            return Renderer(fps, counted)
+        return start_renderer(self, fps, counted, damage_tracking, mode == "on demand")
+    async def scenario(window: Window, gui: Any) -> None:
+        await asyncio.sleep(0.5)
+        results = {}
+        for phase in ("idle", "active"):
+            start_frames, cpu, wall = frames, time.process_time(), time.perf_counter()
+            if phase == "idle":
+                await asyncio.sleep(SECONDS)
+            while phase == "active" and time.perf_counter() - wall < SECONDS:
+                switch = gui.widgets[1].options[1].switch.body
+                pos = (int(switch.centerx * window.scale_factor), int(switch.centery * window.scale_factor))
+                for event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                    pygame.event.post(pygame.event.Event(event_type, pos=pos, button=1, touch=False))
+                await asyncio.sleep(0.1)
+            elapsed = time.perf_counter() - wall
+            results[phase] = ((time.process_time() - cpu) / elapsed * 100, (frames - start_frames) / elapsed)
+        print(json.dumps(results))
+    original_run = Window.run
+    def run(self: Window) -> None:
+        # Called at the end of the example, whose globals hold it's UI, `run_until_complete` calls it again
+        Window.run = original_run #type: ignore
+        gui = sys._getframe(1).f_globals['gui']
+        self.run_until_complete(scenario(self, gui))
+    Window.start_renderer = forced #type: ignore
+    Window.run = run #type: ignore
+    runpy.run_path(EXAMPLE, run_name='__main__')
+
+def measure(mode: str) -> dict[str, list[float]]:
+    result = subprocess.run([sys.executable, __file__, mode], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        rows = []
+        for mode in ("fixed", "on demand", "no renderer"):
+            results = measure(mode)
+            rows.append([mode, *(f"{results[phase][0]:.1f}% / {results[phase][1]:.1f}" for phase in ("idle", "active"))])
+        report("examples/menus.py, CPU / frames per second", ["renderer", "idle", "active"], rows)
@@ -0,0 +1,34 @@
+"""
+Measures how closely the renderer keeps to 60 FPS, with frames taking 2ms, 12ms and 20ms to render,
+the last is longer than a frame's 16.7ms budget, so frames are skipped to keep to the frame grid.
+
+Each run renders for 3 seconds on the real clock, and reports the renderer's `FrameStats`.
+"""
+from common import headless_window, report
+import asyncio
+import time
+from asyncui.window import Window
+
+FPS = 60
+SECONDS = 3.0
+
+window = headless_window()
+
+def run(render_time: float) -> list[object]:
+    def renderer(window: Window) -> None:
+        end = time.perf_counter() + render_time
+        while time.perf_counter() < end:
+            pass
+    rendering = window.start_renderer(FPS, renderer)
+    try:
+        window.run_until_complete(asyncio.sleep(SECONDS))
+    finally:
+        rendering.stop()
+    window.run_until_complete(asyncio.sleep(0.05))
+    stats = rendering.stats
+    return [f"{render_time * 1000:.0f}", f"{stats.frames / SECONDS:.1f}", f"{stats.p50 * 1000:.2f}", f"{stats.p95 * 1000:.2f}", f"{stats.p99 * 1000:.2f}",
+            stats.missed, stats.skipped, f"{stats.rendering * 1000:.2f}", f"{stats.presenting * 1000:.3f}"]
+
+if __name__ == "__main__":
+    rows = [run(render_time) for render_time in (0.002, 0.012, 0.020)]
+    report(f"frame pacing at {FPS} FPS, times in ms", ["render", "fps", "p50", "p95", "p99", "missed", "skipped", "rendering", "presenting"], rows)
@@ -0,0 +1,80 @@
+"""
+Measures how bursts of background callbacks delay input and frames, with and without the frame budget.
+
+Every 100 milliseconds a burst of 250 callbacks, taking 0.2 milliseconds each, is scheduled at once,
+while a 60 FPS renderer runs and a thread posts a timestamped event every 5 milliseconds.
+"Unbudgeted" runs every ready callback in one go, like the loop did before priority classes,
+and "no bursts" shows the jitter of the machine itself.
+"""
+from common import headless_window, report
+import asyncio
+import math
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.window import Window
+
+SECONDS = 3
+BURST = 250
+WORK = 0.0002
+
+window = headless_window((1280, 720))
+window.set_debug(False)
+
+@dataclass
+class Stamp(events.Event):
+    sent: float
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+def work() -> None:
+    end = time.perf_counter() + WORK
+    while time.perf_counter() < end:
+        pass
+
+def measure(budgeted: bool, burst: int = BURST) -> list[object]:
+    window.callback_slice, window.frame_margin = (0.005, 0.002) if budgeted else (math.inf, -math.inf)
+    latencies: list[float] = []
+    frames: list[float] = []
+    stop = threading.Event()
+    def on_stamp(event: Stamp) -> None:
+        latencies.append(time.perf_counter() - event.sent)
+    def post() -> None:
+        while not stop.is_set():
+            window.post_event(Stamp(time.perf_counter()))
+            time.sleep(0.005)
+    def render(window: Window) -> None:
+        frames.append(time.perf_counter())
+        window.window.fill((0, 0, 0))
+    async def bursts() -> None:
+        end = time.perf_counter() + SECONDS
+        while time.perf_counter() < end:
+            for _ in range(burst):
+                window.call_soon(work)
+            await asyncio.sleep(0.1)
+
+    window.register_event_handler(Stamp, on_stamp)
+    renderer = window.start_renderer(60, render)
+    thread = threading.Thread(target=post)
+    thread.start()
+    window.run_until_complete(bursts())
+    stop.set()
+    thread.join()
+    renderer.stop()
+    window.unregister_event_handler(Stamp, on_stamp)
+
+    milliseconds = [latency * 1000 for latency in latencies]
+    intervals = [(after - before) * 1000 for before, after in zip(frames, frames[1:])]
+    return [
+        "no bursts" if not burst else "budgeted" if budgeted else "unbudgeted",
+        f"{statistics.median(milliseconds):.2f}", f"{percentile(milliseconds, 99):.2f}",
+        f"{percentile(intervals, 99):.2f}", f"{max(intervals):.2f}", len(frames),
+    ]
+
+if __name__ == "__main__":
+    rows = [measure(True, 0), measure(False), measure(True)]
+    report("input latency and frame intervals under callback bursts (milliseconds)",
+           ["scheduler", "input p50", "input p99", "frame p99", "frame max", "frames"], rows)
@@ -0,0 +1,86 @@
+"""
+Measures how long it takes the Window loop to notice a readable socket, while input and rendering are active.
+
+A thread writes a timestamp to a socket pair every few milliseconds, and a reader registered with `Window.add_reader`
+records how long ago it was written. This runs idle, then with a 60 FPS renderer drawing to the screen
+and a thread posting 1000 mouse motion events per second.
+"""
+from common import headless_window, report
+import asyncio
+import socket
+import statistics
+import struct
+import threading
+import time
+import pygame
+from asyncui import events
+from asyncui.window import Window
+
+SAMPLES = 500
+INTERVAL = 0.004
+
+window = headless_window((1280, 720))
+window.set_debug(False)
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+def measure(busy: bool) -> list[object]:
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    latencies: list[float] = []
+    done = window.create_future()
+    stop = threading.Event()
+
+    def on_readable() -> None:
+        now = time.perf_counter()
+        data = reader.recv(8 * SAMPLES)
+        for (sent,) in struct.iter_unpack('d', data):
+            latencies.append(now - sent)
+        if len(latencies) >= SAMPLES and not done.done():
+            done.set_result(None)
+    def send() -> None:
+        while not stop.is_set():
+            writer.send(struct.pack('d', time.perf_counter()))
+            time.sleep(INTERVAL)
+    def move_mouse() -> None:
+        while not stop.is_set():
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0), touch=False))
+            time.sleep(0.001)
+    def on_motion(event: events.MouseMove) -> None:
+        pass
+    def render(window: Window) -> None:
+        window.window.fill((0, 0, 0))
+        for x in range(0, 1280, 8):
+            pygame.draw.line(window.window, (255, 255, 255), (x, 0), (1280 - x, 720))
+
+    window.add_reader(reader, on_readable)
+    threads = [threading.Thread(target=send)]
+    if busy:
+        window.register_event_handler(events.MouseMove, on_motion)
+        renderer = window.start_renderer(60, render)
+        threads.append(threading.Thread(target=move_mouse))
+    for thread in threads:
+        thread.start()
+    window.run_until_complete(asyncio.wait_for(done, 30))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    window.remove_reader(reader)
+    reader.close()
+    writer.close()
+    if busy:
+        renderer.stop()
+        window.unregister_event_handler(events.MouseMove, on_motion)
+
+    milliseconds = [latency * 1000 for latency in latencies]
+    return [
+        "input + 60 FPS rendering" if busy else "idle",
+        f"{statistics.median(milliseconds):.3f}",
+        f"{percentile(milliseconds, 99):.3f}",
+        f"{max(milliseconds):.3f}",
+    ]
+
+if __name__ == "__main__":
+    rows = [measure(False), measure(True)]
+    report("add_reader readiness latency (milliseconds)", ["load", "p50", "p99", "max"], rows)
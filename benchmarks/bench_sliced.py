@@ -0,0 +1,83 @@
+"""
+Measures how building 20,000 Box widgets on the event loop affects a 60 FPS renderer and input latency,
+done in one go or through `Window.run_sliced` with different budgets.
+Only the widgets are built, since putting them in a `Group` is a single call which can't be sliced.
+
+A thread posts a timestamped event every 5 milliseconds, whose handler records how long ago it was posted.
+"""
+from common import headless_window, report
+import asyncio
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Generator
+from asyncui import events
+from asyncui.display import Color
+from asyncui.graphics import Box
+from asyncui.window import Window
+
+WIDGETS = 20_000
+
+window = headless_window((1280, 720))
+window.set_debug(False)
+
+@dataclass
+class Stamp(events.Event):
+    sent: float
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+def build() -> Generator[None, None, list[Box]]:
+    widgets = []
+    for index in range(WIDGETS):
+        widgets.append(Box((index % 1280, index // 1280), (4, 4), Color.BLACK))
+        yield
+    return widgets
+
+def measure(budget: float | None) -> list[object]:
+    latencies: list[float] = []
+    frames: list[float] = []
+    stop = threading.Event()
+    def on_stamp(event: Stamp) -> None:
+        latencies.append(time.perf_counter() - event.sent)
+    def post() -> None:
+        while not stop.is_set():
+            window.post_event(Stamp(time.perf_counter()))
+            time.sleep(0.005)
+    def render(window: Window) -> None:
+        frames.append(time.perf_counter())
+        window.window.fill((0, 0, 0))
+    async def main() -> float:
+        start = time.perf_counter()
+        if budget is None:
+            for _ in build():
+                pass
+        else:
+            await window.run_sliced(build(), budget)
+        return time.perf_counter() - start
+
+    window.register_event_handler(Stamp, on_stamp)
+    renderer = window.start_renderer(60, render)
+    thread = threading.Thread(target=post)
+    thread.start()
+    window.run_until_complete(asyncio.sleep(0.2))
+    elapsed = window.run_until_complete(main())
+    window.run_until_complete(asyncio.sleep(0.2))
+    stop.set()
+    thread.join()
+    renderer.stop()
+    window.unregister_event_handler(Stamp, on_stamp)
+
+    milliseconds = [latency * 1000 for latency in latencies]
+    intervals = [(after - before) * 1000 for before, after in zip(frames, frames[1:])]
+    return [
+        "blocking" if budget is None else f"sliced, {budget:g} ms",
+        f"{elapsed * 1000:.0f}", f"{percentile(milliseconds, 99):.2f}", f"{max(milliseconds):.2f}", f"{max(intervals):.2f}",
+    ]
+
+if __name__ == "__main__":
+    rows = [measure(None), measure(1), measure(4), measure(8)]
+    report(f"building {WIDGETS:,} widgets while rendering at 60 FPS (milliseconds)",
+           ["mode", "total time", "input p99", "input max", "frame max"], rows)
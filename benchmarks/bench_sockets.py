@@ -0,0 +1,67 @@
+"""
+Streams 1 GB over a Unix socket into the Window loop, while a renderer runs at 60 FPS.
+
+A thread stands in for the data source, it listens on a Unix socket and sends the data with blocking writes.
+The loop reads it with `asyncio.open_unix_connection`, and reports the throughput and the frame rate the renderer achieved.
+The amount of data can be changed with the first command line argument, in MB.
+"""
+from common import headless_window, report
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import pygame
+from asyncui.window import Window
+
+TOTAL = int(sys.argv[1]) * 1024 * 1024 if len(sys.argv) > 1 else 1024 ** 3
+CHUNK = 1024 * 1024
+
+window = headless_window((1280, 720))
+window.set_debug(False)
+
+def serve(listener: socket.socket) -> None:
+    connection, _ = listener.accept()
+    chunk = memoryview(os.urandom(CHUNK))
+    with connection:
+        for _ in range(TOTAL // CHUNK):
+            connection.sendall(chunk)
+
+frames = 0
+def render(window: Window) -> None:
+    global frames
+    frames += 1
+    window.window.fill((frames % 255, 0, 0))
+    pygame.draw.circle(window.window, (255, 255, 255), (frames % 1280, 360), 50)
+
+async def receive(path: str) -> int:
+    reader, writer = await asyncio.open_unix_connection(path)
+    received = 0
+    while data := await reader.read(CHUNK):
+        received += len(data)
+    writer.close()
+    return received
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'source')
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen()
+        source = threading.Thread(target=serve, args=(listener,))
+        source.start()
+
+        renderer = window.start_renderer(60, render)
+        start = time.perf_counter()
+        received = window.run_until_complete(receive(path))
+        elapsed = time.perf_counter() - start
+        renderer.stop()
+        source.join()
+        listener.close()
+
+    assert received == TOTAL, f"received {received} bytes, expected {TOTAL}"
+    report("Unix socket stream into the Window loop", ["MB", "seconds", "MB/s", "frames/s"], [
+        [TOTAL // (1024 * 1024), f"{elapsed:.2f}", f"{TOTAL / (1024 * 1024) / elapsed:,.0f}", f"{frames / elapsed:.1f}"]
+    ])
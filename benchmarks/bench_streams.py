@@ -0,0 +1,65 @@
+"""
+Compares consuming events with a loop awaiting `Window.get_event` against `async for` over `Window.events`.
+
+A thread posts 200,000 events through the event bus(with `Overflow.BLOCK`, so none are dropped before they're handled),
+and a coroutine counts the ones it receives. `get_event` registers a handler for each event, so events handled
+while the coroutine isn't waiting are missed, the stream's buffer keeps them.
+"""
+from common import headless_window, timed, report
+import asyncio
+import threading
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.events.bus import Overflow
+
+EVENTS = 200_000
+
+@dataclass
+class Tick(events.Event):
+    value: int
+
+window = headless_window()
+window.set_debug(False)
+window.bus.configure(Tick, 4096, Overflow.BLOCK)
+
+received = 0
+
+async def get_event_loop() -> None:
+    global received
+    while True:
+        await window.get_event(Tick)
+        received += 1
+
+async def stream() -> None:
+    global received
+    async with window.events(Tick, maxsize=4096) as ticks:
+        async for _ in ticks:
+            received += 1
+
+def measure(consumer: str) -> list[object]:
+    global received
+    received = 0
+    finished = threading.Event()
+    def produce() -> None:
+        for value in range(EVENTS):
+            window.post_event(Tick(value))
+        finished.set()
+    async def main() -> None:
+        task = asyncio.ensure_future(get_event_loop() if consumer == 'get_event' else stream())
+        # Let the consumer start waiting first
+        await asyncio.sleep(0)
+        thread = threading.Thread(target=produce)
+        thread.start()
+        while not finished.is_set() or window.bus.pending:
+            await asyncio.sleep(0.001)
+        # The last batch is handled before the loop gets back here, give the consumer a turn for it
+        await asyncio.sleep(0)
+        thread.join()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    elapsed = timed(lambda: window.run_until_complete(main()))
+    return [consumer, f"{EVENTS / elapsed:,.0f}", f"{received / elapsed:,.0f}", f"{received:,}", f"{EVENTS - received:,}"]
+
+if __name__ == "__main__":
+    rows = [measure('get_event'), measure('events')]
+    report(f"consuming {EVENTS:,} events", ["consumer", "posted/s", "received/s", "received", "missed"], rows)
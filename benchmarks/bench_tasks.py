@@ -0,0 +1,44 @@
+"""
+Measures how many tasks per second `Window.create_task` handles, with different task factories.
+
+Workloads:
+    immediate - coroutines that return without awaiting anything, like a click handler
+    one await - coroutines that await `asyncio.sleep(0)` once before returning
+
+The eager task factory needs Python 3.12+, and is skipped on older versions.
+"""
+from common import headless_window, timed, report
+import asyncio
+from typing import Any, Callable
+
+TASKS = 100_000
+
+window = headless_window()
+window.set_debug(False)
+
+async def immediate() -> int:
+    return 1
+async def one_await() -> int:
+    await asyncio.sleep(0)
+    return 1
+
+def plain_factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> 'asyncio.Task[Any]':
+    return asyncio.Task(coro, loop=loop, **kwargs)
+
+def rate(factory: Callable[..., Any] | None, coroutine: Callable[[], Any]) -> str:
+    window.set_task_factory(factory)
+    async def main() -> None:
+        tasks = [window.create_task(coroutine()) for _ in range(TASKS)]
+        await asyncio.gather(*tasks)
+    try:
+        elapsed = timed(lambda: window.run_until_complete(main()))
+    finally:
+        window.set_task_factory(None)
+    return f"{TASKS / elapsed:,.0f}"
+
+if __name__ == "__main__":
+    factories: list[tuple[str, Callable[..., Any] | None]] = [("none", None), ("plain factory", plain_factory)]
+    if hasattr(asyncio, 'eager_task_factory'):
+        factories.append(("eager_task_factory", asyncio.eager_task_factory))
+    rows = [[name, rate(factory, immediate), rate(factory, one_await)] for name, factory in factories]
+    report("Tasks per second through Window.create_task", ["factory", "immediate", "one await"], rows)
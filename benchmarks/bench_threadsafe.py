@@ -0,0 +1,63 @@
+"""
+Measures the throughput of callbacks scheduled from other threads, and how many wakeup events they post,
+counting both the ones handled and the ones still in pygame's queue afterwards.
+
+Producer threads each schedule a batch of callbacks with `call_soon_threadsafe` while the loop runs,
+then a thread pool finishes many tiny jobs through `run_in_executor`.
+"""
+from common import headless_window, report, timed
+import asyncio
+import threading
+import pygame
+from asyncui.window import Window, WakeupEvent
+
+PER_THREAD = 20_000
+JOBS = 20_000
+
+window = headless_window()
+window.set_debug(False)
+
+wakeups = 0
+def count_wakeup(event: WakeupEvent) -> None:
+    global wakeups
+    wakeups += 1
+window.register_event_handler(WakeupEvent, count_wakeup)
+
+def posted_wakeups() -> int:
+    return wakeups + len(pygame.event.get(WakeupEvent.type))
+
+def producers(threads: int) -> list[object]:
+    global wakeups
+    wakeups = 0
+    remaining = threads * PER_THREAD
+    done = window.create_future()
+    def callback() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            done.set_result(None)
+    def produce() -> None:
+        for _ in range(PER_THREAD):
+            window.call_soon_threadsafe(callback)
+    workers = [threading.Thread(target=produce) for _ in range(threads)]
+    def run() -> None:
+        for worker in workers:
+            worker.start()
+        window.run_until_complete(done)
+        for worker in workers:
+            worker.join()
+    elapsed = timed(run)
+    total = threads * PER_THREAD
+    return [f"{threads} producer threads", total, f"{total / elapsed:,.0f}", posted_wakeups()]
+
+def executor() -> list[object]:
+    global wakeups
+    wakeups = 0
+    async def main() -> None:
+        await asyncio.gather(*(window.run_in_executor(None, abs, -index) for index in range(JOBS)))
+    elapsed = timed(lambda: window.run_until_complete(main()))
+    return ["run_in_executor", JOBS, f"{JOBS / elapsed:,.0f}", posted_wakeups()]
+
+if __name__ == "__main__":
+    rows = [producers(1), producers(4), producers(16), executor()]
+    report("callbacks from other threads", ["workload", "callbacks", "callbacks/s", "wakeup events"], rows)
@@ -0,0 +1,50 @@
+"""
+Measures how the cost of `TimerList` grows with the number of pending timers.
+
+For each timer count it reports, per operation:
+    schedule - `Window.call_later`, pushing a timer onto the heap
+    wakeup - one pass of `TimerList.soonest` with nothing due, which the loop does every iteration
+    cancel - `TimerHandle.cancel`, which is lazy
+    fire - popping a due timer and scheduling its callback
+"""
+from common import headless_window, timed, report
+import random
+import pygame
+
+WAKEUPS = 1000
+
+def bench(timer_count: int) -> list[object]:
+    window = headless_window()
+    # Debug mode captures a traceback for every handle, which would dominate the timings
+    window.set_debug(False)
+    random.seed(timer_count)
+    delays = [random.uniform(1000, 2000) for _ in range(timer_count)]
+
+    handles = []
+    schedule = timed(lambda: handles.extend(window.call_later(delay, lambda: None) for delay in delays))
+    now = window.time()
+    wakeup = timed(lambda: [window.timers.soonest(now) for _ in range(WAKEUPS)])
+    cancel = timed(lambda: [handle.cancel() for handle in handles])
+    window.timers.soonest(now)
+    assert len(window.timers) == 0
+
+    # Fire in chunks, so the SDL queue is never overfilled
+    fire = 0.
+    chunk = 1000
+    for start in range(0, timer_count, chunk):
+        for delay in delays[start:start+chunk]:
+            window.call_at(now - delay, lambda: None)
+        fire += timed(lambda: window.timers.soonest(now))
+        pygame.event.clear()
+
+    return [
+        timer_count,
+        f"{schedule / timer_count * 1e6:.2f}",
+        f"{wakeup / WAKEUPS * 1e6:.2f}",
+        f"{cancel / timer_count * 1e6:.2f}",
+        f"{fire / timer_count * 1e6:.2f}",
+    ]
+
+if __name__ == "__main__":
+    rows = [bench(count) for count in (10, 100, 1_000, 10_000, 100_000)]
+    report("TimerList cost per operation (microseconds)", ["timers", "schedule", "wakeup", "cancel", "fire"], rows)
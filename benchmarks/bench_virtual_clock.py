@@ -0,0 +1,61 @@
+"""
+Measures how fast a `VirtualClock` runs a UI's timers, and that runs with it are repeatable.
+
+The workload is a 60 FPS renderer, 10 animations stepping every 1/30 of a second,
+and 10 debounced handlers whose timers are restarted every 100 milliseconds and fire after 250.
+Ten minutes of it run on a virtual clock, twice, and 2 seconds of it on the real clock for comparison.
+"frames" is the number of frames rendered, and "checksum" sums the loop times every timer fired at,
+which is the same on every virtual run.
+"""
+from common import headless_window, report, timed
+import asyncio
+from asyncui.clock import Clock, VirtualClock
+from asyncui.window import Window
+
+ANIMATIONS = 10
+DEBOUNCERS = 10
+
+window = headless_window()
+window.set_debug(False)
+
+def measure(clock: Clock, seconds: float) -> list[object]:
+    window.set_clock(clock)
+    frames = 0
+    checksum = 0.0
+    def render(window: Window) -> None:
+        nonlocal frames
+        frames += 1
+    def fired() -> None:
+        nonlocal checksum
+        checksum += window.time() - start
+    async def animation() -> None:
+        while True:
+            await asyncio.sleep(1/30)
+            fired()
+    async def debouncer() -> None:
+        handle = None
+        while True:
+            if handle is not None:
+                handle.cancel()
+            handle = window.call_later(0.25, fired)
+            await asyncio.sleep(0.1)
+    async def main() -> None:
+        tasks = [asyncio.ensure_future(animation()) for _ in range(ANIMATIONS)]
+        tasks += [asyncio.ensure_future(debouncer()) for _ in range(DEBOUNCERS)]
+        await asyncio.sleep(seconds)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    start = window.time()
+    renderer = window.start_renderer(60, render)
+    try:
+        elapsed = timed(lambda: window.run_until_complete(main()))
+    finally:
+        renderer.stop()
+        window.set_clock(Clock())
+    return [type(clock).__name__, f"{seconds:g}", f"{elapsed:.2f}", f"{seconds / elapsed:,.0f}x", frames, f"{checksum:.3f}"]
+
+if __name__ == "__main__":
+    rows = [measure(Clock(), 2), measure(VirtualClock(), 600), measure(VirtualClock(), 600)]
+    report("UI timers on real and virtual clocks", ["clock", "loop seconds", "wall seconds", "speed", "frames", "checksum"], rows)
@@ -0,0 +1,40 @@
+"""
+Shared helpers for the benchmarks in this directory.
+
+The benchmarks run headless, using SDL's dummy video driver, so they work on machines without a display.
+Run them from the repository root, with `src` on the path, for example:
+
+    PYTHONPATH=src python benchmarks/bench_timers.py
+
+Functions:
+    headless_window - initialize pygame with the dummy video driver and create the `Window` singleton, or return it if it exists
+    timed - time a function call with `time.perf_counter`, returning the elapsed time in seconds
+    report - print a table of benchmark results
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import time
+import pygame
+from typing import Callable, Sequence
+from asyncui.window import Window
+
+def headless_window(size: tuple[int, int] = (640, 480)) -> Window:
+    try:
+        return Window()
+    except RuntimeError:
+        pygame.init()
+        return Window(pygame.display.set_mode(size), size, "benchmark")
+
+def timed(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def report(title: str, header: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    print(title)
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print('  '.join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+    print()
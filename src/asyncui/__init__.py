@@ -6,6 +6,10 @@ Modules:
     display - contains classes and functions for creating new asyncui widgets
     graphics - a collection of pre built graphics widgets for use in your own UIs
     window - provides the window class and indigration with asyncio
+    clock - real and virtual clocks for the window's event loop
+    selector - watches file descriptors on a background thread for the window's event loop
+    sockets - non-blocking sockets, transports and servers for the window's event loop
+    processes - pipes and child processes for the window's event loop
     utils - contains many utility functions used by asyncui
     resources - management of loaded resources, like fonts or images
 """
@@ -0,0 +1,52 @@
+"""
+Clocks for the `Window` event loop, the loop's time(`Window.time`), timers and the renderer's frames all come from it's clock.
+
+The default clock is `time.monotonic`. A `VirtualClock` only moves forward when the loop has nothing to run,
+jumping straight to the next timer, so an hour of animations, debounces and frames runs in however long the callbacks take,
+and the same program always sees the same times. Useful for tests and benchmarks, see `Window.set_clock`.
+
+Classes:
+    Clock - the interface of a clock, and the default real time clock
+    VirtualClock - a clock which only moves when the event loop is idle, or when it is advanced
+"""
+import time
+
+class Clock:
+    """
+    A real time clock, based on `time.monotonic`.
+
+    Subclasses override `time`, and set `virtual` if time doesn't pass on it's own,
+    in which case the event loop calls `advance_to` with the next timer instead of waiting for it.
+    """
+    virtual = False
+
+    def time(self) -> float:
+        return time.monotonic()
+    def advance_to(self, when: float) -> None:
+        """Move a virtual clock forward to `when`, real time clocks can't be moved"""
+        raise TypeError(f"{type(self).__name__} can't be advanced")
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} time={self.time():.6f}>"
+
+class VirtualClock(Clock):
+    """
+    A clock which only moves when the event loop is idle, jumping to the next timer, or when `advance` is called.
+
+    Callbacks take no time on a virtual clock, so slicing by time(`Window.callback_slice`, `Window.run_sliced`)
+    never cuts a slice short. Work done on other threads(executors, the selector) also takes no time,
+    so timers waiting on the loop fire while it's still running.
+    """
+    virtual = True
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+    def time(self) -> float:
+        return self.now
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward, timers which are now due run on the event loop's next iteration"""
+        if seconds < 0:
+            raise ValueError(f"Time can't go backwards, got {seconds} seconds")
+        self.now += seconds
+    def advance_to(self, when: float) -> None:
+        if when > self.now:
+            self.now = when
@@ -14,6 +14,7 @@ Functions:
     stack_enabler - convince method for AutomaticStack's `enable` method, passes ExitStack as an argument and automatically sets `_stack`
     renderer - convinience method for Drawable's `draw` method, passes a `Scale` object instead of a float scale factor
     drawable_renderer - take a Drawable and return a function compatible with `asyncui.window.Window.start_rendering`
+    damage - report the area of widgets as changed, so a renderer with damage tracking redraws it
 """
 import pygame
 from abc import ABC, abstractmethod
@@ -31,7 +32,8 @@ __all__ = [
     'Scale',
     'AutomaticStack',
     'stack_enabler',
-    'renderer'
+    'renderer',
+    'damage'
 ]
 
 T = TypeVar('T')
@@ -130,6 +132,9 @@ class Scale:
 
 class AutomaticStack:
     _stack: ExitStack
+    # Whether the built-in widgets' handlers are weak, so an enabled widget which is dropped is collected and it's handlers unregistered.
+    # Off by default, an enabled widget stays alive while it's enabled. Set it on a subclass, or on an instance before it's first enabled
+    weak_handlers: bool = False
     
     @abstractmethod
     def enable(self) -> None:
@@ -204,3 +209,12 @@ def drawable_renderer(target: Drawable) -> Callable[[Window], None]:
         target.draw(window.window, window.scale_factor)
     return wrapper
 
+def damage(*widgets: Drawable) -> None:
+    """
+    Report the widgets' bodies as damaged, scaled to the screen, see `asyncui.window.Window.damage`.
+    Call it with the old and the new widget when a widget is replaced, and when one is hidden or shown
+    """
+    window = Window()
+    scale = Scale(window.scale_factor)
+    # Scaled fonts and lines can be a pixel larger than the scaled body
+    window.damage(*(scale.rect(widget.body).inflate(2, 2) for widget in widgets))
@@ -19,9 +19,11 @@ Functions:
 Submodules:
     keyboard - enum class for keyboard values and modifiers keys
     mouse - enum class for mouse keys
+    coalescing - merging of consecutive events, like mouse motion, see `asyncui.window.Window.coalescer`
+    bus - bounded queues for asyncui events which skip SDL's queue, see `asyncui.window.Window.bus`
 """
 
-from typing import Any, Self
+from typing import Any, Self, Callable
 
 from . import keyboard, mouse
 from inspect import get_annotations as getAnnotations
@@ -31,6 +33,54 @@ import pygame
 
 event_types: dict[int, type['Event']] = {}
 
+Marshaller = Callable[['Event', pygame.event.Event], None]
+_enum_converters: dict[type[Enum], Callable[[Any], Enum]] = {}
+def _enum_converter(enum_type: type[Enum]) -> Callable[[Any], Enum]:
+    """
+    Return a function converting a raw pygame value into a member of `enum_type`.
+
+    It looks values up in a table built from the enum's members, skipping the slow `Enum.__call__` path.
+    Values not in the table(Like combinations of flags, or unknown keys) go through `enum_type(value)` once, and are cached.
+    """
+    if enum_type in _enum_converters:
+        return _enum_converters[enum_type]
+    
+    lookup: dict[Any, Enum] = dict(enum_type._value2member_map_)
+    def convert(value: Any) -> Enum:
+        try:
+            return lookup[value]
+        except KeyError:
+            member = lookup[value] = enum_type(value)
+            return member
+    _enum_converters[enum_type] = convert
+    return convert
+
+def _compile_marshaller(cls: type['Event']) -> Marshaller:
+    """
+    Build the marshaller for an event type from it's annotations, see `Event._marshal`.
+    
+    The annotations are only read once, and enumerations are given a lookup table via `_enum_converter`.
+    """
+    fields: list[tuple[str, Callable[[Any], Any] | None]] = []
+    for name, attr_type in getAnnotations(cls).items():
+        if name == 'type': #type is a speical case
+            continue
+        if isinstance(attr_type, type) and issubclass(attr_type, Enum | Flag):
+            fields.append((name, _enum_converter(attr_type)))
+        else:
+            fields.append((name, None))
+    
+    def _marshal(new_event: Event, event: pygame.event.Event, /) -> None:
+        event_data = event.__dict__
+        for name, convert in fields:
+            try:
+                value = event_data[name]
+            except KeyError:
+                raise ValueError(f"Event {event} is missing the required attribute '{name}' to construct {cls}") from None
+            setattr(new_event, name, value if convert is None else convert(value))
+        new_event._orgin_event = event
+    return _marshal
+
 class Event:
     """
     The base class for all asyncUi event wrappers, wraps pygame events
@@ -45,11 +95,17 @@ class Event:
         Enums and Flags comes out of the box, if an attribute is annotated with an Enum or a Flag, `marshal` will
         convert the value from the pygame event to the corresponding enum value.
 
+        The marshaller for each subclass is built once, when the class is created, so the annotations
+        are not inspected again for every event.
+
         If more complex marshaling behavior is desired(say, scaling points or adding attributes), then 
         `_marshal` may be overridden. It takes a pygame event and should construct a new event of that type,
         in addition, `_get_pygame_event` can be overridden for more complex behavior when converting back to a pygame event.
 
         The subclass will also be added to the `event_types` dictionary, which maps event's .type attribute to the event class.
+
+        Subclasses may declare `__slots__` listing their annotated attributes, which makes events smaller and faster to create,
+        the built in events all do. Subclasses without `__slots__` work as well, and store their attributes in `__dict__`.
         
     Marshaling:
         when an event if recieved from pygame, the event loop must convert it to the type event handlers expect, so it maintains 
@@ -60,17 +116,23 @@ class Event:
 
 
     Methods:
+        consume - stop the event being handed to the rest of the handlers, the ones with lower priorities
         _marshal - convert a pygame event into this event, can be subclassed, but not used directly, use `marshal()` for that.
         _get_pygame_event - convert an instance of this class into an equivalent pygame event, is called by `toPygameEvent`
     Attributes:
+        consumed - whether a handler consumed the event while it was dispatched
         type - The type id of the event, same as pygame's type attribute. If one is not specified by a subclass, 
         it will be implicitly set with pygame.event.custom_type()
         _orgin_event - The pygame event this event originated from, set by `_marshal`, and can be recreived by `_get_pygame_event
     """
 
+    __slots__ = ('_orgin_event', '_consumed')
     type: int = -1
-    _orgin_event: pygame.event.Event | None = None
-
+    _orgin_event: pygame.event.Event | None
+    # Set to False by the window before the event is dispatched
+    _consumed: bool
+    # Whether `_marshal` is built from the annotations by `__init_subclass__`, False once a subclass overrides it
+    _compiled_marshal: bool = True
 
     def _marshal(new_event: Self, event: pygame.event.Event, /) -> None:
         """
@@ -80,43 +142,54 @@ class Event:
         it then converts the corasponding event value into the enum, and returns
         a new instance with converted enums
 
+        Subclasses get a precompiled equivalent of this method from `__init_subclass__`, which does the same
+        conversions without reading the annotations for every event.
+
         Subclasses which require custom type marshaling should override this method,
         newEvent will be provided using cls.__new__(cls), and should be initialized with
         data by this function, the 2nd argument, `event`, contains the event being constructed from.
         """
+        _compile_marshaller(type(new_event))(new_event, event)
 
-        event_data = vars(event)
-        event_annotations: dict[str, type | object] = getAnnotations(type(new_event))
-        for name, attr_type in event_annotations.items():
-            if name == 'type': #type is a speical case
-                continue
-
-            if name not in event_data:
-                raise ValueError(f"Event {event} is missing the required attribute '{name}' to construct {type(new_event)}('{name}' has type {attr_type})")
-            if isinstance(attr_type, type) and issubclass(attr_type, Enum | Flag):
-                vars(new_event)[name] = attr_type(event_data[name])
-            else:
-                vars(new_event)[name] = event_data[name]
-        new_event._orgin_event = event
+    def consume(self) -> None:
+        self._consumed = True
+    @property
+    def consumed(self) -> bool:
+        return getattr(self, '_consumed', False)
 
     def _get_pygame_event(self) -> pygame.event.Event:
         """
         Return a pygame event reperesenting can event object.
 
         If self._orgin_event is set, returns that, if not, it
-        copys the event's `vars` into a pygame event and uses `self.type` as the type
+        copys the event's attributes into a pygame event and uses `self.type` as the type
         You probably don't want to override this, but you can if custom pygame event creation is needed.
         """
-        if self._orgin_event is not None:
-            return self._orgin_event
+        # Slots can't have class level defaults, so events which were never marshalled won't have `_orgin_event` set
+        orgin_event: pygame.event.Event | None = getattr(self, '_orgin_event', None)
+        if orgin_event is not None:
+            return orgin_event
         else:
             clean_vars: dict[str, Any] = {}
-            for name, value in vars(self).items():
+            for name, value in self._attributes().items():
                 if isinstance(value, Enum):
                     clean_vars[name] = value.value
                 else:
                     clean_vars[name] = value
             return pygame.event.Event(self.type, clean_vars)
+
+    def _attributes(self) -> dict[str, Any]:
+        """
+        The event's attributes, collected from `__slots__` and `__dict__`, `_orgin_event` and `_consumed` are not included.
+        """
+        attributes: dict[str, Any] = {}
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('_orgin_event', '_consumed') and hasattr(self, name):
+                    attributes[name] = getattr(self, name)
+        if hasattr(self, '__dict__'):
+            attributes.update(self.__dict__)
+        return attributes
         
     def __init_subclass__(cls, **kwargs: Any) -> None:
         # If no type is specified, create a new custom type
@@ -130,6 +203,12 @@ class Event:
         # Register the newly created event's type
         event_types[cls.type] = cls
 
+        # Build the marshaller, unless the subclass(or a parent) brings it's own
+        if '_marshal' in cls.__dict__:
+            cls._compiled_marshal = False
+        elif cls._compiled_marshal:
+            cls._marshal = _compile_marshaller(cls) #type: ignore
+
         super().__init_subclass__(**kwargs)
 
 
@@ -145,39 +224,44 @@ def marshal(event: pygame.event.Event) -> Event | None:
 
     See `Event._marshal` for details.
     """
-    if event.type not in event_types:
+    event_type = event_types.get(event.type)
+    if event_type is None:
         return None
     
-    event_type = event_types[event.type]
     new_event = event_type.__new__(event_type)
     event_type._marshal(new_event, event)
     return new_event
 
 class KeyDown(Event):
+    __slots__ = ('key', 'mod', 'unicode')
     type: int = pygame.KEYDOWN
     key: keyboard.Keys
     mod: keyboard.ModifierKeys
     unicode: str
 
 class KeyUp(Event):
+    __slots__ = ('key', 'mod', 'unicode')
     type: int = pygame.KEYUP
     key: keyboard.Keys
     mod: keyboard.ModifierKeys
     unicode: str
     
 class MouseButtonDown(Event):
+    __slots__ = ('pos', 'button', 'touch')
     type: int = pygame.MOUSEBUTTONDOWN
     pos: tuple[int, int]
     button: mouse.Button
     touch: bool
 
 class MouseButtonUp(Event):
+    __slots__ = ('pos', 'button', 'touch')
     type: int = pygame.MOUSEBUTTONUP
     pos: tuple[int, int]
     button: mouse.Button
     touch: bool
 
 class MouseWheelScroll(Event):
+    __slots__ = ('flipped', 'x', 'y', 'touch', 'precise_x', 'precise_y')
     type: int = pygame.MOUSEWHEEL
     flipped: bool
     x: int
@@ -187,6 +271,7 @@ class MouseWheelScroll(Event):
     precise_y: float
 
 class MouseMove(Event):
+    __slots__ = ('pos', 'rel', 'buttons', 'touch')
     type: int = pygame.MOUSEMOTION
     pos: tuple[int, int]
     rel: tuple[int, int]
@@ -194,14 +279,17 @@ class MouseMove(Event):
     touch: bool
 
 class TextInput(Event):
+    __slots__ = ('text',)
     type: int = pygame.TEXTINPUT
     text: str
 
 class Quit(Event):
+    __slots__ = ()
     type: int = pygame.QUIT
 
 
 class VideoResize(Event):
+    __slots__ = ('size', 'w', 'h')
     type: int = pygame.VIDEORESIZE
     size: tuple[int, int]
     w: int
@@ -0,0 +1,208 @@
+"""
+An in-process event bus for asyncui events, which skips SDL's event queue.
+
+`Window.post_event` normally converts events into pygame events, which go through SDL's fixed size queue,
+where they are silently dropped once it's full. Event types configured on the window's bus(`Window.bus`) are kept
+as asyncui events in bounded queues instead, one per type, and handed to their handlers as they are,
+with a choice of what happens when a queue is full, and counters of what was dropped.
+
+The order of events is kept within a type, but not between types, and not relative to pygame's events.
+
+Aliases:
+    Merge - a function taking 2 events of the same type, returning the merged event, or None if they can't be merged
+Classes:
+    Overflow - what happens when an event is published to a full queue
+    EventBus - holds the queues, publishing and draining are thread safe
+Functions:
+    keep_latest - merge which drops the older event, the default for `Overflow.COALESCE`
+"""
+import asyncio
+import enum
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable
+from . import Event
+
+__all__ = ('Merge', 'Overflow', 'EventBus', 'keep_latest')
+
+Merge = Callable[[Event, Event], Event | None]
+
+def keep_latest(older: Event, newer: Event) -> Event | None:
+    """Drop the older event, for events where only the latest state matters"""
+    return newer
+
+class Overflow(enum.Enum):
+    """
+    What happens when an event is published to a full queue
+
+    BLOCK - the publisher waits for room, other threads block in `publish`, coroutines await `put`
+    DROP_OLDEST - the oldest queued event of the type is dropped
+    COALESCE - the event is merged into the newest queued one, dropping the oldest instead if they can't be merged
+    """
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop oldest'
+    COALESCE = 'coalesce'
+
+@dataclass(slots=True)
+class _Channel:
+    event_type: type[Event]
+    maxsize: int
+    policy: Overflow
+    merge: Merge
+    events: deque[Event] = field(default_factory=deque)
+    # Coroutines waiting in `put` for room
+    putters: deque['asyncio.Future[None]'] = field(default_factory=deque)
+
+class EventBus:
+    """
+    Bounded queues of asyncui events, one per event type, drained by the event loop.
+
+    Only configured types go through the bus, see `configure`. Events can be published from any thread,
+    the first event published from another thread since the bus was last drained calls `wakeup`,
+    which wakes up the event loop if it's waiting for pygame events.
+
+    Methods:
+        configure - route an event type through the bus, with the given queue size and overflow policy
+        remove - stop routing an event type through the bus, dropping it's queued events
+        publish - queue an event, from any thread
+        put - queue an event, waiting for room if the queue is full, from the event loop
+        drain - take queued events and hand them to a function, used by the event loop
+        depths - the number of queued events of each type
+    Attributes:
+        pending - the number of queued events
+        dropped - a Counter of how many events were dropped, by event type.
+            Includes events a blocking `publish` gave up on after it's timeout
+        coalesced - a Counter of how many events were merged into queued ones, by event type
+        total_dropped - the total number of dropped events
+    """
+    def __init__(self, wakeup: Callable[[], object]) -> None:
+        self.queues: dict[int, _Channel] = {}
+        self.pending = 0
+        self.dropped = Counter[type[Event]]()
+        self.coalesced = Counter[type[Event]]()
+        self._wakeup = wakeup
+        self._wakeup_needed = True
+        self._lock = threading.Lock()
+        # Where the next drain starts taking events, so a busy type can't starve the types after it
+        self._next_channel = 0
+        # Notified when events are drained, for threads blocked on full queues
+        self._room = threading.Condition(self._lock)
+        # The bus is created by the event loop, which must never block on itself
+        self._loop_thread = threading.get_ident()
+
+    def configure(self, event_type: type[Event], maxsize: int = 1024, policy: Overflow = Overflow.DROP_OLDEST, merge: Merge = keep_latest) -> None:
+        """
+        Route `event_type` through the bus, in a queue holding up to `maxsize` events.
+        `merge` is used by `Overflow.COALESCE`. Reconfiguring a type keeps it's queued events
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        with self._lock:
+            channel = self.queues.get(event_type.type)
+            if channel is None:
+                self.queues[event_type.type] = _Channel(event_type, maxsize, policy, merge)
+            else:
+                channel.maxsize, channel.policy, channel.merge = maxsize, policy, merge
+                self._room.notify_all()
+    def remove(self, event_type: type[Event]) -> None:
+        with self._lock:
+            channel = self.queues.pop(event_type.type)
+            self.pending -= len(channel.events)
+            self._room.notify_all()
+        for putter in channel.putters:
+            if not putter.done():
+                putter.set_exception(KeyError(f"{event_type.__qualname__} was removed from the bus"))
+
+    def publish(self, event: Event, timeout: float | None = None) -> bool:
+        """
+        Queue an event, returning whether it was queued.
+
+        When an `Overflow.BLOCK` queue is full, other threads wait up to `timeout` seconds for room,
+        forever if it's None, and return False if there still isn't any. The event loop's thread can't wait for itself,
+        so it raises `asyncio.QueueFull`, coroutines should await `put` instead.
+        """
+        channel = self.queues.get(event.type)
+        if channel is None:
+            raise KeyError(f"{type(event).__qualname__} is not configured on the bus")
+        on_loop = threading.get_ident() == self._loop_thread
+        with self._lock:
+            queue = channel.events
+            if len(queue) >= channel.maxsize:
+                if channel.policy is Overflow.BLOCK:
+                    if on_loop:
+                        raise asyncio.QueueFull(f"The bus queue of {channel.event_type.__qualname__} is full")
+                    if not self._room.wait_for(lambda: len(queue) < channel.maxsize or self.queues.get(event.type) is not channel, timeout):
+                        self.dropped[channel.event_type] += 1
+                        return False
+                    if self.queues.get(event.type) is not channel:
+                        raise KeyError(f"{type(event).__qualname__} was removed from the bus")
+                elif channel.policy is Overflow.COALESCE and (merged := channel.merge(queue[-1], event)) is not None:
+                    queue[-1] = merged
+                    self.coalesced[channel.event_type] += 1
+                    return True
+                else:
+                    queue.popleft()
+                    self.pending -= 1
+                    self.dropped[channel.event_type] += 1
+            queue.append(event)
+            self.pending += 1
+            # The loop checks `pending` before it waits, so only other threads need to wake it up
+            wakeup = self._wakeup_needed and not on_loop
+            if wakeup:
+                self._wakeup_needed = False
+        if wakeup:
+            self._wakeup()
+        return True
+    async def put(self, event: Event) -> None:
+        """Queue an event from the event loop, waiting for room if it's queue is full and uses `Overflow.BLOCK`"""
+        channel = self.queues.get(event.type)
+        if channel is None:
+            raise KeyError(f"{type(event).__qualname__} is not configured on the bus")
+        while channel.policy is Overflow.BLOCK and len(channel.events) >= channel.maxsize:
+            putter = asyncio.get_running_loop().create_future()
+            channel.putters.append(putter)
+            try:
+                await putter
+            finally:
+                if putter in channel.putters:
+                    channel.putters.remove(putter)
+        self.publish(event)
+
+    def drain(self, handler: Callable[[Event], None], limit: int) -> int:
+        """
+        Take up to `limit` queued events, a type's events in the order they were published, and call `handler` with each.
+        Events are taken from the types in turn, starting from the type after the one the last drain started from.
+        Returns the number of events handled
+        """
+        batch: list[Event] = []
+        with self._lock:
+            channels = list(self.queues.values())
+            if channels:
+                start = self._next_channel % len(channels)
+                self._next_channel = start + 1
+                channels = channels[start:] + channels[:start]
+            queues = [channel.events for channel in channels if channel.events]
+            while queues and len(batch) < limit:
+                for queue in queues[:limit - len(batch)]:
+                    batch.append(queue.popleft())
+                queues = [queue for queue in queues if queue]
+            self.pending -= len(batch)
+            self._wakeup_needed = True
+            if batch:
+                self._room.notify_all()
+        # `channels` was taken under the lock, as other threads can configure and remove types
+        for channel in channels:
+            for _ in range(min(len(channel.putters), channel.maxsize - len(channel.events))):
+                putter = channel.putters.popleft()
+                if not putter.done():
+                    putter.set_result(None)
+        for event in batch:
+            handler(event)
+        return len(batch)
+
+    def depths(self) -> dict[type[Event], int]:
+        return {channel.event_type: len(channel.events) for channel in self.queues.values()}
+    @property
+    def total_dropped(self) -> int:
+        return self.dropped.total()
@@ -0,0 +1,97 @@
+"""
+Merging of consecutive events of the same type, so a burst of events is handled as one.
+
+A fast mouse sends hundreds of motion events per frame, but usually only the latest position matters,
+coalescing merges them before they are marshalled and handed to event handlers.
+Only consecutive events are merged, so the order relative to other events(like clicks) is kept.
+
+Aliases:
+    Policy - a function taking 2 consecutive pygame events, returning the merged event, or None if they can't be merged
+Classes:
+    Coalescer - holds a policy for each event type and merges lists of pygame events, counting how many were merged
+Functions:
+    merge_motion - policy for `MouseMove`, sums `rel` and keeps the latest `pos`
+    merge_wheel - policy for `MouseWheelScroll`, sums the scrolled amounts
+    keep_latest - policy which drops the older event, used for `VideoResize`
+    default_coalescer - create a Coalescer with the policies above
+"""
+from typing import Callable, Iterable
+from collections import Counter
+from . import Event, MouseMove, MouseWheelScroll, VideoResize, event_types
+import pygame
+
+__all__ = ('Policy', 'Coalescer', 'merge_motion', 'merge_wheel', 'keep_latest', 'default_coalescer')
+
+Policy = Callable[[pygame.event.Event, pygame.event.Event], pygame.event.Event | None]
+
+def merge_motion(older: pygame.event.Event, newer: pygame.event.Event) -> pygame.event.Event | None:
+    """Merge 2 mouse motion events, as long as the pressed buttons did not change"""
+    if older.buttons != newer.buttons or older.touch != newer.touch:
+        return None
+    rel = (older.rel[0] + newer.rel[0], older.rel[1] + newer.rel[1])
+    return pygame.event.Event(newer.type, dict(newer.__dict__, rel=rel))
+
+def merge_wheel(older: pygame.event.Event, newer: pygame.event.Event) -> pygame.event.Event | None:
+    """Merge 2 mouse wheel events, as long as they come from the same kind of device"""
+    if older.flipped != newer.flipped or older.touch != newer.touch:
+        return None
+    # pygame uses the given dict as the event's attributes, so it must be copied
+    return pygame.event.Event(newer.type, dict(newer.__dict__,
+        x=older.x + newer.x,
+        y=older.y + newer.y,
+        precise_x=older.precise_x + newer.precise_x,
+        precise_y=older.precise_y + newer.precise_y
+    ))
+
+def keep_latest(older: pygame.event.Event, newer: pygame.event.Event) -> pygame.event.Event | None:
+    """Drop the older event, for events where only the latest state matters"""
+    return newer
+
+class Coalescer:
+    """
+    Merges consecutive pygame events of the same type, using a policy for each event type.
+
+    Event types without a policy are never merged.
+
+    Methods:
+        set_policy - set the policy used for an event type, or remove it by passing None
+        coalesce - merge consecutive events in a sequence of pygame events, returning the merged list
+    Attributes:
+        merged - a Counter of how many events were merged away, by event type
+        total_merged - the total number of events merged away
+    """
+    def __init__(self, policies: dict[type[Event], Policy] | None = None) -> None:
+        self.policies: dict[int, Policy] = {}
+        self.merged = Counter[type[Event]]()
+        for event_type, policy in (policies or {}).items():
+            self.set_policy(event_type, policy)
+    
+    def set_policy(self, event_type: type[Event], policy: Policy | None) -> None:
+        if policy is None:
+            self.policies.pop(event_type.type, None)
+        else:
+            self.policies[event_type.type] = policy
+
+    @property
+    def total_merged(self) -> int:
+        return self.merged.total()
+
+    def coalesce(self, pending: Iterable[pygame.event.Event]) -> list[pygame.event.Event]:
+        policies = self.policies
+        coalesced: list[pygame.event.Event] = []
+        for event in pending:
+            if coalesced and coalesced[-1].type == event.type and event.type in policies:
+                merged = policies[event.type](coalesced[-1], event)
+                if merged is not None:
+                    coalesced[-1] = merged
+                    self.merged[event_types[event.type]] += 1
+                    continue
+            coalesced.append(event)
+        return coalesced
+
+def default_coalescer() -> Coalescer:
+    return Coalescer({
+        MouseMove: merge_motion,
+        MouseWheelScroll: merge_wheel,
+        VideoResize: keep_latest,
+    })
@@ -1,17 +1,19 @@
 from __future__ import annotations
 from types import EllipsisType
-from .display import Color, Size, Point, Drawable, Scale, AutomaticStack, stack_enabler, renderer, Clip, rescaler
-from typing import TypeVar, Iterable, Final, Callable, Sequence, cast, Generic, Iterator
+from .display import Color, Size, Point, Drawable, Scale, AutomaticStack, stack_enabler, renderer, Clip, rescaler, damage
+from typing import TypeVar, Iterable, Final, Callable, Sequence, cast, Generic, Iterator, Any
 from functools import cached_property
 from .resources.fonts import Font
 from contextlib import ExitStack
 from .import events
-from .window import event_handler_method, Window
+from .window import event_handler_method, Window, HandlerGroup
 from .utils import coroutines, transformers
 from .utils.callbacks import Callback, CallbackWrapper
 from .utils.descriptors import Placeholder, Inferable
 from .utils.context import MutableContextManager
 import itertools
+import math
+import weakref
 import pygame
 
 DrawableT = TypeVar('DrawableT', bound=Drawable)
@@ -21,6 +23,19 @@ def render_all(window: pygame.Surface, scale: float, *targets: Drawable) -> None
     for target in targets:
         target.draw(window, scale)
 
+def unscaled_clip(window: pygame.Surface, scale: float) -> pygame.Rect:
+    """The window's clipping area in unscaled coordinates, with a margin for widgets which draw a pixel outside their scaled body"""
+    clip = window.get_clip()
+    left, top = math.floor(clip.left / scale) - 1, math.floor(clip.top / scale) - 1
+    return pygame.Rect(left, top, math.ceil(clip.right / scale) + 1 - left, math.ceil(clip.bottom / scale) + 1 - top)
+def in_clip(widget: Drawable, clip: pygame.Rect) -> bool:
+    """Whether a widget may draw inside an unscaled clipping area(see `unscaled_clip`), widgets without a body are assumed to"""
+    try:
+        body = widget.body
+    except AttributeError:
+        return True
+    return body.colliderect(clip)
+
 class Box(Drawable):
     filledBox: Final = 0
 
@@ -146,12 +161,12 @@ class Clickable(AutomaticStack):
     def area(self) -> pygame.rect.Rect:
         return pygame.Rect(*self.position, *self.size) 
     
-    @event_handler_method
+    @event_handler_method(events.MouseButtonDown, weak=None)
     def _click_down_handler(self, event: events.MouseButtonDown) -> None:
         scale = Scale(Window().scale_factor)
         if self.debounce is False and  scale.rect(self.area).collidepoint(event.pos):
             self.debounce = True
-    @event_handler_method
+    @event_handler_method(events.MouseButtonUp, weak=None)
     def _click_up_handler(self, event: events.MouseButtonUp) -> None:
         scale = Scale(Window().scale_factor)
         if self.debounce is True:
@@ -178,7 +193,7 @@ class Hoverable(AutomaticStack):
     def area(self) -> pygame.rect.Rect:
         return pygame.Rect(*self.position, *self.size) 
     
-    @event_handler_method
+    @event_handler_method(events.MouseMove, weak=None)
     def _hover_handler(self, event: events.MouseMove) -> None:
         scale = Scale(Window().scale_factor)
         if self._hovered is False and scale.rect(self.area).collidepoint(event.pos):
@@ -209,7 +224,7 @@ class Focusable(AutomaticStack):
     @cached_property
     def area(self) -> pygame.rect.Rect:
         return pygame.Rect(*self.position, *self.size) 
-    @event_handler_method
+    @event_handler_method(events.MouseButtonDown, weak=None)
     def _click_handler(self, event: events.MouseButtonDown) -> None:
         scale = Scale(Window().scale_factor)
         if self._selected is True and not scale.rect(self.area).collidepoint(event.pos):
@@ -311,7 +326,6 @@ class InputBox(Drawable, AutomaticStack):
         self.input_validater = input_validater
 
         self._focused = focused
-        self._focuser = Focusable(text_box.position, text_box.size, self._on_focus, self._on_unfocus)
     
     def draw(self, window: pygame.Surface, scale: float) -> None:
         self.text_box.draw(window, scale)
@@ -329,6 +343,7 @@ class InputBox(Drawable, AutomaticStack):
     @text_box.setter
     def text_box(self, value: InputBoxDisplay) -> None:
         if self.input_validater(value.text.text):
+            damage(self.__textBox, value)
             self.__textBox = value
             self.on_change.invoke(value.text.text)    
 
@@ -338,11 +353,11 @@ class InputBox(Drawable, AutomaticStack):
     def _on_unfocus(self) -> None:
         self.text_box = self.text_box.change_cursor_shown(False)
         self._focused = False
-    @event_handler_method
+    @event_handler_method(events.TextInput, weak=None)
     def _text_input(self, event: events.TextInput) -> None:
         if self._focused:
             self.text_box = self.text_box.insert_text(event.text)
-    @event_handler_method
+    @event_handler_method(events.KeyDown, weak=None)
     def _key_down(self, event: events.KeyDown) -> None:
         if self._focused:
             match event.key:
@@ -358,6 +373,12 @@ class InputBox(Drawable, AutomaticStack):
                     if self.on_enter is not None:
                         self.on_enter.invoke(self.text_box.text.text)
     
+    @cached_property
+    def _focuser(self) -> Focusable:
+        focuser = Focusable(self.text_box.position, self.text_box.size, self._on_focus, self._on_unfocus)
+        focuser.weak_handlers = self.weak_handlers
+        return focuser
+
     @stack_enabler
     def enable(self, stack: ExitStack) -> None:
         """Enable the handling of events(Should be done from context manager)"""
@@ -381,6 +402,11 @@ class Polygon(Drawable):
     @cached_property[list[Point]]
     def absolute_points(self) -> list[Point]:
         return [add_point(self.position, point) for point in self.points]
+    @cached_property[pygame.Rect]
+    def body(self) -> pygame.Rect:
+        xs = [x for x, _ in self.absolute_points]
+        ys = [y for _, y in self.absolute_points]
+        return pygame.Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
     
     
     def get_size(self) -> Size:
@@ -425,15 +451,41 @@ class Group(Drawable, AutomaticStack, Generic[DrawableT]):
         self.position = position
         self.widgets = [widget.reposition(add_point(self.position,widget.position)) for widget in widgets]
     def draw(self, window: pygame.Surface, scale: float) -> None:
+        clip = window.get_clip()
+        if clip == window.get_rect():
+            for widget in self.widgets:
+                widget.draw(window, scale)
+            return
+        # Only part of the window is being redrawn, like the damaged rects of a renderer with damage tracking
+        area = unscaled_clip(window, scale)
         for widget in self.widgets:
-            widget.draw(window, scale)
+            if in_clip(widget, area):
+                widget.draw(window, scale)
     def reposition(self, position: Inferable[Point]) -> 'Group[DrawableT]':
         return Group(position, (widget.reposition((widget.position[0] - self.position[0], widget.position[1] - self.position[1])) for widget in self.widgets))
+
+    @cached_property
+    def handler_group(self) -> HandlerGroup:
+        """
+        The handlers of the widgets, registered the first time the group is enabled,
+        after that enabling and disabling the group only enables and disables this `HandlerGroup`.
+        Close it to unregister them once the group isn't needed
+        """
+        group = HandlerGroup(enabled=False)
+        with group.collect():
+            for widget in self.widgets:
+                if isinstance(widget, AutomaticStack):
+                    widget.enable()
+        return group
     @stack_enabler
     def enable(self, stack: ExitStack) -> None:
-        for widget in self.widgets:
-            if isinstance(widget, AutomaticStack):
-                stack.enter_context(widget)
+        stack.enter_context(self.handler_group)
+    def disable(self) -> None:
+        """
+        Disable the widgets' handlers. They stay registered, and keep the widgets alive,
+        until `handler_group` is closed
+        """
+        super().disable()
 
     def get_size(self) -> Size:
         max_x = max_y = 0
@@ -448,6 +500,73 @@ class Group(Drawable, AutomaticStack, Generic[DrawableT]):
     def __len__(self) -> int:
         return len(self.widgets)
     
+class CachedGroup(Group[DrawableT]):
+    """
+    A `Group` which renders it's widgets once into an offscreen surface, and then draws by blitting the surface.
+
+    For large subtrees which rarely change, like a form of hundreds of `Text` and `Box` widgets.
+    The surface is re-rendered when the scale changes, or when `widgets` changes(widgets are compared by identity,
+    so replacing, adding or removing a widget is noticed). Widgets which change in place, like an `InputBox`'s text,
+    aren't noticed, call `invalidate` after they change. The surface covers the group's size, and is transparent where nothing is drawn.
+
+    Methods:
+        invalidate - drop the surface, so it's re-rendered the next time the group is drawn
+        total_bytes - the bytes of surface memory held by all cached groups
+    Attributes:
+        hits - the number of draws which blitted the cached surface
+        misses - the number of draws which rendered the widgets
+        cache_bytes - the bytes of surface memory held by the group, not counting the run length encoded copy pygame keeps for blitting
+    """
+    _instances: 'weakref.WeakSet[CachedGroup[Any]]' = weakref.WeakSet()
+
+    def __init__(self, position: Inferable[Point], widgets: Iterable[DrawableT]) -> None:
+        super().__init__(position, widgets)
+        self.hits = 0
+        self.misses = 0
+        self._surface: pygame.Surface | None = None
+        self._cached_scale = 0.
+        self._cached_widgets: list[DrawableT] = []
+        CachedGroup._instances.add(self)
+
+    def invalidate(self) -> None:
+        self._surface = None
+    def _render(self, scale: Scale) -> pygame.Surface:
+        width, height = scale.size(self.get_size())
+        # Scaled fonts and lines can be a pixel larger than their scaled body
+        surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+        for widget in self.widgets:
+            local = widget.reposition((widget.position[0] - self.position[0], widget.position[1] - self.position[1]))
+            local.draw(surface, scale.scale_factor)
+        # The surface doesn't change until it's re-rendered, so it's worth run length encoding, which makes blitting
+        # it's transparent and opaque areas much faster than blending every pixel
+        surface = surface.convert_alpha()
+        surface.set_alpha(255, pygame.RLEACCEL)
+        return surface
+
+    @renderer
+    def draw(self, window: pygame.Surface, scale: Scale) -> None:
+        if self._surface is None or self._cached_scale != scale.scale_factor or self._cached_widgets != self.widgets:
+            self.misses += 1
+            self._surface = self._render(scale)
+            self._cached_scale = scale.scale_factor
+            self._cached_widgets = list(self.widgets)
+        else:
+            self.hits += 1
+        window.blit(self._surface, scale.point(self.position))
+    def reposition(self, position: Inferable[Point]) -> 'CachedGroup[DrawableT]':
+        return CachedGroup(position, (widget.reposition((widget.position[0] - self.position[0], widget.position[1] - self.position[1])) for widget in self.widgets))
+
+    @property
+    def cache_bytes(self) -> int:
+        if self._surface is None:
+            return 0
+        return self._surface.get_pitch() * self._surface.get_height()
+    @classmethod
+    def total_bytes(cls) -> int:
+        return sum(group.cache_bytes for group in cls._instances)
+    def __repr__(self) -> str:
+        return f"<CachedGroup widgets={len(self.widgets)} hits={self.hits} misses={self.misses} cache_bytes={self.cache_bytes}>"
+
 
 class Circle(Drawable):
     def __init__(self, position: Inferable[Point], color: Color, radius: int, thickness: int = 0) -> None:
@@ -480,7 +599,9 @@ class Button(Drawable, AutomaticStack, Generic[DrawableT]):
 
     @cached_property[Clickable]
     def _clicker(self) -> Clickable:
-        return Clickable(self.position, self.size, lambda e: self.clicked.invoke())
+        clicker = Clickable(self.position, self.size, lambda e: self.clicked.invoke())
+        clicker.weak_handlers = self.weak_handlers
+        return clicker
     
     @stack_enabler
     def enable(self, stack: ExitStack) -> None:
@@ -522,6 +643,12 @@ class OptionBar(Drawable, AutomaticStack, Generic[DrawableT]):
         return OptionBar(self.position, self.size, self.options)
 
 class OptionMenu(Drawable, AutomaticStack, Generic[DrawableT]):
+    """
+    A switch button which shows and hides a list of options.
+
+    The options' handlers are registered the first time the menu is enabled, closing the menu or disabling it
+    only disables them, so they stay registered, and keep the options alive, until `handler_group` is closed
+    """
     size = Placeholder[Size]((0,0))
     def __init__(self, position: Inferable[Point], size: Size, switch: Button[DrawableT], options: Sequence[Drawable], open: bool = False):
         self.position = position
@@ -534,15 +661,34 @@ class OptionMenu(Drawable, AutomaticStack, Generic[DrawableT]):
         else:
             self.options = list(align @ match_x(position[0]) @ options)
         self.open = open
+        # Built with `handler_group`, the first time the menu is enabled
+        self.option_group: HandlerGroup | None = None
+
+    @cached_property
+    def handler_group(self) -> HandlerGroup:
+        """
+        The handlers of the switch and the options, registered the first time the menu is enabled.
+        The options' handlers are in `option_group`, a subgroup which is enabled while the menu is open
+        """
+        group = HandlerGroup(enabled=False)
+        with group.collect():
+            self.switch.enable()
+            self.option_group = HandlerGroup(enabled=self.open)
+            with self.option_group.collect():
+                for option in self.options:
+                    if isinstance(option, AutomaticStack):
+                        option.enable()
+        return group
 
     def _close_or_open(self) -> None:
-        for option in self.options:
-            if isinstance(option, AutomaticStack):
-                if self.open is True:
-                    option.disable()
-                else:
-                    option.enable()
+        # Before the menu is first enabled, `open` is only read once `option_group` is built
+        if self.option_group is not None:
+            if self.open is True:
+                self.option_group.disable()
+            else:
+                self.option_group.enable()
         self.open = not self.open
+        damage(*self.options)
 
     def draw(self, window: pygame.Surface, scale: float) -> None:
         self.switch.draw(window, scale)
@@ -551,7 +697,7 @@ class OptionMenu(Drawable, AutomaticStack, Generic[DrawableT]):
                 option.draw(window, scale)
     @stack_enabler
     def enable(self, stack: ExitStack) -> None:
-        self.switch.enable()
+        stack.enter_context(self.handler_group)
 
     def reposition(self, position: Inferable[Point]) -> 'OptionMenu[DrawableT]':
         return OptionMenu(position, self.size, self.switch, self.options)
@@ -581,10 +727,18 @@ class Visable(Drawable, AutomaticStack, Generic[DrawableT]):
     def swap_visibility(self) -> 'Visable[DrawableT]':
         return self.set_visability(not self.is_shown)
     
+    @cached_property
+    def handler_group(self) -> HandlerGroup:
+        """The handlers of the widget, registered the first time it's shown and enabled"""
+        group = HandlerGroup(enabled=False)
+        if isinstance(self.widget, AutomaticStack):
+            with group.collect():
+                self.widget.enable()
+        return group
     @stack_enabler
     def enable(self, stack: ExitStack) -> None:
-        if self.is_shown and isinstance(self.widget, AutomaticStack):
-            stack.enter_context(self.widget)
+        if self.is_shown:
+            stack.enter_context(self.handler_group)
 # Some useful positioner functions
 
 def centered(outter: Drawable, inner: DrawableT) -> DrawableT:
@@ -0,0 +1,504 @@
+"""
+Pipes and child processes for the `Window` event loop, built on `add_reader` and `add_writer`.
+
+This provides everything behind asyncio's subprocesses(`asyncio.create_subprocess_exec`, etc),
+the `Window` methods with the same names call the functions here.
+Child processes are watched with a pidfd where the OS has them(Linux 5.3+), which costs nothing
+but a file descriptor in the selector thread, otherwise a thread waits for each child.
+Only posix systems are supported, pipes on Windows can't be watched by `selectors`.
+
+Classes:
+    ReadPipeTransport - an `asyncio.ReadTransport` for the read end of a pipe
+    WritePipeTransport - an `asyncio.WriteTransport` for the write end of a pipe
+    SubprocessTransport - an `asyncio.SubprocessTransport` for a child process started with `subprocess.Popen`
+Functions:
+    connect_read_pipe, connect_write_pipe - same as asyncio's event loop methods
+    subprocess_exec, subprocess_shell - same as asyncio's event loop methods
+"""
+from __future__ import annotations
+import asyncio
+import os
+import stat
+import subprocess
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, TypeVar
+from .sockets import _FlowControlMixin, _read_size, _read_budget, _try_again
+
+import logging
+logger = logging.getLogger(__name__)
+
+ProtocolT = TypeVar('ProtocolT', bound=asyncio.BaseProtocol)
+
+__all__ = (
+    'ReadPipeTransport', 'WritePipeTransport', 'SubprocessTransport',
+    'connect_read_pipe', 'connect_write_pipe', 'subprocess_exec', 'subprocess_shell',
+)
+
+def _pipe_fileno(pipe: Any) -> tuple[int, int]:
+    """Return the file descriptor and mode of `pipe`, after making it non-blocking"""
+    fileno = pipe.fileno()
+    mode = os.fstat(fileno).st_mode
+    if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)):
+        raise ValueError("Pipe transport is only for pipes, sockets and character devices")
+    os.set_blocking(fileno, False)
+    return fileno, mode
+
+def _set_waiter(waiter: asyncio.Future[None] | None) -> None:
+    if waiter is not None and not waiter.cancelled():
+        waiter.set_result(None)
+
+
+class ReadPipeTransport(asyncio.ReadTransport):
+    """
+    A transport for the read end of a pipe.
+
+    Reading is done whenever the pipe is readable, until it's empty.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, pipe: Any, protocol: asyncio.BaseProtocol, waiter: asyncio.Future[None] | None = None) -> None:
+        super().__init__({'pipe': pipe})
+        self._loop = loop
+        self._fileno, _ = _pipe_fileno(pipe)
+        self._pipe = pipe
+        self._protocol = protocol
+        self._closing = False
+        self._paused = False
+        self._connection_lost = False
+        self._loop.call_soon(self._connection_made, waiter)
+
+    def _connection_made(self, waiter: asyncio.Future[None] | None) -> None:
+        self._protocol.connection_made(self)
+        if not self._closing and not self._paused:
+            self._loop.add_reader(self._fileno, self._read_ready)
+        _set_waiter(waiter)
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    # Reading
+    def is_reading(self) -> bool:
+        return not self._paused and not self._closing
+    def pause_reading(self) -> None:
+        if not self.is_reading():
+            return
+        self._paused = True
+        self._loop.remove_reader(self._fileno)
+    def resume_reading(self) -> None:
+        if self._closing or not self._paused:
+            return
+        self._paused = False
+        self._loop.add_reader(self._fileno, self._read_ready)
+
+    def _read_ready(self) -> None:
+        budget = _read_budget
+        while budget > 0 and not self._paused and not self._closing:
+            try:
+                data = os.read(self._fileno, _read_size)
+            except _try_again:
+                return
+            except Exception as e:
+                self._fatal_error(e, "Fatal read error on pipe transport")
+                return
+            if not data:
+                self._read_eof()
+                return
+            budget -= len(data)
+            self._protocol.data_received(data) #type: ignore
+    def _read_eof(self) -> None:
+        self._closing = True
+        self._loop.remove_reader(self._fileno)
+        self._loop.call_soon(self._protocol.eof_received) #type: ignore
+        self._loop.call_soon(self._call_connection_lost, None)
+
+    # Closing
+    def is_closing(self) -> bool:
+        return self._closing
+    def close(self) -> None:
+        if not self._closing:
+            self._force_close(None)
+    def _fatal_error(self, exception: Exception, message: str) -> None:
+        if not isinstance(exception, OSError):
+            self._loop.call_exception_handler({'message': message, 'exception': exception, 'transport': self, 'protocol': self._protocol})
+        self._force_close(exception)
+    def _force_close(self, exception: Exception | None) -> None:
+        self._closing = True
+        self._loop.remove_reader(self._fileno)
+        self._loop.call_soon(self._call_connection_lost, exception)
+    def _call_connection_lost(self, exception: Exception | None) -> None:
+        if self._connection_lost:
+            return
+        self._connection_lost = True
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            self._pipe.close()
+
+
+class WritePipeTransport(_FlowControlMixin, asyncio.WriteTransport):
+    """
+    A transport for the write end of a pipe.
+
+    Writes are done immediately if possible, and otherwise buffered until the pipe is writable.
+    The read end closing makes the write end readable(it reports an error), so the transport
+    watches for that to notice the other side going away, even when nothing is being written.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, pipe: Any, protocol: asyncio.BaseProtocol, waiter: asyncio.Future[None] | None = None) -> None:
+        super().__init__({'pipe': pipe})
+        self._loop = loop
+        self._fileno, mode = _pipe_fileno(pipe)
+        self._pipe = pipe
+        self._protocol = protocol
+        self._buffer = bytearray()
+        self._closing = False
+        self._connection_lost = False
+        self._watch_read_end = stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+        self._loop.call_soon(self._connection_made, waiter)
+
+    def _connection_made(self, waiter: asyncio.Future[None] | None) -> None:
+        self._protocol.connection_made(self)
+        if self._watch_read_end and not self._closing:
+            self._loop.add_reader(self._fileno, self._read_ready)
+        _set_waiter(waiter)
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    def _read_ready(self) -> None:
+        # The read end was closed
+        if self._buffer:
+            self._fatal_error(BrokenPipeError(), "Pipe closed by the other side")
+        else:
+            self._force_close(None)
+
+    # Writing
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if not data or self._closing:
+            return
+        if not self._buffer:
+            try:
+                written = os.write(self._fileno, data)
+            except _try_again:
+                written = 0
+            except Exception as e:
+                self._fatal_error(e, "Fatal write error on pipe transport")
+                return
+            data = memoryview(data)[written:]
+            if not data:
+                return
+            self._loop.add_writer(self._fileno, self._write_ready)
+        self._buffer.extend(data)
+        self._maybe_pause_protocol()
+    def _write_ready(self) -> None:
+        try:
+            written = os.write(self._fileno, self._buffer)
+        except _try_again:
+            return
+        except Exception as e:
+            self._loop.remove_writer(self._fileno)
+            self._buffer.clear()
+            self._fatal_error(e, "Fatal write error on pipe transport")
+            return
+        del self._buffer[:written]
+        self._maybe_resume_protocol()
+        if self._buffer:
+            return
+        self._loop.remove_writer(self._fileno)
+        if self._closing:
+            self._loop.remove_reader(self._fileno)
+            self._call_connection_lost(None)
+
+    def can_write_eof(self) -> bool:
+        return True
+    def write_eof(self) -> None:
+        """Close the pipe once the write buffer is flushed, which is the only way to send EOF through a pipe"""
+        if self._closing:
+            return
+        self._closing = True
+        if not self._buffer:
+            self._loop.remove_reader(self._fileno)
+            self._loop.call_soon(self._call_connection_lost, None)
+
+    # Closing
+    def is_closing(self) -> bool:
+        return self._closing
+    def close(self) -> None:
+        """Close the transport once the write buffer is flushed"""
+        self.write_eof()
+    def abort(self) -> None:
+        """Close the transport immediately, discarding the write buffer"""
+        self._force_close(None)
+    def _fatal_error(self, exception: Exception, message: str) -> None:
+        if not isinstance(exception, OSError):
+            self._loop.call_exception_handler({'message': message, 'exception': exception, 'transport': self, 'protocol': self._protocol})
+        self._force_close(exception)
+    def _force_close(self, exception: Exception | None) -> None:
+        if self._connection_lost:
+            return
+        if self._buffer:
+            self._buffer.clear()
+            self._loop.remove_writer(self._fileno)
+        self._closing = True
+        self._loop.remove_reader(self._fileno)
+        self._loop.call_soon(self._call_connection_lost, exception)
+    def _call_connection_lost(self, exception: Exception | None) -> None:
+        if self._connection_lost:
+            return
+        self._connection_lost = True
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            self._pipe.close()
+
+
+async def connect_read_pipe(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], pipe: Any) -> tuple[ReadPipeTransport, ProtocolT]:
+    protocol = protocol_factory()
+    waiter: asyncio.Future[None] = loop.create_future()
+    transport = ReadPipeTransport(loop, pipe, protocol, waiter)
+    try:
+        await waiter
+    except BaseException:
+        transport.close()
+        raise
+    return transport, protocol
+async def connect_write_pipe(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], pipe: Any) -> tuple[WritePipeTransport, ProtocolT]:
+    protocol = protocol_factory()
+    waiter: asyncio.Future[None] = loop.create_future()
+    transport = WritePipeTransport(loop, pipe, protocol, waiter)
+    try:
+        await waiter
+    except BaseException:
+        transport.close()
+        raise
+    return transport, protocol
+
+
+class _PipeProtocol(asyncio.Protocol):
+    """Forwards what happens on one of a child's pipes to it's `SubprocessTransport`"""
+    def __init__(self, process: SubprocessTransport, fd: int) -> None:
+        self.process = process
+        self.fd = fd
+        self.pipe: asyncio.BaseTransport | None = None
+        self.disconnected = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.pipe = transport
+    def connection_lost(self, exception: Exception | None) -> None:
+        self.disconnected = True
+        self.process._pipe_connection_lost(self.fd, exception)
+    def data_received(self, data: bytes) -> None:
+        self.process._pipe_data_received(self.fd, data)
+    def pause_writing(self) -> None:
+        self.process._protocol.pause_writing()
+    def resume_writing(self) -> None:
+        self.process._protocol.resume_writing()
+
+class SubprocessTransport(asyncio.SubprocessTransport):
+    """
+    A transport for a child process, it's standard streams are connected with pipe transports
+    and it's exit is noticed through a pidfd, or a waiting thread where those aren't available.
+
+    Like asyncio's, the protocol's `connection_lost` is called once the process has exited and all of
+    it's pipes are closed, and `process_exited` and the pipe callbacks that happen before `connection_made`
+    are delayed until after it.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, protocol: asyncio.SubprocessProtocol, args: Any, shell: bool,
+                 stdin: Any, stdout: Any, stderr: Any, bufsize: int, **kwargs: Any) -> None:
+        extra: dict[str, Any] = {}
+        super().__init__(extra)
+        self._loop = loop
+        self._protocol = protocol
+        self._closed = False
+        self._finished = False
+        self._returncode: int | None = None
+        self._exit_waiters: list[asyncio.Future[int]] = []
+        self._pending_calls: deque[tuple[Callable[..., object], tuple[Any, ...]]] | None = deque()
+        self._pipes: dict[int, _PipeProtocol | None] = {}
+        if stdin == subprocess.PIPE:
+            self._pipes[0] = None
+        if stdout == subprocess.PIPE:
+            self._pipes[1] = None
+        if stderr == subprocess.PIPE:
+            self._pipes[2] = None
+
+        self._process = subprocess.Popen(args, shell=shell, stdin=stdin, stdout=stdout, stderr=stderr, universal_newlines=False, bufsize=bufsize, **kwargs)
+        self._pid = self._process.pid
+        extra['subprocess'] = self._process
+        self._pidfd: int | None = None
+        self._watch()
+
+    # Watching for the child's exit
+    def _watch(self) -> None:
+        try:
+            self._pidfd = os.pidfd_open(self._pid)
+        except (AttributeError, OSError):
+            threading.Thread(target=self._wait_in_thread, name=f"asyncui-wait-{self._pid}", daemon=True).start()
+        else:
+            self._loop.add_reader(self._pidfd, self._pidfd_ready)
+    def _pidfd_ready(self) -> None:
+        assert self._pidfd is not None
+        self._loop.remove_reader(self._pidfd)
+        os.close(self._pidfd)
+        self._pidfd = None
+        # The child has exited, so this only collects it's status
+        self._process_exited(self._process.wait())
+    def _wait_in_thread(self) -> None:
+        returncode = self._process.wait()
+        try:
+            self._loop.call_soon_threadsafe(self._process_exited, returncode)
+        except RuntimeError:
+            logger.warning("Child process %s exited after it's event loop was closed", self._pid)
+
+    async def _connect_pipes(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            process = self._process
+            if process.stdin is not None:
+                _, self._pipes[0] = await connect_write_pipe(self._loop, lambda: _PipeProtocol(self, 0), process.stdin)
+            if process.stdout is not None:
+                _, self._pipes[1] = await connect_read_pipe(self._loop, lambda: _PipeProtocol(self, 1), process.stdout)
+            if process.stderr is not None:
+                _, self._pipes[2] = await connect_read_pipe(self._loop, lambda: _PipeProtocol(self, 2), process.stderr)
+
+            assert self._pending_calls is not None
+            self._loop.call_soon(self._protocol.connection_made, self)
+            for callback, args in self._pending_calls:
+                self._loop.call_soon(callback, *args)
+            self._pending_calls = None
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as e:
+            if not waiter.cancelled():
+                waiter.set_exception(e)
+        else:
+            _set_waiter(waiter)
+
+    def _call(self, callback: Callable[..., object], *args: Any) -> None:
+        if self._pending_calls is not None:
+            self._pending_calls.append((callback, args))
+        else:
+            self._loop.call_soon(callback, *args)
+
+    def _pipe_data_received(self, fd: int, data: bytes) -> None:
+        self._call(self._protocol.pipe_data_received, fd, data)
+    def _pipe_connection_lost(self, fd: int, exception: Exception | None) -> None:
+        self._call(self._protocol.pipe_connection_lost, fd, exception)
+        self._try_finish()
+    def _process_exited(self, returncode: int) -> None:
+        if self._returncode is not None:
+            return
+        self._returncode = returncode
+        if self._loop.get_debug():
+            logger.info("Child process %s exited with return code %s", self._pid, returncode)
+        self._call(self._protocol.process_exited)
+        self._try_finish()
+
+    def _try_finish(self) -> None:
+        if self._returncode is None or self._finished:
+            return
+        if all(pipe is not None and pipe.disconnected for pipe in self._pipes.values()):
+            self._finished = True
+            self._call(self._call_connection_lost, None)
+    def _call_connection_lost(self, exception: Exception | None) -> None:
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            for waiter in self._exit_waiters:
+                if not waiter.cancelled():
+                    waiter.set_result(self._returncode) #type: ignore
+            self._exit_waiters.clear()
+
+    async def _wait(self) -> int:
+        """Wait for the process to exit and return it's return code, used by `asyncio.subprocess.Process.wait`"""
+        if self._returncode is not None:
+            return self._returncode
+        waiter: asyncio.Future[int] = self._loop.create_future()
+        self._exit_waiters.append(waiter)
+        return await waiter
+
+    def get_pid(self) -> int:
+        return self._pid
+    def get_returncode(self) -> int | None:
+        return self._returncode
+    def get_pipe_transport(self, fd: int) -> asyncio.BaseTransport | None:
+        pipe = self._pipes.get(fd)
+        return pipe.pipe if pipe is not None else None
+
+    def send_signal(self, signal: int) -> None:
+        self._process.send_signal(signal)
+    def terminate(self) -> None:
+        self._process.terminate()
+    def kill(self) -> None:
+        self._process.kill()
+
+    def is_closing(self) -> bool:
+        return self._closed
+    def close(self) -> None:
+        """Close the pipes, and kill the process if it's still running"""
+        if self._closed:
+            return
+        self._closed = True
+        # Pipes which never got connected won't be, so they don't hold up `connection_lost`
+        connected = {fd: pipe for fd, pipe in self._pipes.items() if pipe is not None}
+        for pipe in connected.values():
+            if pipe.pipe is not None:
+                pipe.pipe.close()
+        self._pipes = dict(connected)
+        if self._returncode is None and self._process.poll() is None:
+            if self._loop.get_debug():
+                logger.warning("Closing running child process %s, killing it", self._pid)
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+
+
+async def _start_subprocess(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], args: Any, shell: bool,
+                            stdin: Any, stdout: Any, stderr: Any, universal_newlines: bool, bufsize: int,
+                            encoding: str | None, errors: str | None, text: bool | None, kwargs: dict[str, Any]) -> tuple[SubprocessTransport, ProtocolT]:
+    if sys.platform == 'win32':
+        raise NotImplementedError("pygame event loop only supports subprocesses on posix systems")
+    if universal_newlines:
+        raise ValueError("universal_newlines must be False")
+    if bufsize != 0:
+        raise ValueError("bufsize must be 0")
+    if text:
+        raise ValueError("text must be False")
+    if encoding is not None:
+        raise ValueError("encoding must be None")
+    if errors is not None:
+        raise ValueError("errors must be None")
+
+    protocol = protocol_factory()
+    transport = SubprocessTransport(loop, protocol, args, shell, stdin, stdout, stderr, bufsize, **kwargs) #type: ignore
+    waiter: asyncio.Future[None] = loop.create_future()
+    # Connecting the pipes is a task so `connection_made`, which it schedules, runs before the waiter wakes us up
+    loop.create_task(transport._connect_pipes(waiter))
+    try:
+        await waiter
+    except BaseException:
+        # The child is killed, and is still collected by it's watcher
+        transport.close()
+        raise
+    return transport, protocol
+
+async def subprocess_exec(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], program: Any, *args: Any,
+                          stdin: Any = subprocess.PIPE, stdout: Any = subprocess.PIPE, stderr: Any = subprocess.PIPE,
+                          universal_newlines: bool = False, shell: bool = False, bufsize: int = 0,
+                          encoding: str | None = None, errors: str | None = None, text: bool | None = None, **kwargs: Any) -> tuple[SubprocessTransport, ProtocolT]:
+    if shell:
+        raise ValueError("shell must be False")
+    return await _start_subprocess(loop, protocol_factory, (program, *args), False, stdin, stdout, stderr, universal_newlines, bufsize, encoding, errors, text, kwargs)
+
+async def subprocess_shell(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], cmd: str | bytes, *,
+                           stdin: Any = subprocess.PIPE, stdout: Any = subprocess.PIPE, stderr: Any = subprocess.PIPE,
+                           universal_newlines: bool = False, shell: bool = True, bufsize: int = 0,
+                           encoding: str | None = None, errors: str | None = None, text: bool | None = None, **kwargs: Any) -> tuple[SubprocessTransport, ProtocolT]:
+    if not isinstance(cmd, (bytes, str)):
+        raise ValueError("cmd must be a string")
+    if not shell:
+        raise ValueError("shell must be True")
+    return await _start_subprocess(loop, protocol_factory, cmd, True, stdin, stdout, stderr, universal_newlines, bufsize, encoding, errors, text, kwargs)
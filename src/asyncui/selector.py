@@ -0,0 +1,219 @@
+"""
+Support for watching file descriptors(sockets, pipes, etc) from the `Window` event loop.
+
+pygame can only wait on it's own event queue, so file descriptors are watched by a background thread
+using `selectors`. When some become ready, the thread hands the whole batch to the window with a single wakeup,
+and the window runs the callbacks registered with `add_reader` and `add_writer`.
+
+Classes:
+    SelectorThread - watches file descriptors for readiness on a background thread, used by `Window.add_reader` and friends
+"""
+import asyncio
+import selectors
+import socket
+import threading
+from typing import Callable, Protocol, Any, TypeVarTuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+Ts = TypeVarTuple('Ts')
+
+class _HasFileNumber(Protocol):
+    def fileno(self) -> int: ...
+FileDescriptorLike = int | _HasFileNumber
+
+def _fileno(fileobj: FileDescriptorLike) -> int:
+    fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+    if fd < 0:
+        raise ValueError(f"Invalid file descriptor: {fd}")
+    return fd
+
+class SelectorThread:
+    """
+    Watches file descriptors for readiness on a background thread, and runs callbacks for them on the event loop.
+
+    The thread and the event loop take turns: the thread waits in `select` until some file descriptors are ready,
+    passes them to the loop with one `call_soon_threadsafe`, then waits for the loop to run their callbacks before selecting again.
+    So a callback never runs twice for the same readiness, and a burst of ready file descriptors costs one wakeup.
+
+    Registrations are only changed on the event loop's thread, the selector thread picks them up
+    before every `select`, and is interrupted through a socket pair when they change.
+    The thread is started by the first registration.
+
+    Methods:
+        add_reader, remove_reader, add_writer, remove_writer - same as asyncio's event loop methods
+        close - stop the thread and release it's resources
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.readers: dict[int, asyncio.Handle] = {}
+        self.writers: dict[int, asyncio.Handle] = {}
+
+        self._lock = threading.Lock()
+        self._selector_turn = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._waker_read: socket.socket | None = None
+        self._waker_write: socket.socket | None = None
+
+    # Registration, used from the event loop's thread
+    def add_reader(self, fileobj: FileDescriptorLike, callback: Callable[[*Ts], object], *args: *Ts) -> None:
+        self._add(self.readers, fileobj, callback, args)
+    def remove_reader(self, fileobj: FileDescriptorLike) -> bool:
+        return self._remove(self.readers, fileobj)
+    def add_writer(self, fileobj: FileDescriptorLike, callback: Callable[[*Ts], object], *args: *Ts) -> None:
+        self._add(self.writers, fileobj, callback, args)
+    def remove_writer(self, fileobj: FileDescriptorLike) -> bool:
+        return self._remove(self.writers, fileobj)
+
+    def _add(self, registrations: dict[int, asyncio.Handle], fileobj: FileDescriptorLike, callback: Callable[..., object], args: tuple[Any, ...]) -> None:
+        if self._closed:
+            raise RuntimeError("Selector thread is closed")
+        fd = _fileno(fileobj)
+        with self._lock:
+            old_handle = registrations.get(fd)
+            registrations[fd] = asyncio.Handle(callback, args, self.loop, None)
+        if old_handle is not None:
+            old_handle.cancel()
+        self._start()
+        self._wake()
+    def _remove(self, registrations: dict[int, asyncio.Handle], fileobj: FileDescriptorLike) -> bool:
+        fd = _fileno(fileobj)
+        with self._lock:
+            handle = registrations.pop(fd, None)
+        if handle is None:
+            return False
+        handle.cancel()
+        self._wake()
+        return True
+
+    def close(self) -> None:
+        """Stop the selector thread, it's registrations are dropped"""
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            self.readers.clear()
+            self.writers.clear()
+        self._wake()
+        self._selector_turn.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        self._waker_read, self._waker_write = socket.socketpair()
+        self._waker_read.setblocking(False)
+        self._waker_write.setblocking(False)
+        self._selector_turn.set()
+        self._thread = threading.Thread(target=self._run, name="asyncui-selector", daemon=True)
+        self._thread.start()
+        logger.info("started selector thread")
+    def _wake(self) -> None:
+        # Interrupt `select`, so the selector thread picks up the new registrations
+        if self._waker_write is None:
+            return
+        try:
+            self._waker_write.send(b'\0')
+        except (BlockingIOError, OSError):
+            # The buffer is full, so the selector is going to wake up anyway
+            pass
+
+    # Dispatching, on the event loop's thread
+    def _dispatch(self, readable: list[int], writable: list[int]) -> None:
+        try:
+            for fd in readable:
+                handle = self.readers.get(fd)
+                if handle is not None and not handle.cancelled():
+                    handle._run()
+            for fd in writable:
+                handle = self.writers.get(fd)
+                if handle is not None and not handle.cancelled():
+                    handle._run()
+        finally:
+            self._selector_turn.set()
+
+    # The selector thread
+    def _run(self) -> None:
+        assert self._waker_read is not None and self._waker_write is not None
+        selector = selectors.DefaultSelector()
+        selector.register(self._waker_read, selectors.EVENT_READ)
+        # The mask and handles each file descriptor is registered with
+        registered: dict[int, tuple[int, asyncio.Handle | None, asyncio.Handle | None]] = {}
+        try:
+            while not self._closed:
+                self._selector_turn.wait()
+                if self._closed:
+                    break
+                self._sync_registrations(selector, registered)
+                
+                readable: list[int] = []
+                writable: list[int] = []
+                for key, mask in selector.select():
+                    if key.fileobj is self._waker_read:
+                        self._drain_waker()
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        readable.append(key.fd)
+                    if mask & selectors.EVENT_WRITE:
+                        writable.append(key.fd)
+                
+                if readable or writable:
+                    # Wait for the loop to run the callbacks before selecting again
+                    self._selector_turn.clear()
+                    try:
+                        self.loop.call_soon_threadsafe(self._dispatch, readable, writable)
+                    except RuntimeError:
+                        # The loop is closed
+                        break
+        finally:
+            selector.close()
+            self._waker_read.close()
+            self._waker_write.close()
+    def _sync_registrations(self, selector: selectors.BaseSelector, registered: dict[int, tuple[int, asyncio.Handle | None, asyncio.Handle | None]]) -> None:
+        with self._lock:
+            wanted: dict[int, tuple[int, asyncio.Handle | None, asyncio.Handle | None]] = {}
+            for fd in self.readers.keys() | self.writers.keys():
+                reader, writer = self.readers.get(fd), self.writers.get(fd)
+                mask = (selectors.EVENT_READ if reader else 0) | (selectors.EVENT_WRITE if writer else 0)
+                wanted[fd] = (mask, reader, writer)
+        
+        for fd in list(registered):
+            if registered[fd] != wanted.get(fd):
+                # Removed or replaced, a replaced file descriptor may have been closed and reopened,
+                # so it's always registered again from scratch
+                del registered[fd]
+                try:
+                    selector.unregister(fd)
+                except (KeyError, ValueError, OSError):
+                    # Already closed
+                    pass
+        for fd, registration in wanted.items():
+            if fd in registered:
+                continue
+            try:
+                selector.register(fd, registration[0])
+            except (ValueError, OSError) as e:
+                # The file descriptor is invalid(probably closed), report it and forget about it
+                self.loop.call_soon_threadsafe(self._report_invalid, fd, registration, e)
+                continue
+            registered[fd] = registration
+    def _report_invalid(self, fd: int, registration: tuple[int, asyncio.Handle | None, asyncio.Handle | None], exception: BaseException) -> None:
+        _, reader, writer = registration
+        if reader is not None and self.readers.get(fd) is reader:
+            self._remove(self.readers, fd)
+        if writer is not None and self.writers.get(fd) is writer:
+            self._remove(self.writers, fd)
+        self.loop.call_exception_handler({
+            'message': f"Can't watch file descriptor {fd}",
+            'exception': exception,
+        })
+    def _drain_waker(self) -> None:
+        assert self._waker_read is not None
+        try:
+            while self._waker_read.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
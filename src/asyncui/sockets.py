@@ -0,0 +1,663 @@
+"""
+Non-blocking socket support for the `Window` event loop, built on `add_reader` and `add_writer`.
+
+This provides everything behind asyncio's streams(`asyncio.open_connection`, `asyncio.start_server`, etc),
+the `Window` methods with the same names call the functions here.
+TLS is not supported.
+
+Classes:
+    SocketTransport - an `asyncio.Transport` for a connected stream socket
+    Server - an `asyncio.AbstractServer` which accepts connections on listening sockets
+Functions:
+    sock_recv, sock_recv_into, sock_recvfrom, sock_recvfrom_into, sock_sendall, sock_sendto, sock_connect, sock_accept, sock_sendfile -
+        same as asyncio's event loop methods, they wait for readiness instead of blocking
+    create_connection, create_unix_connection, create_server, create_unix_server, connect_accepted_socket -
+        same as asyncio's event loop methods, except that TLS is not supported
+"""
+from __future__ import annotations
+import asyncio
+import errno
+import os
+import socket
+import stat
+from typing import Any, Callable, TypeVar, Iterable
+
+import logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+ProtocolT = TypeVar('ProtocolT', bound=asyncio.BaseProtocol)
+
+__all__ = (
+    'SocketTransport', 'Server',
+    'sock_recv', 'sock_recv_into', 'sock_recvfrom', 'sock_recvfrom_into', 'sock_sendall', 'sock_sendto',
+    'sock_connect', 'sock_accept', 'sock_sendfile',
+    'create_connection', 'create_unix_connection', 'create_server', 'create_unix_server', 'connect_accepted_socket',
+)
+
+# How much is read from a socket or pipe at once, pipes share these with sockets, see `processes`
+_read_size = 256 * 1024
+# The most bytes read in one readiness callback, the rest is read after the selector reports the file descriptor again,
+# so a fast peer can't keep the loop inside one callback, away from input and frames
+_read_budget = 4 * _read_size
+_try_again = (BlockingIOError, InterruptedError)
+
+def _check_socket(sock: socket.socket) -> None:
+    if sock.gettimeout() != 0:
+        raise ValueError("the socket must be non-blocking")
+def _check_ssl(ssl: object) -> None:
+    if ssl:
+        raise NotImplementedError("pygame event loop does not support TLS")
+
+# Keywords asyncio accepts that this loop has no support for, only their defaults are allowed
+_unsupported_options = frozenset({'ssl_handshake_timeout', 'ssl_shutdown_timeout', 'server_hostname', 'happy_eyeballs_delay', 'interleave', 'all_errors', 'keep_alive'})
+
+def _check_options(options: dict[str, Any]) -> None:
+    for name, value in options.items():
+        if name not in _unsupported_options:
+            raise TypeError(f"unexpected keyword argument {name!r}")
+        if value:
+            raise NotImplementedError(f"pygame event loop does not support {name}")
+
+def _set_result(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+async def _wait_readable(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+    future: asyncio.Future[None] = loop.create_future()
+    loop.add_reader(sock, _set_result, future)
+    try:
+        await future
+    finally:
+        loop.remove_reader(sock)
+async def _wait_writable(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+    future: asyncio.Future[None] = loop.create_future()
+    loop.add_writer(sock, _set_result, future)
+    try:
+        await future
+    finally:
+        loop.remove_writer(sock)
+
+async def _retry_readable(loop: asyncio.AbstractEventLoop, sock: socket.socket, operation: Callable[[], T]) -> T:
+    """Run `operation` until it stops raising BlockingIOError, waiting for the socket to be readable in between"""
+    _check_socket(sock)
+    while True:
+        try:
+            return operation()
+        except _try_again:
+            await _wait_readable(loop, sock)
+async def _retry_writable(loop: asyncio.AbstractEventLoop, sock: socket.socket, operation: Callable[[], T]) -> T:
+    """Run `operation` until it stops raising BlockingIOError, waiting for the socket to be writable in between"""
+    _check_socket(sock)
+    while True:
+        try:
+            return operation()
+        except _try_again:
+            await _wait_writable(loop, sock)
+
+
+# Low level socket operations
+async def sock_recv(loop: asyncio.AbstractEventLoop, sock: socket.socket, nbytes: int) -> bytes:
+    return await _retry_readable(loop, sock, lambda: sock.recv(nbytes))
+async def sock_recv_into(loop: asyncio.AbstractEventLoop, sock: socket.socket, buffer: Any) -> int:
+    return await _retry_readable(loop, sock, lambda: sock.recv_into(buffer))
+async def sock_recvfrom(loop: asyncio.AbstractEventLoop, sock: socket.socket, bufsize: int) -> tuple[bytes, Any]:
+    return await _retry_readable(loop, sock, lambda: sock.recvfrom(bufsize))
+async def sock_recvfrom_into(loop: asyncio.AbstractEventLoop, sock: socket.socket, buffer: Any, nbytes: int = 0) -> tuple[int, Any]:
+    return await _retry_readable(loop, sock, lambda: sock.recvfrom_into(buffer, nbytes))
+async def sock_sendto(loop: asyncio.AbstractEventLoop, sock: socket.socket, data: Any, address: Any) -> int:
+    return await _retry_writable(loop, sock, lambda: sock.sendto(data, address))
+async def sock_accept(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> tuple[socket.socket, Any]:
+    connection, address = await _retry_readable(loop, sock, sock.accept)
+    connection.setblocking(False)
+    return connection, address
+
+async def sock_sendall(loop: asyncio.AbstractEventLoop, sock: socket.socket, data: Any) -> None:
+    _check_socket(sock)
+    view = memoryview(data).cast('B')
+    while view:
+        try:
+            view = view[sock.send(view):]
+        except _try_again:
+            await _wait_writable(loop, sock)
+
+async def sock_connect(loop: asyncio.AbstractEventLoop, sock: socket.socket, address: Any) -> None:
+    _check_socket(sock)
+    if sock.family in (socket.AF_INET, socket.AF_INET6):
+        address = await _resolve(loop, sock, address)
+    try:
+        sock.connect(address)
+        return
+    except _try_again:
+        pass
+    await _wait_writable(loop, sock)
+    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+    if error != 0:
+        raise OSError(error, f"Connect call failed {address}: {os.strerror(error)}")
+
+async def _resolve(loop: asyncio.AbstractEventLoop, sock: socket.socket, address: Any) -> Any:
+    host, port = address[:2]
+    try:
+        socket.inet_pton(sock.family, host)
+    except (OSError, TypeError):
+        # Not a numeric address, look it up
+        infos = await loop.getaddrinfo(host, port, family=sock.family, type=sock.type, proto=sock.proto)
+        if not infos:
+            raise OSError(f"getaddrinfo({host!r}) returned empty list")
+        return infos[0][4]
+    return address
+
+async def sock_sendfile(loop: asyncio.AbstractEventLoop, sock: socket.socket, file: Any, offset: int = 0, count: int | None = None, fallback: bool | None = True) -> int:
+    """Send a file by reading it in chunks, the zero copy `os.sendfile` path is not used"""
+    if not fallback:
+        raise asyncio.SendfileNotAvailableError("pygame event loop only supports sendfile with fallback")
+    if offset:
+        file.seek(offset)
+    total = 0
+    while count is None or total < count:
+        chunk_size = _read_size if count is None else min(_read_size, count - total)
+        chunk = await loop.run_in_executor(None, file.read, chunk_size)
+        if not chunk:
+            break
+        await sock_sendall(loop, sock, chunk)
+        total += len(chunk)
+    return total
+
+
+class _FlowControlMixin:
+    """
+    Write flow control shared by the transports, pauses the protocol when the write buffer
+    goes over the high water mark and resumes it once it drains below the low water mark
+    """
+    _loop: asyncio.AbstractEventLoop
+    _protocol: asyncio.BaseProtocol
+    _buffer: bytearray
+    _high_water = 64 * 1024
+    _low_water = 16 * 1024
+    _writing_paused = False
+
+    def set_write_buffer_limits(self, high: int | None = None, low: int | None = None) -> None:
+        if high is None:
+            high = 64 * 1024 if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise ValueError(f"high ({high!r}) must be >= low ({low!r}) must be >= 0")
+        self._high_water, self._low_water = high, low
+        self._maybe_pause_protocol()
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return self._low_water, self._high_water
+    def get_write_buffer_size(self) -> int:
+        return len(self._buffer)
+    def _maybe_pause_protocol(self) -> None:
+        if self._writing_paused or len(self._buffer) <= self._high_water:
+            return
+        self._writing_paused = True
+        try:
+            self._protocol.pause_writing()
+        except Exception as e:
+            self._loop.call_exception_handler({'message': 'protocol.pause_writing() failed', 'exception': e, 'transport': self, 'protocol': self._protocol})
+    def _maybe_resume_protocol(self) -> None:
+        if not self._writing_paused or len(self._buffer) > self._low_water:
+            return
+        self._writing_paused = False
+        try:
+            self._protocol.resume_writing()
+        except Exception as e:
+            self._loop.call_exception_handler({'message': 'protocol.resume_writing() failed', 'exception': e, 'transport': self, 'protocol': self._protocol})
+
+
+class SocketTransport(_FlowControlMixin, asyncio.Transport):
+    """
+    A transport for a connected stream socket.
+
+    Reading is done whenever the socket is readable, as much as is buffered by the kernel is read at once.
+    Writes are sent immediately if possible, and otherwise buffered until the socket is writable.
+    Supports both `asyncio.Protocol` and `asyncio.BufferedProtocol`.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, sock: socket.socket, protocol: asyncio.BaseProtocol, waiter: asyncio.Future[None] | None = None, server: Server | None = None) -> None:
+        extra: dict[str, Any] = {'socket': sock}
+        try:
+            extra['sockname'] = sock.getsockname()
+        except OSError:
+            extra['sockname'] = None
+        try:
+            extra['peername'] = sock.getpeername()
+        except OSError:
+            extra['peername'] = None
+        super().__init__(extra)
+        self._loop = loop
+        self._sock: socket.socket | None = sock
+        self._server = server
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and sock.type == socket.SOCK_STREAM:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self._buffer = bytearray()
+        self._closing = False
+        self._eof = False
+        self._paused = False
+        self._connection_lost = False
+
+        self.set_protocol(protocol)
+        if server is not None:
+            server._attach()
+        self._loop.call_soon(self._connection_made, waiter)
+
+    def _connection_made(self, waiter: asyncio.Future[None] | None) -> None:
+        self._protocol.connection_made(self)
+        if not self._closing:
+            self._loop.add_reader(self._require_socket(), self._read_ready)
+        if waiter is not None and not waiter.cancelled():
+            waiter.set_result(None)
+
+    def _require_socket(self) -> socket.socket:
+        assert self._sock is not None, "transport is closed"
+        return self._sock
+
+    # Protocols
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol
+        self._buffered = isinstance(protocol, asyncio.BufferedProtocol)
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+
+    # Reading
+    def is_reading(self) -> bool:
+        return not self._paused and not self._closing
+    def pause_reading(self) -> None:
+        if not self.is_reading():
+            return
+        self._paused = True
+        self._loop.remove_reader(self._require_socket())
+    def resume_reading(self) -> None:
+        if self._closing or not self._paused:
+            return
+        self._paused = False
+        self._loop.add_reader(self._require_socket(), self._read_ready)
+
+    def _read_ready(self) -> None:
+        sock = self._require_socket()
+        # Keep reading until the kernel's buffer is empty, or the budget is used up, so one wakeup moves as much data as it can
+        budget = _read_budget
+        while budget > 0 and not self._paused and not self._closing:
+            try:
+                if self._buffered:
+                    protocol: Any = self._protocol
+                    buffer = protocol.get_buffer(-1)
+                    nbytes = sock.recv_into(buffer)
+                    if nbytes:
+                        budget -= nbytes
+                        protocol.buffer_updated(nbytes)
+                        continue
+                else:
+                    data = sock.recv(_read_size)
+                    if data:
+                        budget -= len(data)
+                        self._protocol.data_received(data) #type: ignore
+                        continue
+            except _try_again:
+                return
+            except Exception as e:
+                self._fatal_error(e, "Fatal read error on socket transport")
+                return
+            self._read_eof()
+            return
+    def _read_eof(self) -> None:
+        self._loop.remove_reader(self._require_socket())
+        keep_open = self._protocol.eof_received() #type: ignore
+        if not keep_open:
+            self.close()
+
+    # Writing
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        if self._eof:
+            raise RuntimeError("Cannot call write() after write_eof()")
+        if not data or self._connection_lost:
+            return
+        sock = self._require_socket()
+        if not self._buffer:
+            try:
+                sent = sock.send(data)
+            except _try_again:
+                sent = 0
+            except Exception as e:
+                self._fatal_error(e, "Fatal write error on socket transport")
+                return
+            data = memoryview(data)[sent:]
+            if not data:
+                return
+            self._loop.add_writer(sock, self._write_ready)
+        self._buffer.extend(data)
+        self._maybe_pause_protocol()
+    def _write_ready(self) -> None:
+        sock = self._require_socket()
+        try:
+            sent = sock.send(self._buffer)
+        except _try_again:
+            return
+        except Exception as e:
+            self._loop.remove_writer(sock)
+            self._buffer.clear()
+            self._fatal_error(e, "Fatal write error on socket transport")
+            return
+        del self._buffer[:sent]
+        self._maybe_resume_protocol()
+        if self._buffer:
+            return
+        self._loop.remove_writer(sock)
+        if self._closing:
+            self._call_connection_lost(None)
+        elif self._eof:
+            sock.shutdown(socket.SHUT_WR)
+
+    def can_write_eof(self) -> bool:
+        return True
+    def write_eof(self) -> None:
+        if self._closing or self._eof:
+            return
+        self._eof = True
+        if not self._buffer:
+            self._require_socket().shutdown(socket.SHUT_WR)
+
+    # Closing
+    def is_closing(self) -> bool:
+        return self._closing
+    def close(self) -> None:
+        """Close the transport once the write buffer is flushed"""
+        if self._closing:
+            return
+        self._closing = True
+        self._loop.remove_reader(self._require_socket())
+        if not self._buffer:
+            self._loop.call_soon(self._call_connection_lost, None)
+    def abort(self) -> None:
+        """Close the transport immediately, discarding the write buffer"""
+        self._force_close(None)
+    def _fatal_error(self, exception: Exception, message: str) -> None:
+        if not isinstance(exception, OSError):
+            self._loop.call_exception_handler({'message': message, 'exception': exception, 'transport': self, 'protocol': self._protocol})
+        self._force_close(exception)
+    def _force_close(self, exception: Exception | None) -> None:
+        if self._connection_lost or self._sock is None:
+            return
+        if self._buffer:
+            self._buffer.clear()
+            self._loop.remove_writer(self._sock)
+        if not self._closing:
+            self._closing = True
+            self._loop.remove_reader(self._sock)
+        self._loop.call_soon(self._call_connection_lost, exception)
+    def _call_connection_lost(self, exception: Exception | None) -> None:
+        if self._connection_lost:
+            return
+        self._connection_lost = True
+        try:
+            self._protocol.connection_lost(exception)
+        finally:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+            if self._server is not None:
+                self._server._detach()
+                self._server = None
+
+
+class Server(asyncio.AbstractServer):
+    """
+    Accepts connections on listening sockets, creating a `SocketTransport` and protocol for each of them
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, sockets: Iterable[socket.socket], protocol_factory: Callable[[], asyncio.BaseProtocol], backlog: int) -> None:
+        self._loop = loop
+        self._sockets: list[socket.socket] | None = list(sockets)
+        self._protocol_factory = protocol_factory
+        self._backlog = backlog
+        self._serving = False
+        self._active_count = 0
+        self._waiters: list[asyncio.Future[None]] | None = []
+        self._serving_forever: asyncio.Future[None] | None = None
+
+    @property
+    def sockets(self) -> tuple[socket.socket, ...]:
+        return tuple(self._sockets or ())
+
+    def _attach(self) -> None:
+        self._active_count += 1
+    def _detach(self) -> None:
+        self._active_count -= 1
+        if self._active_count == 0 and self._sockets is None:
+            self._wake_up_waiters()
+    def _wake_up_waiters(self) -> None:
+        if self._waiters is None:
+            return
+        waiters, self._waiters = self._waiters, None
+        for waiter in waiters:
+            _set_result(waiter)
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+    def is_serving(self) -> bool:
+        return self._serving
+    async def start_serving(self) -> None:
+        if self._serving or self._sockets is None:
+            return
+        self._serving = True
+        for sock in self._sockets:
+            sock.listen(self._backlog)
+            self._loop.add_reader(sock, self._accept_ready, sock)
+    def _accept_ready(self, sock: socket.socket) -> None:
+        # Accept everything which is waiting, up to the backlog
+        for _ in range(self._backlog):
+            try:
+                connection, _address = sock.accept()
+            except _try_again:
+                return
+            except OSError as e:
+                if e.errno in (errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.ENOMEM):
+                    # Out of file descriptors, stop accepting for a bit
+                    self._loop.call_exception_handler({'message': 'socket.accept() out of system resource', 'exception': e, 'socket': sock})
+                    self._loop.remove_reader(sock)
+                    self._loop.call_later(1, self._resume_accepting, sock)
+                    return
+                raise
+            connection.setblocking(False)
+            SocketTransport(self._loop, connection, self._protocol_factory(), server=self)
+    def _resume_accepting(self, sock: socket.socket) -> None:
+        if self._serving and self._sockets is not None:
+            self._loop.add_reader(sock, self._accept_ready, sock)
+
+    def close(self) -> None:
+        sockets = self._sockets
+        if sockets is None:
+            return
+        self._sockets = None
+        for sock in sockets:
+            self._loop.remove_reader(sock)
+            if sock.family == socket.AF_UNIX:
+                _remove_unix_socket_file(sock)
+            sock.close()
+        self._serving = False
+        if self._serving_forever is not None and not self._serving_forever.done():
+            self._serving_forever.cancel()
+            self._serving_forever = None
+        if self._active_count == 0:
+            self._wake_up_waiters()
+    async def wait_closed(self) -> None:
+        if self._waiters is None:
+            return
+        waiter: asyncio.Future[None] = self._loop.create_future()
+        self._waiters.append(waiter)
+        await waiter
+    async def serve_forever(self) -> None:
+        if self._serving_forever is not None:
+            raise RuntimeError(f"server {self!r} is already being awaited on serve_forever()")
+        if self._sockets is None:
+            raise RuntimeError(f"server {self!r} is closed")
+        await self.start_serving()
+        self._serving_forever = self._loop.create_future()
+        try:
+            await self._serving_forever
+        except asyncio.CancelledError:
+            try:
+                self.close()
+                await self.wait_closed()
+            finally:
+                raise
+        finally:
+            self._serving_forever = None
+
+def _remove_unix_socket_file(sock: socket.socket) -> None:
+    path = sock.getsockname()
+    if not isinstance(path, str) or not path or path.startswith('\0'):
+        return
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except OSError:
+        pass
+
+
+# Connections and servers
+async def _make_transport(loop: asyncio.AbstractEventLoop, sock: socket.socket, protocol_factory: Callable[[], ProtocolT]) -> tuple[asyncio.Transport, ProtocolT]:
+    protocol = protocol_factory()
+    waiter: asyncio.Future[None] = loop.create_future()
+    transport = SocketTransport(loop, sock, protocol, waiter)
+    try:
+        await waiter
+    except BaseException:
+        transport.close()
+        raise
+    return transport, protocol
+
+async def create_connection(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], host: str | None = None, port: int | None = None, *,
+                            ssl: Any = None, family: int = 0, proto: int = 0, flags: int = 0, sock: socket.socket | None = None, local_addr: tuple[str, int] | None = None,
+                            **kwargs: Any) -> tuple[asyncio.Transport, ProtocolT]:
+    _check_ssl(ssl)
+    _check_options(kwargs)
+    if sock is not None:
+        if host is not None or port is not None:
+            raise ValueError("host/port and sock can not be specified at the same time")
+        sock.setblocking(False)
+        return await _make_transport(loop, sock, protocol_factory)
+    if host is None and port is None:
+        raise ValueError("host and port was not specified and no sock specified")
+
+    infos = await loop.getaddrinfo(host, port, family=family, type=socket.SOCK_STREAM, proto=proto, flags=flags)
+    if not infos:
+        raise OSError(f"getaddrinfo({host!r}) returned empty list")
+    exceptions: list[OSError] = []
+    for address_family, kind, address_proto, _, address in infos:
+        sock = socket.socket(address_family, kind, address_proto)
+        try:
+            sock.setblocking(False)
+            if local_addr is not None:
+                sock.bind(local_addr)
+            await sock_connect(loop, sock, address)
+        except OSError as e:
+            sock.close()
+            exceptions.append(e)
+            continue
+        except BaseException:
+            sock.close()
+            raise
+        return await _make_transport(loop, sock, protocol_factory)
+
+    if len(exceptions) == 1:
+        raise exceptions[0]
+    raise OSError(f"Multiple exceptions: {', '.join(str(e) for e in exceptions)}")
+
+async def create_unix_connection(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], path: str | None = None, *,
+                                 ssl: Any = None, sock: socket.socket | None = None, **kwargs: Any) -> tuple[asyncio.Transport, ProtocolT]:
+    _check_ssl(ssl)
+    _check_options(kwargs)
+    if path is not None:
+        if sock is not None:
+            raise ValueError("path and sock can not be specified at the same time")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            await sock_connect(loop, sock, os.fspath(path))
+        except BaseException:
+            sock.close()
+            raise
+    elif sock is None:
+        raise ValueError("no path and sock were specified")
+    sock.setblocking(False)
+    return await _make_transport(loop, sock, protocol_factory)
+
+async def connect_accepted_socket(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], ProtocolT], sock: socket.socket, *,
+                                  ssl: Any = None, **kwargs: Any) -> tuple[asyncio.Transport, ProtocolT]:
+    _check_ssl(ssl)
+    _check_options(kwargs)
+    sock.setblocking(False)
+    return await _make_transport(loop, sock, protocol_factory)
+
+async def _start_server(server: Server, start_serving: bool) -> Server:
+    if start_serving:
+        await server.start_serving()
+        # Let the listening sockets be registered before returning
+        await asyncio.sleep(0)
+    return server
+
+async def create_server(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], asyncio.BaseProtocol], host: str | Iterable[str] | None = None, port: int | None = None, *,
+                        family: int = socket.AF_UNSPEC, flags: int = socket.AI_PASSIVE, sock: socket.socket | None = None, backlog: int = 100, ssl: Any = None,
+                        reuse_address: bool | None = None, reuse_port: bool | None = None, start_serving: bool = True, **kwargs: Any) -> Server:
+    _check_ssl(ssl)
+    _check_options(kwargs)
+    if sock is not None:
+        if host is not None or port is not None:
+            raise ValueError("host/port and sock can not be specified at the same time")
+        sock.setblocking(False)
+        return await _start_server(Server(loop, [sock], protocol_factory, backlog), start_serving)
+
+    if reuse_address is None:
+        reuse_address = os.name == 'posix'
+    hosts: list[str | None] = [host] if host is None or isinstance(host, str) else list(host)
+    infos: set[tuple[Any, ...]] = set()
+    for host_name in hosts:
+        infos.update(await loop.getaddrinfo(host_name, port, family=family, type=socket.SOCK_STREAM, flags=flags))
+
+    sockets: list[socket.socket] = []
+    try:
+        for address_family, kind, proto, _, address in infos:
+            listener = socket.socket(address_family, kind, proto)
+            sockets.append(listener)
+            if reuse_address:
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+            if reuse_port:
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, True)
+            if address_family == socket.AF_INET6 and hasattr(socket, 'IPPROTO_IPV6'):
+                # Don't let the IPv6 socket take the IPv4 port as well
+                listener.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, True)
+            listener.bind(address)
+            listener.setblocking(False)
+    except BaseException:
+        for listener in sockets:
+            listener.close()
+        raise
+    return await _start_server(Server(loop, sockets, protocol_factory, backlog), start_serving)
+
+async def create_unix_server(loop: asyncio.AbstractEventLoop, protocol_factory: Callable[[], asyncio.BaseProtocol], path: str | None = None, *,
+                             sock: socket.socket | None = None, backlog: int = 100, ssl: Any = None, start_serving: bool = True, **kwargs: Any) -> Server:
+    _check_ssl(ssl)
+    _check_options(kwargs)
+    if path is not None:
+        if sock is not None:
+            raise ValueError("path and sock can not be specified at the same time")
+        path = os.fspath(path)
+        if not path.startswith('\0'):
+            # Remove a stale socket file left by an old server
+            try:
+                if stat.S_ISSOCK(os.stat(path).st_mode):
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(path)
+        except BaseException:
+            sock.close()
+            raise
+    elif sock is None:
+        raise ValueError("path was not specified, and no sock specified")
+    sock.setblocking(False)
+    return await _start_server(Server(loop, [sock], protocol_factory, backlog), start_serving)
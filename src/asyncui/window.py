@@ -7,12 +7,20 @@ Classes:
 
     Window - The core of any asyncUi program, manages the event loop and rendering. Also a Singleton
     EventHandler - An event handler for pygame events, avaliable as a decorator via `eventHandler`
+    HandlerList - the handlers of one event type, ordered by priority, see `Window.register_event_handler`
+    HandlerGroup - event handlers enabled and disabled together with a flag, like the handlers of a page of widgets
+    EventStream - an async iterator over the events of a type, see `Window.events`
     MethodEventHandler - Similar to `EventHandler`, but for class/unbound functions, constructed via `eventHandlerMethod 
+    WeakHandler - a method bound to a weak reference of it's instance, unregistered once the instance is collected
+    Priority - the priority classes of callbacks in the event loop, input, frame, normal and idle
+    SlicedWork - CPU work run in time slices on the event loop, see `Window.run_sliced`
+    FrameStats - rolling statistics of the renderer's frames, frame times, missed deadlines and rendering and presenting times
 
 Functions:
 
     event_handler - decorator, creates an `EventHandler` from a function. Supports infering event type form type hints.
     event_handler_method - creates a `MethodEventHandler`, also supports infering the event type.
+    priority - context manager, gives callbacks and tasks scheduled inside it a `Priority`
 
 """
 import pygame
@@ -21,10 +29,21 @@ import time
 import warnings
 import inspect
 import functools
-from typing import Protocol, Awaitable, Generic, Callable, TypeVar, Type, Any, TypeVarTuple, Self, overload, Coroutine, Generator, Never, get_type_hints as getTypeHints
-from . import events
-from contextvars import Context
+import heapq
+import math
+import threading
+import enum
+import weakref
+from typing import Awaitable, Generic, Callable, TypeVar, Type, Any, TypeVarTuple, Self, overload, Coroutine, Generator, Iterator, Iterable, Mapping, Sized, get_type_hints as getTypeHints
+from . import events, sockets, processes
+from .events.coalescing import Coalescer
+from .events.bus import EventBus, Overflow, Merge, keep_latest
+from .clock import Clock
+from .selector import SelectorThread, FileDescriptorLike
+from contextvars import Context, ContextVar
+from contextlib import contextmanager
 from dataclasses import dataclass
+from collections import Counter, deque
 from types import EllipsisType, TracebackType
 from concurrent.futures import Executor, ThreadPoolExecutor
 
@@ -38,7 +57,7 @@ Ts = TypeVarTuple('Ts')
 EventT = TypeVar("EventT", bound=events.Event)
 
 
-__all__ = ('EventHandler', 'EventHandlerMethod', 'event_handler', 'event_handler_method', 'Window', 'Renderer')
+__all__ = ('EventHandler', 'WeakHandler', 'HandlerList', 'HandlerGroup', 'EventHandlerMethod', 'event_handler', 'event_handler_method', 'Window', 'Renderer', 'FrameStats', 'Priority', 'priority', 'SlicedWork', 'EventStream')
 class EventHandler(Generic[EventT]):
     """
     Manages registrating and unregistrating of event handlers for the current window
@@ -51,14 +70,17 @@ class EventHandler(Generic[EventT]):
         unregister - unregisters the event handler, has no effect if already unregistered
         registered - checks if the event handler is currently registered
 
+    Attributes:
+        priority - handlers with higher priorities are called first, see `Window.register_event_handler`
     """
-    def __init__(self, function: Callable[[EventT], None], event_type: Type[EventT]):
+    def __init__(self, function: Callable[[EventT], None], event_type: Type[EventT], priority: int = 0):
         self.function = function
         self.event_type = event_type
+        self.priority = priority
     def register(self) -> None:
         if self.registered: 
             return
-        Window().register_event_handler(self.event_type, self.function)
+        Window().register_event_handler(self.event_type, self.function, self.priority)
     def unregister(self) -> None:
         if not self.registered: 
             return
@@ -75,11 +97,11 @@ class EventHandler(Generic[EventT]):
         self.unregister()
 
 @overload
-def event_handler(event_type: Type[EventT], /) -> Callable[[Callable[[EventT], None]], EventHandler[EventT]]: ...
+def event_handler(event_type: Type[EventT], /, *, priority: int = 0) -> Callable[[Callable[[EventT], None]], EventHandler[EventT]]: ...
 @overload
 def event_handler(event_handler: Callable[[EventT], None], /) -> EventHandler[EventT]: ...
 
-def event_handler(event_type: Type[EventT] | Callable[[EventT], None]) -> Callable[[Callable[[EventT], None]], EventHandler[EventT]] | EventHandler[EventT]: 
+def event_handler(event_type: Type[EventT] | Callable[[EventT], None], *, priority: int = 0) -> Callable[[Callable[[EventT], None]], EventHandler[EventT]] | EventHandler[EventT]: 
     """
     An alternative constructor to `EventHandler`, supports use as a function decorator without type hints or with type hints,
     It is preferred over `EventHandler` directly.
@@ -96,11 +118,17 @@ def event_handler(event_type: Type[EventT] | Callable[[EventT], None]) -> Callab
         @event_handler(events.KeyDown)
         def printKey(event):
             print(event.unicode)
+
+        #A priority can be given with the event type, this handler is called before handlers with the default priority of 0
+        @event_handler(events.KeyDown, priority=10)
+        def shortcuts(event):
+            if event.key == Keys.Escape:
+                event.consume()
     """
     if isinstance(event_type, type) and issubclass(event_type, events.Event):
         @functools.wraps(event_type)
         def _inner(func: Callable[[EventT], None]) -> EventHandler[EventT]:
-            return EventHandler(func, event_type) #type: ignore
+            return EventHandler(func, event_type, priority) #type: ignore
         return _inner
     else:
         event_handler = event_type
@@ -121,16 +149,50 @@ def event_handler(event_type: Type[EventT] | Callable[[EventT], None]) -> Callab
             raise ValueError("Event handler's evnet annotation must be a subclass of events.Event")
         return EventHandler(event_handler, event_type)
 
+class WeakHandler(Generic[T, EventT]):
+    """
+    A method bound to a weak reference of it's instance, so a registered handler doesn't keep it's instance alive.
+
+    Once the instance is collected, calling the handler does nothing, and it's unregistered by the window
+    the next time a handler is registered or an event is handled. Created by `MethodEventHandler` with `weak=True`.
+    """
+    __slots__ = ('function', 'instance', 'event_type', '__weakref__')
+
+    def __init__(self, function: Callable[[T, EventT], None], instance: T, event_type: Type[EventT]) -> None:
+        self.function = function
+        self.event_type = event_type
+        # The callback is collected together with the handler, so it must not reference the handler strongly
+        dead = Window()._dead_handlers
+        handler_ref = weakref.ref(self)
+        def collected(_: object) -> None:
+            handler = handler_ref()
+            if handler is not None:
+                dead.append(handler)
+        self.instance = weakref.ref(instance, collected)
+    def __call__(self, event: EventT) -> None:
+        instance = self.instance()
+        if instance is not None:
+            self.function(instance, event)
+    def __repr__(self) -> str:
+        return f"<WeakHandler {self.function.__qualname__} of {self.instance()!r}>"
+
 class MethodEventHandler(Generic[T, EventT]):
     """
     A descriptor for managing class/unbound event handlers.
 
     When used on a class, automatically binds `self` and allows class functions to be used as event handlers.
     It's recommened to use `eventHanlderMethod` to create MethodEventHandler instances
+
+    By default the bound handler holds a strong reference to the instance, so while it's registered
+    the instance stays alive. With `weak` the instance is bound by a `WeakHandler`, and an instance which is dropped
+    without being disabled is collected, and it's handlers are unregistered.
+    When `weak` is None, the instance's `weak_handlers` attribute decides, read when the handler is first bound.
     """
-    def __init__(self, eventHandler: Callable[[T, EventT], None], eventType: Type[EventT]):
+    def __init__(self, eventHandler: Callable[[T, EventT], None], eventType: Type[EventT], priority: int = 0, weak: bool | None = False):
         self.eventType = eventType
         self.eventHandler = eventHandler
+        self.priority = priority
+        self.weak = weak
     def __set_name__(self, owner: Type[T2], name: str) -> None:
         self.name = name
     @overload
@@ -143,8 +205,13 @@ class MethodEventHandler(Generic[T, EventT]):
         if instance is None:
             return self
 
-        boundHandler: Callable[[EventT], None] = functools.partial(self.eventHandler, instance)
-        handler = EventHandler(boundHandler, self.eventType)
+        boundHandler: Callable[[EventT], None]
+        weak = getattr(instance, 'weak_handlers', False) if self.weak is None else self.weak
+        if weak:
+            boundHandler = WeakHandler(self.eventHandler, instance, self.eventType) #type: ignore
+        else:
+            boundHandler = functools.partial(self.eventHandler, instance)
+        handler = EventHandler(boundHandler, self.eventType, self.priority)
         
         #replace the attribute with the new event handler, bypassing this for feature accesses, so
         #cls.handler is cls.handler == True
@@ -152,17 +219,19 @@ class MethodEventHandler(Generic[T, EventT]):
         return handler  
     
 @overload
-def event_handler_method(event_type: Type[EventT], /) -> Callable[[Callable[[T, EventT], None]], MethodEventHandler[T, EventT]]:  ...
+def event_handler_method(event_type: Type[EventT], /, *, priority: int = 0, weak: bool | None = False) -> Callable[[Callable[[T, EventT], None]], MethodEventHandler[T, EventT]]:  ...
 
 @overload
 def event_handler_method(handler: Callable[[T, EventT], None], /) -> MethodEventHandler[T, EventT]: ...
 
-def event_handler_method(handler_or_type: Type[EventT] | Callable[[T, EventT], None]) -> MethodEventHandler[T, EventT] | Callable[[Callable[[T, EventT], None]], MethodEventHandler[T, EventT]]:
+def event_handler_method(handler_or_type: Type[EventT] | Callable[[T, EventT], None], *, priority: int = 0, weak: bool | None = False) -> MethodEventHandler[T, EventT] | Callable[[Callable[[T, EventT], None]], MethodEventHandler[T, EventT]]:
     """
     Create an event handler from a class method
 
     The event type can be provided explicitly by passing it as an argument to the decorator,
-    or it can be inffered based on the function's type hint.
+    or it can be inffered based on the function's type hint. A `priority` can be given with an explicit event type,
+    and `weak`, which stops registered handlers keeping their instance alive, or None to leave it to the instance's
+    `weak_handlers` attribute, see `MethodEventHandler`.
 
     Returns an instance of `MethodEventHandler`
 
@@ -195,7 +264,7 @@ def event_handler_method(handler_or_type: Type[EventT] | Callable[[T, EventT], N
         #if an event type is given explicitly, return a new decorator to create the method handler
         eventType = handler_or_type
         def _inner(handler:Callable[[T, EventT], None]) -> MethodEventHandler[T, EventT]:
-            return MethodEventHandler(handler, eventType)
+            return MethodEventHandler(handler, eventType, priority, weak)
         return _inner
     else:
         #if no event type is speificed, infer it from the function's type hint
@@ -225,19 +294,191 @@ def event_handler_method(handler_or_type: Type[EventT] | Callable[[T, EventT], N
         return MethodEventHandler(handler, eventType)
     
 
+class HandlerGroup:
+    """
+    Event handlers which are enabled and disabled together, like the handlers of a page of widgets.
+
+    Handlers registered while a group is collecting(inside `with group.collect():`) belong to it.
+    Disabling a group doesn't unregister it's handlers, the dispatcher skips the handlers of inactive groups,
+    so enabling and disabling a group never touches it's handlers. Each group counts the event types of it's handlers
+    and of it's enabled subgroups' handlers, so a toggle updates the window's count of active handlers once per event type,
+    and flips the `active` flag of the subgroups, no matter how many handlers they have.
+    Event types whose handlers are all in inactive groups are blocked in pygame's queue, like event types with no handlers.
+    Groups created while another group is collecting are it's subgroups, and a group is only `active`
+    while it and all of the groups above it are enabled.
+
+    As disabled handlers stay registered(and keep their widgets alive), a group which is no longer needed should be closed.
+
+    Methods:
+        collect - context manager, handlers registered inside it belong to the group
+        enable, disable - enable or disable the group, also available by using the group as a context manager
+        close - unregister all of the group's handlers, and close it's subgroups
+    Attributes:
+        enabled - whether the group is enabled
+        active - whether the group's handlers are called, when it and all of it's parents are enabled
+        parent - the group this is a subgroup of, or None
+        event_types - a Counter of the event types of the group's handlers, and of it's enabled subgroups' handlers
+    """
+    __slots__ = ('enabled', 'active', 'parent', 'children', 'handlers', 'event_types', '_previous')
+
+    def __init__(self, enabled: bool = True, parent: 'HandlerGroup | None | EllipsisType' = ...) -> None:
+        if parent is ...:
+            parent = Window()._handler_group
+        self.parent = parent
+        self.enabled = enabled
+        self.active: bool = enabled and (parent is None or parent.active)
+        self.children: list[HandlerGroup] = []
+        self.handlers: set[tuple[Type[events.Event], Callable[[Any], None]]] = set()
+        self.event_types = Counter[int]()
+        self._previous: list[HandlerGroup | None] = []
+        if parent is not None:
+            parent.children.append(self)
+
+    @contextmanager
+    def collect(self) -> Iterator[Self]:
+        window = Window()
+        self._previous.append(window._handler_group)
+        window._handler_group = self
+        try:
+            yield self
+        finally:
+            window._handler_group = self._previous.pop()
+
+    def _add(self, event_type: Type[events.Event], handler: Callable[[Any], None]) -> None:
+        if (event_type, handler) not in self.handlers:
+            self.handlers.add((event_type, handler))
+            self._count({event_type.type: 1}, 1)
+    def _discard(self, event_type: Type[events.Event], handler: Callable[[Any], None]) -> None:
+        if (event_type, handler) in self.handlers:
+            self.handlers.remove((event_type, handler))
+            self._count({event_type.type: 1}, -1)
+    def _count(self, event_types: Mapping[int, int], sign: int) -> None:
+        """Add or subtract `event_types` from the counts of this group, and of the groups above it which include it's counts"""
+        group: HandlerGroup | None = self
+        while group is not None:
+            counts = group.event_types
+            for event_type, count in event_types.items():
+                counts[event_type] += sign * count
+                if not counts[event_type]:
+                    del counts[event_type]
+            if not group.enabled:
+                break
+            group = group.parent
+    def _set_enabled(self, enabled: bool) -> None:
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        sign = 1 if enabled else -1
+        if self.parent is not None:
+            self.parent._count(self.event_types, sign)
+        if self.parent is None or self.parent.active:
+            Window()._count_active(self.event_types, sign)
+        self._update()
+    def _update(self) -> None:
+        active = self.enabled and (self.parent is None or self.parent.active)
+        if active != self.active:
+            self.active = active
+            for child in self.children:
+                child._update()
+    def enable(self) -> None:
+        self._set_enabled(True)
+    def disable(self) -> None:
+        self._set_enabled(False)
+    def close(self) -> None:
+        window = Window()
+        for event_type, handler in list(self.handlers):
+            window.unregister_event_handler(event_type, handler)
+        for child in list(self.children):
+            child.close()
+        if self.parent is not None and self in self.parent.children:
+            self.parent.children.remove(self)
+
+    def __enter__(self) -> Self:
+        self.enable()
+        return self
+    def __exit__(self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.disable()
+    def __repr__(self) -> str:
+        return f"<HandlerGroup enabled={self.enabled} active={self.active} handlers={len(self.handlers)}>"
+
+class HandlerList:
+    """
+    The handlers registered for one event type, in the order they are called.
+
+    Handlers are called from the highest priority to the lowest, and in the order they were registered within a priority.
+    Dispatching iterates over `snapshot`, an immutable tuple of handlers and their `HandlerGroup`s,
+    which is only rebuilt after the handlers change, so handlers can register and unregister handlers(including themselves)
+    while an event is dispatched, without the handlers being copied for every event. Changes apply from the next event.
+    `active` counts the handlers which aren't in an inactive group, it's kept up to date by `HandlerGroup`.
+    """
+    __slots__ = ('priorities', 'groups', 'active', '_snapshot')
+
+    def __init__(self) -> None:
+        self.priorities: dict[Callable[[Any], None], int] = {}
+        self.groups: dict[Callable[[Any], None], HandlerGroup] = {}
+        self.active = 0
+        self._snapshot: tuple[tuple[Callable[[Any], None], HandlerGroup | None], ...] | None = ()
+    def __len__(self) -> int:
+        return len(self.priorities)
+    def __contains__(self, handler: Callable[[Any], None]) -> bool:
+        return handler in self.priorities
+    def add(self, handler: Callable[[Any], None], priority: int = 0, group: HandlerGroup | None = None) -> None:
+        """Add a handler, or change it's priority and group if it's already added"""
+        if self.priorities.get(handler, priority - 1) != priority or self.groups.get(handler) is not group:
+            if handler in self.priorities:
+                self.active -= self._is_active(handler)
+            self.active += group is None or group.active
+            self.priorities[handler] = priority
+            if group is None:
+                self.groups.pop(handler, None)
+            else:
+                self.groups[handler] = group
+            self._snapshot = None
+    def remove(self, handler: Callable[[Any], None]) -> HandlerGroup | None:
+        """Remove a handler, returning the group it was in"""
+        self.active -= self._is_active(handler)
+        del self.priorities[handler]
+        self._snapshot = None
+        return self.groups.pop(handler, None)
+    def _is_active(self, handler: Callable[[Any], None]) -> bool:
+        group = self.groups.get(handler)
+        return group is None or group.active
+    @property
+    def snapshot(self) -> tuple[tuple[Callable[[Any], None], HandlerGroup | None], ...]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # The sort is stable, even when reversed, so handlers with the same priority keep their order
+            groups = self.groups
+            snapshot = self._snapshot = tuple(
+                (handler, groups.get(handler)) for handler in sorted(self.priorities, key=self.priorities.__getitem__, reverse=True)
+            )
+        return snapshot
+
 class TimerList:
     """
     This class is used to incapsulate the processing and execution of TimerHandles,
     it can be used by custom event loops to implement timer handling.
+
+    Timers are kept in a min-heap ordered by `when()`, so finding the soonest timer is O(1)
+    and scheduling one is O(log n). Cancellation is lazy, cancelled timers stay in the heap until
+    they reach the top, or until enough of them pile up that the heap is rebuilt without them.
     """
+    # The heap is rebuilt once at least this many timers are cancelled,
+    # and they make up more than half of the heap.
+    _min_cancelled_for_rebuild = 100
+
     def __init__(self) -> None:
         self.timers: list[asyncio.TimerHandle] = []
+        self._cancelled_count = 0
+    def __len__(self) -> int:
+        return len(self.timers) - self._cancelled_count
     def append(self, timer: asyncio.TimerHandle) -> None:
         """
         Append a timer to the list of scheduled TimerHandles
         """
-        self.timers.append(timer)
-    def soonest(self) -> float:
+        timer._scheduled = True #type: ignore
+        heapq.heappush(self.timers, timer)
+    def soonest(self, now: float | None = None) -> float:
         """
         This method does 2 things:
         1) execute all events which haved timedout,
@@ -246,39 +487,128 @@ class TimerList:
         The return value is ether infinity if there are no waiting timers,
         or the time in seconds until the next timeout.
 
+        `now` is the current loop time, if it is not given, it's read from `Window().time()`.
+        Passing it allows the event loop to read the clock only once per iteration.
+
         Useful for non-busy waiting for events, wait ether for the next event or next timeout.
         """
-        soonest: float = float('inf')
-        self.execute_all()
-        for timer in self.timers:
-            timeUntil = timer.when() - Window().time()
-
-            if timeUntil < soonest:
-                soonest = timeUntil
-
-        return soonest
-    def execute_all(self) -> None:
+        if now is None:
+            now = Window().time()
+        self.execute_all(now)
+        if not self.timers:
+            return float('inf')
+        return self.timers[0].when() - now
+    def execute_all(self, now: float | None = None) -> None:
         """
         Schedule the execution of all TimedHandles which have timed out
         """
-        deadTimers: list[asyncio.TimerHandle] = []
-        for timer in self.timers:
-            if timer.when() - Window().time() <= 0:
-                deadTimers.append(timer)
-                Window().post_event(ExecuteCallbackEvent(timer))
-        for timer in deadTimers:
-            self.timers.remove(timer)
+        if now is None:
+            now = Window().time()
+        if self._cancelled_count > self._min_cancelled_for_rebuild and self._cancelled_count * 2 > len(self.timers):
+            self._remove_cancelled()
+
+        timers = self.timers
+        while timers:
+            timer = timers[0]
+            if timer.cancelled():
+                heapq.heappop(timers)
+                timer._scheduled = False #type: ignore
+                self._cancelled_count -= 1
+                continue
+            if timer.when() > now:
+                break
+            heapq.heappop(timers)
+            timer._scheduled = False #type: ignore
+            Window()._ready.append(timer)
     def cancel(self, timer: asyncio.TimerHandle) -> None:
-        if timer in self.timers:
-            self.timers.remove(timer)
+        """
+        Mark a timer as cancelled, it is removed from the heap lazily.
+
+        This is called by `TimerHandle.cancel` through `Window._timer_handle_cancelled`,
+        before the handle itself is flagged as cancelled.
+        """
+        if getattr(timer, '_scheduled', False):
+            self._cancelled_count += 1
+    def _remove_cancelled(self) -> None:
+        live_timers: list[asyncio.TimerHandle] = []
+        for timer in self.timers:
+            if timer.cancelled():
+                timer._scheduled = False #type: ignore
+            else:
+                live_timers.append(timer)
+        heapq.heapify(live_timers)
+        self.timers = live_timers
+        self._cancelled_count = 0
+
+class Priority(enum.IntEnum):
+    """
+    Classes of callbacks in the event loop's ready queue, each iteration runs them in this order
+
+    INPUT - callbacks scheduled by event handlers, like waking up tasks waiting in `get_event`
+    FRAME - the renderer's task
+    NORMAL - every other callback
+    IDLE - callbacks which only run when there are no normal callbacks left
+    """
+    INPUT = 0
+    FRAME = 1
+    NORMAL = 2
+    IDLE = 3
+
+_current_priority: ContextVar[Priority] = ContextVar('priority', default=Priority.NORMAL)
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """
+    Give a priority class to the callbacks and tasks scheduled inside the block,
+    tasks keep it for their whole life, since they run in a copy of the context they were created in
+
+    Example:
+    ```
+    with priority(Priority.IDLE):
+        asyncio.create_task(rebuild_cache())
+    ```
+    """
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class ReadyQueues:
+    """
+    The event loop's ready callbacks, in a queue for each `Priority`.
+
+    A callback's class is the priority of the context it runs in(see `priority`), unless it is given explicitly.
+    """
+    def __init__(self) -> None:
+        self.queues: tuple[deque[asyncio.Handle], ...] = tuple(deque() for _ in Priority)
+    def __len__(self) -> int:
+        return sum(map(len, self.queues))
+    def append(self, handle: asyncio.Handle, level: Priority | None = None) -> None:
+        if level is None:
+            level = handle._context.get(_current_priority, Priority.NORMAL) #type: ignore
+        self.queues[level].append(handle)
+    def depths(self) -> dict[Priority, int]:
+        return {level: len(self.queues[level]) for level in Priority}
+
 @dataclass
 class ExecuteCallbackEvent(events.Event):
     """
     This is the event triggered when a callback is scheduled to run,
     should not be used by user code
+
+    Callbacks are normally kept in the window's ready queue instead,
+    this event is still handled for code which posts it directly.
     """
     handle: asyncio.Handle
 
+@dataclass
+class WakeupEvent(events.Event):
+    """
+    Posted to wake up the event loop while it is blocked waiting for pygame events,
+    for example when a callback is scheduled from another thread. Should not be used by user code
+    """
+
 
 def _isEventLoopRunning() -> bool:
     #Why would you use exceptions for control flow?
@@ -291,43 +621,429 @@ def _isEventLoopRunning() -> bool:
         return True
 
 
-class _HasFileNumber(Protocol):
-    def fileno(self) -> int: ...
-FileDescriptorLike = int | _HasFileNumber
-from socket import socket  # noqa: E402
+from socket import socket, getaddrinfo, getnameinfo  # noqa: E402
 
+_TaskFactory = Callable[[asyncio.AbstractEventLoop, Coroutine[Any, Any, Any] | Generator[Any, None, Any]], 'asyncio.Future[Any]']
+
+
+class FrameStats:
+    """
+    Rolling statistics of a `Renderer`'s last `size` frames, plus totals since it started.
+
+    Frame times are the times between the starts of consecutive frames, in loop time(see `Window.time`),
+    the time after an on demand renderer was idle isn't counted. Rendering and presenting times are measured
+    with `time.perf_counter`, rendering is the render function, presenting is `pygame.display.flip()` or `update()`.
+
+    Methods:
+        percentile - a percentile of the frame times, in seconds
+        reset - clear the statistics
+    Attributes:
+        fps - the achieved frames per second
+        p50, p95, p99 - percentiles of the frame times, in seconds
+        frames - the number of frames rendered
+        missed - the number of frames which finished after the next frame was due
+        skipped - the number of frames skipped to catch up after missing a deadline
+        rendering, presenting - the mean time spent rendering and presenting a frame, in seconds
+    """
+    def __init__(self, size: int = 240) -> None:
+        self.size = size
+        self.reset()
+    def reset(self) -> None:
+        self.frame_times: deque[float] = deque(maxlen=self.size)
+        self.render_times: deque[float] = deque(maxlen=self.size)
+        self.present_times: deque[float] = deque(maxlen=self.size)
+        self.frames = 0
+        self.missed = 0
+        self.skipped = 0
+        self._last_start: float | None = None
+
+    def _frame(self, start: float) -> None:
+        if self._last_start is not None:
+            self.frame_times.append(start - self._last_start)
+        self._last_start = start
+        self.frames += 1
+    def _pause(self) -> None:
+        # The next frame time would include the time the renderer was idle
+        self._last_start = None
+
+    @property
+    def fps(self) -> float:
+        if not self.frame_times:
+            return 0.0
+        return len(self.frame_times) / sum(self.frame_times)
+    def percentile(self, percent: float) -> float:
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+    @property
+    def rendering(self) -> float:
+        return sum(self.render_times) / len(self.render_times) if self.render_times else 0.0
+    @property
+    def presenting(self) -> float:
+        return sum(self.present_times) / len(self.present_times) if self.present_times else 0.0
+    def __repr__(self) -> str:
+        return (f"<FrameStats fps={self.fps:.1f} p50={self.p50 * 1000:.2f}ms p95={self.p95 * 1000:.2f}ms p99={self.p99 * 1000:.2f}ms "
+                f"missed={self.missed} skipped={self.skipped} rendering={self.rendering * 1000:.2f}ms presenting={self.presenting * 1000:.2f}ms>")
 
 class Renderer:
     """
-    Calls a renderering function at a given FPS, accounting for the time to render
-    
+    Calls a renderering function at a given FPS, accounting for the time to render.
+    The rendering task runs with `Priority.FRAME`, and `deadline` is when the next frame is due
+
+    Pacing:
+        Frames are due at fixed times, `1/fps` apart from when the renderer started(or, on demand, woke up),
+        so time lost to a late wake up or a slow frame isn't carried into the following frames.
+        A frame which finishes after the next frame was due missed it's deadline, the renderer then skips
+        the frames which are already late, and continues with the next one on time, instead of rendering them back to back.
+        Statistics of the frames are kept in `stats`, see `FrameStats`.
+
+    Damage tracking:
+        By default every frame is rendered in full and presented with `pygame.display.flip()`.
+        With `damage_tracking`, widgets report the screen rects they change with `damage`(usually via `Window.damage`),
+        and a frame only renders the damaged rects, with the surface's clip set to each one,
+        and presents them with `pygame.display.update(rects)`. Frames without damage are skipped entirely.
+        Drawing outside the clip is discarded by pygame, and `graphics.Group` skips widgets outside of it,
+        so only the widgets intersecting the damage are redrawn. The first frame, and frames after the window is resized, are rendered in full.
+        Anything which changes on screen must report it's damage, changes which aren't reported aren't shown.
+
+    On demand rendering:
+        With `on_demand`, frames are only rendered after the window is invalidated(`invalidate`, usually via `Window.invalidate`),
+        by widgets, event handlers or timers which changed something, and `fps` becomes a cap, frames are at least `1/fps` seconds apart.
+        While nothing is invalidated the renderer waits without a timer, so an idle window uses no CPU for rendering.
+        Reporting damage also invalidates the window. The first frame is always rendered.
+
     Methods:
         stop - stops rendering after the current frame finishes
         running - returns wether or not the renderer is currently running
+        damage - report screen rects, in scaled(screen) coordinates, which need to be redrawn
+        damage_all - redraw the whole screen next frame
+        invalidate - request a frame from an on demand renderer
+        render_frame - render and present one frame, called by the rendering task
+    Attributes:
+        damage_tracking - whether only damaged rects are rendered
+        damaged - the rects damaged since the last frame
+        on_demand - whether frames are only rendered after the window is invalidated
+        invalid - whether the window was invalidated since the last frame
+        stats - the `FrameStats` of the renderer
     """
-    def __init__(self, fps: int, renderer: Callable[['Window'], None]) -> None:
+    # Once more rects than this are damaged, they are merged into their union
+    max_damaged_rects = 16
+
+    def __init__(self, fps: int, renderer: Callable[['Window'], None], damage_tracking: bool = False, on_demand: bool = False) -> None:
         self._running = False
         self.renderer = renderer
         self.fps = fps
+        self.deadline = math.inf
+        self.damage_tracking = damage_tracking
+        self.damaged: list[pygame.Rect] = []
+        # The size of the last frame presented in full, None until the first frame
+        self._presented_size: tuple[int, int] | None = None
+        self.on_demand = on_demand
+        self.invalid = True
+        # Resolved by `invalidate`, while an on demand renderer waits for it
+        self._invalidated: asyncio.Future[None] | None = None
+        self.stats = FrameStats()
+        # Frame `_index` is due at `_epoch + _index * _period`, set when the rendering task starts
+        self._period = 1/fps
+        self._epoch = 0.
+        self._index = 0
     def stop(self) -> None:
         logger.info(f'stopped renderer {self}')
         self._running = False
+        self._wake()
     def running(self) -> bool:
         return self._running
 
+    def damage(self, *rects: pygame.Rect) -> None:
+        if self.damage_tracking:
+            self.damaged.extend(rects)
+        self.invalidate()
+    def damage_all(self) -> None:
+        self._presented_size = None
+        self.invalidate()
+    def invalidate(self) -> None:
+        """Request a frame, only needed by on demand renderers. Must be called from the event loop's thread"""
+        self.invalid = True
+        self._wake()
+    def _wake(self) -> None:
+        invalidated = self._invalidated
+        if invalidated is not None and not invalidated.done():
+            invalidated.set_result(None)
+
+    def _damaged_rects(self, screen: pygame.Rect) -> list[pygame.Rect]:
+        """The damaged rects clipped to the screen, overlapping rects are merged"""
+        merged: list[pygame.Rect] = []
+        for rect in self.damaged:
+            rect = rect.clip(screen)
+            if not rect.width or not rect.height:
+                continue
+            # Merge the rect with any it overlaps, and repeat with the merged rect, which may now overlap others
+            overlap = rect.collidelist(merged)
+            while overlap != -1:
+                rect = rect.union(merged.pop(overlap))
+                overlap = rect.collidelist(merged)
+            merged.append(rect)
+        self.damaged = []
+        if len(merged) > self.max_damaged_rects:
+            return [merged[0].unionall(merged[1:])]
+        return merged
+    def render_frame(self, window: 'Window') -> None:
+        start = time.perf_counter()
+        rects = self._draw(window)
+        rendered = time.perf_counter()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self.stats.render_times.append(rendered - start)
+        self.stats.present_times.append(time.perf_counter() - rendered)
+    def _draw(self, window: 'Window') -> list[pygame.Rect] | None:
+        """Call the render function, returning the rects to present, or None to present the whole screen"""
+        if not self.damage_tracking:
+            self.renderer(window)
+            return None
+        surface = window.window
+        screen = surface.get_rect()
+        if self._presented_size != screen.size:
+            self.damaged = []
+            self._presented_size = screen.size
+            self.renderer(window)
+            return None
+        rects = self._damaged_rects(screen)
+        clip = surface.get_clip()
+        try:
+            for rect in rects:
+                surface.set_clip(rect)
+                self.renderer(window)
+        finally:
+            surface.set_clip(clip)
+        return rects
+
     async def _runner(self) -> None:
         # The loop that does rendering
-        while self._running:
-            start = Window().time()
-            self.renderer(Window())
-            pygame.display.flip()
-            end = Window().time()
-            await asyncio.sleep(1/self.fps - (end - start))
+        _current_priority.set(Priority.FRAME)
+        window = Window()
+        self._anchor(window.time())
+        try:
+            while self._running:
+                if self.on_demand and not self.invalid:
+                    # No frame is due, so callbacks don't need to leave time for one
+                    self.deadline = math.inf
+                    # The host loop's future in hosted mode
+                    self._invalidated = asyncio.get_running_loop().create_future()
+                    try:
+                        await self._invalidated
+                    finally:
+                        self._invalidated = None
+                    self.stats._pause()
+                    self._anchor(window.time())
+                    continue
+                if self._period != 1/self.fps:
+                    self._anchor(window.time())
+                self.invalid = False
+                self._index += 1
+                self.deadline = self._epoch + self._index * self._period
+                self.stats._frame(window.time())
+                self.render_frame(window)
+                end = window.time()
+                if end > self.deadline:
+                    # Skip the frames which are already late, and continue on time with the next
+                    self.stats.missed += 1
+                    late = math.ceil((end - self.deadline) / self._period)
+                    self.stats.skipped += late
+                    self._index += late
+                    self.deadline = self._epoch + self._index * self._period
+                await asyncio.sleep(self.deadline - end)
+        finally:
+            self.deadline = math.inf
+    def _anchor(self, now: float) -> None:
+        # Start a new frame grid at `now`
+        self._period = 1/self.fps
+        self._epoch = now
+        self._index = 0
+    def _rebase(self, offset: float) -> None:
+        # The window's clock was replaced, `offset` is the new clock's time minus the old one's
+        self._epoch += offset
+        self.deadline += offset
+        # The last frame's start is on the old clock
+        self.stats._pause()
     def _run(self) -> None:
         # Schedule the rendering loop
         self._running = True
         asyncio.ensure_future(self._runner())
 
+class EventStream(Generic[EventT]):
+    """
+    An async iterator over the events of a type, created by `Window.events`.
+
+    Unlike awaiting `Window.get_event` in a loop, the stream's handler stays registered for as long as the stream is open,
+    so events which arrive while the consumer is busy are kept in a buffer of up to `maxsize` events, instead of being missed.
+    When the buffer is full, `Overflow.DROP_OLDEST` drops the oldest event, `Overflow.COALESCE` merges the new event
+    into the newest buffered one with `merge`(dropping the oldest if they can't be merged).
+    Only events every predicate returns True for are kept.
+
+    The handler is unregistered when the stream is closed, with `close`, `aclose` or by leaving `async with`,
+    after which iterating stops. Closing a stream isn't automatic, a stream which is never closed keeps handling events.
+
+    Example:
+    ```
+    async with window.events(events.KeyDown, lambda event: event.key == Keys.Escape) as escapes:
+        async for event in escapes:
+            ...
+    ```
+    Attributes:
+        buffer - the events which arrived but were not taken yet
+        dropped - the number of events dropped because the buffer was full
+        coalesced - the number of events merged into buffered ones
+        closed - whether the stream is closed
+    """
+    def __init__(self, event_type: Type[EventT], predicates: tuple[Callable[[EventT], bool], ...], maxsize: int,
+                 policy: Overflow, merge: Merge, priority: int) -> None:
+        if policy is Overflow.BLOCK:
+            raise ValueError("Event handlers can't wait for room, a stream's policy can't be Overflow.BLOCK")
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.event_type = event_type
+        self.predicates = predicates
+        self.maxsize = maxsize
+        self.policy = policy
+        self.merge = merge
+        self.buffer: deque[EventT] = deque()
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._waiter: asyncio.Future[None] | None = None
+        Window().register_event_handler(event_type, self._push, priority)
+
+    def _push(self, event: EventT) -> None:
+        for predicate in self.predicates:
+            if not predicate(event):
+                return
+        buffer = self.buffer
+        if len(buffer) >= self.maxsize:
+            if self.policy is Overflow.COALESCE and (merged := self.merge(buffer[-1], event)) is not None:
+                buffer[-1] = merged #type: ignore
+                self.coalesced += 1
+                return
+            buffer.popleft()
+            self.dropped += 1
+        buffer.append(event)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def __aiter__(self) -> Self:
+        return self
+    async def __anext__(self) -> EventT:
+        while not self.buffer:
+            if self.closed:
+                raise StopAsyncIteration
+            # The host loop's future in hosted mode
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        if self.closed:
+            raise StopAsyncIteration
+        return self.buffer.popleft()
+    async def get(self) -> EventT:
+        """Wait for the next event, raises `StopAsyncIteration` if the stream is closed"""
+        return await self.__anext__()
+
+    def close(self) -> None:
+        """Unregister the stream's handler and stop iterating, buffered events are dropped"""
+        if self.closed:
+            return
+        self.closed = True
+        self.buffer.clear()
+        Window().unregister_event_handler(self.event_type, self._push)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+    async def aclose(self) -> None:
+        self.close()
+    async def __aenter__(self) -> Self:
+        return self
+    async def __aexit__(self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+class SlicedWork(Generic[T]):
+    """
+    CPU work split into units, run in time slices on the event loop so input and rendering keep going,
+    created by `Window.run_sliced`. Awaiting it returns the value the generator returned, None for other iterables.
+
+    Attributes:
+        completed - the number of units done
+        total - the number of units, if known
+        slices - the number of slices run so far
+
+    Methods:
+        progress - the fraction of units done, None if the total isn't known
+        done, cancel, result - same as `asyncio.Task`'s, cancelling closes the generator
+    """
+    def __init__(self, work: Iterable[Any] | Generator[Any, Any, T], budget: float, total: int | None, on_progress: Callable[['SlicedWork[T]'], None] | None) -> None:
+        if total is None and isinstance(work, Sized):
+            total = len(work)
+        self.total = total
+        self.completed = 0
+        self.slices = 0
+        self.budget = budget
+        self.on_progress = on_progress
+        self._work = work
+        self._task: asyncio.Task[T] = asyncio.ensure_future(self._runner())
+
+    def progress(self) -> float | None:
+        if self.total is None:
+            return None
+        return self.completed / self.total if self.total else 1.0
+
+    async def _runner(self) -> T:
+        iterator = iter(self._work)
+        window = Window()
+        clock = window.time
+        try:
+            while True:
+                # The slice also ends before the next frame is due, but always does at least one unit
+                end = min(clock() + self.budget, window.frame_deadline - window.frame_margin)
+                try:
+                    next(iterator)
+                    self.completed += 1
+                    while clock() < end:
+                        next(iterator)
+                        self.completed += 1
+                except StopIteration as stop:
+                    self._report()
+                    return stop.value #type: ignore
+                self._report()
+                await asyncio.sleep(0)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+    def _report(self) -> None:
+        self.slices += 1
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+    def done(self) -> bool:
+        return self._task.done()
+    def cancel(self) -> bool:
+        return self._task.cancel()
+    def result(self) -> T:
+        return self._task.result()
+    def __await__(self) -> Generator[Any, None, T]:
+        return self._task.__await__()
+
 class Window(asyncio.AbstractEventLoop): 
     """
     The currently running window. Manages asyncio events, pygame event handlers, and rendering.
@@ -344,23 +1060,62 @@ class Window(asyncio.AbstractEventLoop):
     
     Methods:
 
-        register_event_handler - register an event handler for the given event type
+        register_event_handler - register an event handler for the given event type, handlers with higher priorities are called first
         unregister_event_handler - unregister an event handler for the given event type, throws if that handler is not registered
         is_event_handler_registered - returns wether or not the given event handler is registered for the given event type
         post_event - post a pygame or asyncui event to the pygame event queue
         get_event - asyncshrnously await for the next event of given type
+        events - subscribe to the events of a type, returning an `EventStream` async iterator with a bounded buffer
 
         scale_factor - Returns the scale factor between the current window size and it's initial size
         start_renderer - Takes a render function an FPS and returns a `Renderer` instance, raises if a renderer is already running
+        damage - report screen rects which changed, redrawn next frame by a renderer with damage tracking
+        invalidate - request a frame from a renderer which renders on demand
 
         run - run the event loop forever
+        run_sliced - run CPU work in time slices on the event loop, returning an awaitable `SlicedWork`
+        queue_depths - the number of ready callbacks in each `Priority` class
+        frame_deadline - when the renderer's next frame is due, infinity if it isn't running
+        set_clock - replace the clock the loop's time comes from, like a `clock.VirtualClock` to fast-forward timers
+        host - pump pygame's events and run the renderer from inside another asyncio event loop, see "Hosted mode"
+
+    Hosted mode:
+        Passing `hosted=True` when initializing keeps the standard asyncio event loop, and runs asyncui as a guest in it.
+        The window doesn't become the running event loop, instead `host` is awaited in the host loop(`asyncio.run(window.host())`),
+        it polls pygame's queue every `poll_interval` seconds(backing off to `max_poll_interval` while it's idle)
+        and dispatches the events to the registered handlers,
+        and the renderer runs as a task of the host loop. Event handlers, widgets and `get_event` work the same in both modes,
+        but the window's own event loop methods(`call_soon`, `create_task`, etc) are not run, use the host loop's instead.
+
+    Attributes:
+
+        batch_events - when True, each iteration drains every pending pygame event with `pygame.event.get()`
+            and handles them as a batch, instead of handling one event per iteration. False by default
+        max_events_per_iteration - the most events handled in one iteration when batching,
+            leftover events are handled next iteration, so timers, callbacks and rendering are not starved
+        coalescer - an `events.coalescing.Coalescer` merging consecutive events(like mouse motion) before they are handled,
+            None by default. Coalescing works on batches, so setting it also drains events in batches
+        callback_slice - the longest, in seconds, that normal and idle callbacks run in one iteration
+            before the loop checks for input again, 5 milliseconds by default
+        frame_margin - normal and idle callbacks stop running this many seconds before the next frame is due,
+            so the frame starts on time, 2 milliseconds by default. One normal callback still runs every iteration
+        precise_wait - timers due within this many seconds are waited for with `time.sleep`, which is far more accurate
+            than pygame's millisecond wait, 2 milliseconds by default, 0 only uses pygame's wait
+        hosted - whether the window runs in hosted mode, set when initializing
+        poll_interval - how often, in seconds, a hosted window checks pygame's queue for events, 1/250 by default
+        max_poll_interval - while no events arrive, a hosted window doubles the time between checks up to this, 1/30 by default,
+            the first event after a quiet period may wait up to this long
+        bus - an `events.bus.EventBus`, asyncui event types configured on it are posted there instead of pygame's queue,
+            skipping SDL's fixed size queue and the conversion to pygame events. A batch is handled every iteration
+        clock - the `clock.Clock` the loop's time comes from, `time.monotonic` by default, see `set_clock`.
+            A hosted window's timers run in the host loop, so they use it's clock instead
 
         refer to asyncio's event loop documentation for other all methods. 
         https://docs.python.org/3/library/asyncio-eventloop.html
     """
 
 
-    def __init__(self, window: pygame.Surface | EllipsisType = ..., unscaled_size: tuple[int, int] | EllipsisType = ..., title: str | EllipsisType = ...) -> None:
+    def __init__(self, window: pygame.Surface | EllipsisType = ..., unscaled_size: tuple[int, int] | EllipsisType = ..., title: str | EllipsisType = ..., *, hosted: bool = False) -> None:
         if window is ...: 
             return
         if title is ...: 
@@ -371,47 +1126,126 @@ class Window(asyncio.AbstractEventLoop):
         pygame.display.set_caption(title)
         self.size = window.get_size()
         self.window = window
-        self.event_handlers: dict[int, set[Callable[[Any], None]]] = {}
+        self.event_handlers: dict[int, HandlerList] = {}
+        # The group handlers registered now belong to, see `HandlerGroup.collect`
+        self._handler_group: HandlerGroup | None = None
+        # `WeakHandler`s whose instances were collected, appended by weakref callbacks, which may run on any thread
+        self._dead_handlers: deque[WeakHandler[Any, Any]] = deque()
+        # Only event types with registered handlers are allowed into pygame's queue,
+        # see `register_event_handler`
+        pygame.event.set_blocked(None)
         self.timers = TimerList()
+        self.clock = Clock()
         self.unscaled_size =  unscaled_size
         self.renderer: Renderer | None = None
         self.default_executor: Executor = ThreadPoolExecutor(5)
+        self._task_factory: _TaskFactory | None = None
+
+        self._ready = ReadyQueues()
+        # Callbacks scheduled while an event is dispatched get `Priority.INPUT`
+        self._dispatching = False
+        self.callback_slice = 0.005
+        self.frame_margin = 0.002
+        # Callbacks from other threads, moved to the ready queue in bulk, see `callSoonThreadsafe`
+        self._inbox: deque[asyncio.Handle] = deque()
+        self._inbox_lock = threading.Lock()
+        self._wakeup_posted = False
+        self._pending_events: deque[pygame.event.Event] = deque()
+        self.batch_events = False
+        self.max_events_per_iteration = 256
+        self.precise_wait = 0.002
+        self.coalescer: Coalescer | None = None
+        # Started by the first add_reader/add_writer
+        self._selector: SelectorThread | None = None
+        self.hosted = hosted
+        self.poll_interval = 1/250
+        self.max_poll_interval = 1/30
+        self._hosting = False
+        self._deferred_renderer = False
 
         self.register_event_handler(ExecuteCallbackEvent, self._run_execute_callback)
+        self.register_event_handler(WakeupEvent, self._wakeup_handler)
         self.register_event_handler(events.VideoResize, self._resize_handler)
+        # Posting events in pygame is thread safe
+        self.bus = EventBus(lambda: pygame.event.post(events.to_pygame_event(WakeupEvent())))
 
         self.closed= False
         self.running = False
         self.debug = __debug__
 
         self.error_handler: Callable[[asyncio.AbstractEventLoop, dict[str, Any]], object] | None = None
-        asyncio._set_running_loop(self)
+        if not hosted:
+            asyncio._set_running_loop(self)
 
     
     #Event handler processing
-    def register_event_handler(self, eventType: Type[EventT], handler: Callable[[EventT], None]) -> None:
+    def register_event_handler(self, eventType: Type[EventT], handler: Callable[[EventT], None], priority: int = 0) -> None:
         logger.debug(f"Registered event handler {handler!r} for event type {eventType.__qualname__!r}")
         """
         Register an event handler for a given event type
         
-        The event handler will be executed next time the given event is received
+        The event handler will be executed next time the given event is received.
+        Handlers with higher priorities are called first, handlers with the same priority in the order they were registered,
+        and a handler can stop the event reaching the handlers after it with `event.consume()`.
+        Registering a handler again changes it's priority.
+        Handlers registered while a `HandlerGroup` is collecting belong to it, and are skipped while it isn't active.
+        Event types are blocked in pygame's queue while none of their handlers are active,
+        so registering the first handler of a type allows it.
         """
+        if self._dead_handlers:
+            self._unregister_dead_handlers()
         if eventType.type not in self.event_handlers:
-            self.event_handlers[eventType.type] = set()
-
-        self.event_handlers[eventType.type].add(handler)
+            self.event_handlers[eventType.type] = HandlerList()
+
+        handlers = self.event_handlers[eventType.type]
+        was_active = handlers.active
+        group = self._handler_group
+        previous = handlers.groups.get(handler)
+        if previous is not None and previous is not group:
+            previous._discard(eventType, handler)
+        handlers.add(handler, priority, group)
+        if group is not None:
+            group._add(eventType, handler)
+        if not was_active and handlers.active:
+            pygame.event.set_allowed(eventType.type)
+        elif was_active and not handlers.active:
+            pygame.event.set_blocked(eventType.type)
     def unregister_event_handler(self, eventType: Type[EventT], handler: Callable[[EventT], None]) -> None:
         logger.debug(f"Unregistered event handler {handler!r} for event type {eventType.__qualname__}")
         """
         unregister an event handler for a given event type,
         raises a ValueError if the event handler is not registered
+
+        Once the last active handler of a type is unregistered, the type is blocked in pygame's queue
         """
         if eventType.type not in self.event_handlers:
             raise ValueError("No event handlers of {evnetType!r} are registered") 
         if handler not in self.event_handlers[eventType.type]:
             raise ValueError(f"Event handler {handler!r} is not registered")
         
-        self.event_handlers[eventType.type].remove(handler)
+        handlers = self.event_handlers[eventType.type]
+        was_active = handlers.active
+        group = handlers.remove(handler)
+        if group is not None:
+            group._discard(eventType, handler)
+        if was_active and not handlers.active:
+            pygame.event.set_blocked(eventType.type)
+    def _count_active(self, event_types: Mapping[int, int], sign: int) -> None:
+        """Count handlers in or out of the active handlers of their types, when a `HandlerGroup` is enabled or disabled"""
+        for event_type, count in event_types.items():
+            handlers = self.event_handlers[event_type]
+            was_active = handlers.active
+            handlers.active += sign * count
+            if not was_active and handlers.active:
+                pygame.event.set_allowed(event_type)
+            elif was_active and not handlers.active:
+                pygame.event.set_blocked(event_type)
+    def _unregister_dead_handlers(self) -> None:
+        """Unregister the `WeakHandler`s whose instances were collected"""
+        while self._dead_handlers:
+            handler = self._dead_handlers.popleft()
+            if self.is_event_handler_registered(handler.event_type, handler):
+                self.unregister_event_handler(handler.event_type, handler)
     def is_event_handler_registered(self, eventType: Type[EventT], handler: Callable[[EventT], None]) -> bool:
         """
         Return whether or not an event handler is registered
@@ -419,28 +1253,40 @@ class Window(asyncio.AbstractEventLoop):
         return eventType.type in self.event_handlers and handler in self.event_handlers[eventType.type]
     def post_event(self, event: EventT | pygame.event.Event) -> None:
         """
-        Post ether an asyncUi event or an pygame event to the event queue
+        Post ether an asyncUi event or an pygame event to the event queue,
+        asyncUi events of types configured on `bus` are published to it instead of pygame's queue
         """
         if isinstance(event, pygame.event.Event):
             pygame.event.post(event)
+        elif event.type in self.bus.queues:
+            self.bus.publish(event)
         else:
             pygame.event.post(events.to_pygame_event(event))
     
 
     #aync event handling
     def get_event(self, eventType: Type[EventT]) -> Awaitable[EventT]:
-        """Asynchronously await for the next event of given type"""
+        """
+        Asynchronously await for the next event of given type,
+        for more than one event, use `events`, which won't miss events while the consumer is busy
+        """
         event_future = asyncio.Future[EventT]()
         def eventHook(event: EventT) -> None:
             event_future.set_result(event)
             self.unregister_event_handler(eventType, eventHook)
+        def cancelled(future: asyncio.Future[EventT]) -> None:
+            # A cancelled wait must not leave it's hook behind
+            if future.cancelled() and self.is_event_handler_registered(eventType, eventHook):
+                self.unregister_event_handler(eventType, eventHook)
         self.register_event_handler(eventType, eventHook)
+        event_future.add_done_callback(cancelled)
         return event_future
 
     # Renderering
     def _resize_handler(self, event: events.VideoResize) -> None:
         new_height = event.w * (self.unscaled_size[1] / self.unscaled_size[0])
         pygame.display.set_mode((event.w, new_height), self.window.get_flags())
+        self.invalidate()
 
     @property
     def scale_factor(self) -> float:
@@ -449,27 +1295,61 @@ class Window(asyncio.AbstractEventLoop):
         """
         return self.window.get_size()[0]/self.unscaled_size[0]
 
-    def start_renderer(self, fps: int, renderer: Callable[['Window'], None]) -> Renderer:
+    def start_renderer(self, fps: int, renderer: Callable[['Window'], None], damage_tracking: bool = False, on_demand: bool = False) -> Renderer:
         """
         Starts rendering via the renderer function at the given FPS,
         returning a Rederer instance.
+        With `damage_tracking` only the rects reported with `damage` are redrawn,
+        with `on_demand` frames are only rendered after `invalidate` is called, at up to `fps` frames per second, see `Renderer`
         """
         logger.info(f"created renderer with fps={fps}")
         if self.renderer is not None and self.renderer.running():
             raise RuntimeError("Renderer already running")
-        self.renderer = Renderer(fps, renderer)
-        self.renderer._run()
+        self.renderer = Renderer(fps, renderer, damage_tracking, on_demand)
+        # A hosted window's renderer needs the host loop, so `host` starts it if it isn't running yet
+        self._deferred_renderer = self.hosted and not self._hosting
+        if not self._deferred_renderer:
+            self.renderer._run()
         return self.renderer
     
+    def damage(self, *rects: pygame.Rect) -> None:
+        """
+        Report screen rects, in scaled coordinates(see `display.Scale.rect`), which changed and need to be redrawn,
+        has no effect unless the renderer tracks damage
+        """
+        if self.renderer is not None:
+            self.renderer.damage(*rects)
+    def invalidate(self) -> None:
+        """
+        Mark the window as changed, so a renderer which renders on demand renders a frame.
+        Call it from widgets, event handlers or timers after changing what's drawn, reporting `damage` also invalidates the window
+        """
+        if self.renderer is not None:
+            self.renderer.invalidate()
+    
     # Scheduling callbacks for asyncio
     def callSoon(self, callback: Callable[[*Ts], None], *args: *Ts, context: Context | None = None) -> asyncio.Handle:
         handle = asyncio.Handle(callback, args, self, context)
-        self.post_event(ExecuteCallbackEvent(handle))
+        if self._dispatching:
+            self._ready.append(handle, Priority.INPUT)
+        else:
+            self._ready.append(handle)
         return handle
     call_soon = callSoon #type: ignore #Type shed's arguments arne't correct, *args should be a TypeVarTuple, not Any
     def callSoonThreadsafe(self, callback: Callable[[*Ts], None], *args: *Ts, context: Context | None = None) -> asyncio.Handle:
-        #callSoon is thread safe, since posting events in pygame is also thread safe and that's how callSoon works
-        return self.callSoon(callback, *args, context=context)
+        """
+        Schedule a callback from any thread. Callbacks go into an inbox the loop empties in bulk, the loop may be
+        blocked in pygame.event.wait, so a wakeup event is posted, but only by the first callback since the inbox was last emptied.
+        """
+        handle = asyncio.Handle(callback, args, self, context)
+        with self._inbox_lock:
+            self._inbox.append(handle)
+            wakeup = not self._wakeup_posted
+            self._wakeup_posted = True
+        if wakeup:
+            # Posting events in pygame is thread safe
+            self.post_event(WakeupEvent())
+        return handle
     call_soon_threadsafe = callSoonThreadsafe #type: ignore #Same reason as call_soon
 
     def callLater(self, delay: float, callback: Callable[[*Ts], None], *args: *Ts, context: Context | None = None) -> asyncio.TimerHandle:
@@ -486,13 +1366,25 @@ class Window(asyncio.AbstractEventLoop):
         self.timers.cancel(timer)
 
     def time(self) -> float:
-        return time.monotonic()
+        return self.clock.time()
+    def set_clock(self, clock: Clock) -> None:
+        """
+        Replace the clock the loop's time comes from, like a `clock.VirtualClock` in tests.
+        Pending timers and the renderer's next frame keep the same time left until they're due
+        """
+        offset = clock.time() - self.clock.time()
+        for timer in self.timers.timers:
+            timer._when += offset #type: ignore
+        if self.renderer is not None and self.renderer.running():
+            self.renderer._rebase(offset)
+        self.clock = clock
 
     # Exceutors
     def run_in_executor(self, executor: Executor | None, function: Callable[[*Ts], T], *args: *Ts) -> asyncio.Future[T]:
+        # Completions come back through call_soon_threadsafe, so they share the inbox's wakeups
         if executor is None:
             executor = self.default_executor
-        return asyncio.wrap_future(executor.submit(function, *args))
+        return asyncio.wrap_future(executor.submit(function, *args), loop=self)
 
     def set_default_executor(self, executor: Executor) -> None:
         self.default_executor.shutdown(cancel_futures=True)
@@ -505,11 +1397,28 @@ class Window(asyncio.AbstractEventLoop):
     def create_future(self) -> asyncio.Future[Any]:
         return asyncio.Future(loop=self)
     def create_task(self, coro: Coroutine[Any, None, T] | Generator[Any, Any, T], *, name: str | None = None, context: Context | None = None) -> asyncio.Task[T]:
-        return asyncio.Task(coro, loop=self, name=name, context=context)
-    def set_task_factory(*args: Any) -> Never:
-        raise NotImplementedError("set_task_factory is not yet supported")
-    def get_task_factory(self) -> Never:
-        raise NotImplementedError("get_task_factory is not yet supported")
+        """
+        Schedule a coroutine as a task, made by the task factory if one is set.
+        Factories are called the same way as by asyncio's event loops, so `asyncio.eager_task_factory`(3.12+) works,
+        running the task's first step immediately, which lets coroutines that finish without waiting skip the ready queue.
+        """
+        if self._task_factory is None:
+            return asyncio.Task(coro, loop=self, name=name, context=context)
+        # Factories return Futures in typeshed, but they make tasks
+        task: asyncio.Task[T]
+        if context is None:
+            task = self._task_factory(self, coro) #type: ignore
+        else:
+            task = self._task_factory(self, coro, context=context) #type: ignore
+        if name is not None:
+            task.set_name(name)
+        return task
+    def set_task_factory(self, factory: _TaskFactory | None) -> None:
+        if factory is not None and not callable(factory):
+            raise TypeError("task factory must be a callable or None")
+        self._task_factory = factory
+    def get_task_factory(self) -> _TaskFactory | None:
+        return self._task_factory
     
     #Compatibility
     def get_debug(self) -> bool:
@@ -524,15 +1433,26 @@ class Window(asyncio.AbstractEventLoop):
         This is the event handler that is used to exacute Handles
         """
         event.handle._run()
+    def _wakeup_handler(self, event: WakeupEvent) -> None:
+        """
+        The loop only needs to be woken up, the ready queue is run after every event
+        """
+        pass
     def _handle_event(self, event: events.Event | None) -> None:
         """
-        Execaute every event handler assosated with an event
+        Execaute every event handler assosated with an event, in order of priority, until one consumes it
         """
         if event is None:
             return
-        if event.type not in self.event_handlers:
+        if self._dead_handlers:
+            self._unregister_dead_handlers()
+        handlers = self.event_handlers.get(event.type)
+        if handlers is None:
             return 
-        for handler in frozenset(self.event_handlers[event.type]):
+        event._consumed = False
+        for handler, group in handlers.snapshot:
+            if group is not None and not group.active:
+                continue
             try:
                 handler(event)
             except Exception as e:
@@ -541,20 +1461,197 @@ class Window(asyncio.AbstractEventLoop):
                 context['event'] = event
                 context['handler'] = handler
                 self.call_exception_handler(context)
+            if event._consumed:
+                break
 
             #self.callSoon(handler, event)
 
-    def _wait_for_event(self) -> events.Event | None:
-        soonestEvent = self.timers.soonest()
-        if soonestEvent == float('inf'):
-            return events.marshal(pygame.event.wait())
+    def _dispatch(self, event: pygame.event.Event) -> None:
+        """
+        Marshal a pygame event and handle it, events nobody handles are not marshalled.
+        They can still arrive if they were queued before their last handler was unregistered
+        """
+        if self.event_handlers.get(event.type):
+            self._dispatching = True
+            try:
+                self._handle_event(events.marshal(event))
+            finally:
+                self._dispatching = False
+    def _drain_bus(self) -> None:
+        """Handle a batch of events from the bus, at most `max_events_per_iteration`"""
+        self._dispatching = True
+        try:
+            self.bus.drain(self._handle_event, self.max_events_per_iteration)
+        finally:
+            self._dispatching = False
+    def _wait_for_pygame_event(self, timeout: float) -> pygame.event.Event:
+        """
+        Wait up to `timeout` seconds for the next pygame event, returning a NOEVENT event on timeout.
+        a timeout of 0 polls without blocking, and infinity waits until an event arrives
+
+        pygame's wait is only accurate to a millisecond or two, so it's used to wait until `precise_wait` seconds
+        before the timeout, the loop then comes back with less than that left, and sleeps the rest with `time.sleep`,
+        which is accurate to tens of microseconds. Events arriving during that short sleep are handled straight after it.
+        """
+        if timeout <= 0:
+            return pygame.event.poll()
+        elif timeout == float('inf'):
+            return pygame.event.wait()
+        elif timeout > self.precise_wait:
+            # pygame.event.wait(0) blocks forever, so round up to make sure the loop wakes up for the timer
+            return pygame.event.wait(math.ceil((timeout - self.precise_wait)*1000))
+        event = pygame.event.poll()
+        if event.type != pygame.NOEVENT:
+            return event
+        time.sleep(timeout)
+        return pygame.event.poll()
+    def _wait_for_events(self, timeout: float) -> list[pygame.event.Event]:
+        """
+        Wait up to `timeout` seconds for pygame events, then take every pending event from pygame's queue.
+        Returns at most `max_events_per_iteration` events, the rest are kept for the next iteration.
+        """
+        pending = self._pending_events
+        if not pending:
+            first_event = self._wait_for_pygame_event(timeout)
+            if first_event.type == pygame.NOEVENT:
+                return []
+            pending.append(first_event)
+            pending.extend(pygame.event.get())
+            if self.coalescer is not None:
+                self._pending_events = pending = deque(self.coalescer.coalesce(pending))
+        
+        return [pending.popleft() for _ in range(min(len(pending), self.max_events_per_iteration))]
+    def _drain_inbox(self) -> None:
+        """
+        Move every callback scheduled from other threads to the ready queue,
+        the next callback from another thread will post a wakeup again
+        """
+        if not self._inbox:
+            return
+        with self._inbox_lock:
+            for handle in self._inbox:
+                self._ready.append(handle)
+            self._inbox.clear()
+            self._wakeup_posted = False
+    def _run_ready(self) -> None:
+        """
+        Run the callbacks which were ready at the start of the call, in order of `Priority`,
+        callbacks scheduled while running are left for the next iteration so events are not starved.
+
+        Input and frame callbacks always run. Normal callbacks stop after `callback_slice` seconds,
+        or `frame_margin` seconds before the next frame is due, but at least one runs so they can't be starved.
+        Idle callbacks only run if every normal callback ran, and there is time left.
+        """
+        input_queue, frame_queue, normal_queue, idle_queue = self._ready.queues
+        for queue in (input_queue, frame_queue):
+            for _ in range(len(queue)):
+                handle = queue.popleft()
+                if not handle.cancelled():
+                    handle._run()
+        if not idle_queue:
+            # With a single normal callback there's no budget to check, this is the common case of one task stepping at a time
+            if not normal_queue:
+                return
+            if len(normal_queue) == 1:
+                handle = normal_queue.popleft()
+                if not handle.cancelled():
+                    handle._run()
+                return
+
+        clock = self.time
+        deadline = min(clock() + self.callback_slice, self.frame_deadline - self.frame_margin)
+        for _ in range(len(normal_queue)):
+            handle = normal_queue.popleft()
+            if handle.cancelled():
+                continue
+            handle._run()
+            if clock() >= deadline:
+                return
+        if normal_queue:
+            return
+        for _ in range(len(idle_queue)):
+            if clock() >= deadline:
+                return
+            handle = idle_queue.popleft()
+            if not handle.cancelled():
+                handle._run()
+    def run_sliced(self, work: Iterable[Any] | Generator[Any, Any, T], budget: float = 4, *, total: int | None = None,
+                   on_progress: Callable[[SlicedWork[T]], None] | None = None, level: Priority = Priority.NORMAL) -> SlicedWork[T]:
+        """
+        Run work which has to stay on the event loop, like rebuilding lots of widgets, without blocking input or rendering.
+        Each item taken from `work` is a unit, units are run until `budget` milliseconds are spent(or the next frame is close),
+        then the loop gets a turn before the next slice. `on_progress` is called after each slice,
+        and `total` is the number of units, taken from `len(work)` when not given.
+        The slices are scheduled with the priority class `level`.
+
+        Example:
+        ```
+        def rebuild(rows: list[str]) -> Generator[None, None, Group[Text]]:
+            widgets = []
+            for row in rows:
+                widgets.append(Text(..., font, 16, Color.BLACK, row))
+                yield
+            return Group(..., widgets)
+        group = await Window().run_sliced(rebuild(rows), 4, total=len(rows))
+        ```
+        `utils.coroutines.feed` turns a function and it's inputs into this kind of generator.
+        """
+        with priority(level):
+            return SlicedWork(work, budget / 1000, total, on_progress)
+    def queue_depths(self) -> dict[Priority, int]:
+        """Return the number of ready callbacks in each `Priority` class"""
+        return self._ready.depths()
+    @property
+    def frame_deadline(self) -> float:
+        """When the renderer's next frame is due, in loop time, infinity if it isn't running"""
+        if self.renderer is None or not self.renderer.running():
+            return math.inf
+        return self.renderer.deadline
+    def _run_once(self) -> None:
+        """
+        One iteration of the event loop: move timed out timers to the ready queue,
+        wait for an event(without blocking if callbacks are ready), handle it,
+        handle events from the bus, move callbacks from other threads to the ready queue and then run the ready callbacks
+        If `batch_events` or `coalescer` is set, a batch of events is handled instead of just one
+
+        With a virtual clock, the loop doesn't wait for the soonest timer, it checks for events,
+        and if nothing else became ready, the clock jumps to the timer
+        """
+        now = self.time()
+        timeout = self.timers.soonest(now)
+        input_queue, frame_queue, normal_queue, idle_queue = self._ready.queues
+        if self._pending_events or input_queue or frame_queue or self.bus.pending:
+            timeout = 0
+        elif (normal_queue or idle_queue) and now < self.frame_deadline - self.frame_margin:
+            # Otherwise, normal and idle callbacks wait for the frame, which is the soonest timer
+            timeout = 0
+        skip_to = math.inf
+        if 0 < timeout < math.inf and self.clock.virtual:
+            # `now + timeout` can round to just before the timer
+            skip_to = self.timers.timers[0].when()
+            timeout = 0
+        if self.batch_events or self.coalescer is not None:
+            for event in self._wait_for_events(timeout):
+                self._dispatch(event)
+        elif self._pending_events:
+            # Left over from when batching was enabled
+            self._dispatch(self._pending_events.popleft())
         else:
-            return events.marshal(pygame.event.wait(int(soonestEvent*1000)))
+            self._dispatch(self._wait_for_pygame_event(timeout))
+        if self.bus.pending:
+            self._drain_bus()
+        self._drain_inbox()
+        # Idle callbacks can't run this close to the frame, so they don't stop the clock
+        if skip_to != math.inf and not (input_queue or frame_queue or normal_queue or self.bus.pending):
+            self.clock.advance_to(skip_to)
+        self._run_ready()
     def run(self) -> None:
+        if self.hosted:
+            raise RuntimeError("A hosted window is run by awaiting `host` in the host event loop")
         logger.info(f'{self!r} begain event loop')
         self.running = True
         while self.running:
-            self._handle_event(self._wait_for_event())
+            self._run_once()
         logger.info(f'{self!r} stoped event loop')
     run_forever = run
 
@@ -570,6 +1667,42 @@ class Window(asyncio.AbstractEventLoop):
         # The future should now be done
         return future.result()
 
+    async def host(self) -> None:
+        """
+        Run a hosted window inside the currently running asyncio event loop, until `stop` is called.
+        Every `poll_interval` seconds pygame's queue is drained and the events are dispatched to their handlers,
+        with the same batching and coalescing as `batch_events` and `coalescer`.
+        Each check without events doubles the wait before the next one, up to `max_poll_interval`,
+        so an idle window doesn't wake the host loop 250 times a second, the first event resets it to `poll_interval`.
+        """
+        if not self.hosted:
+            raise RuntimeError("Only a hosted window can be run with `host`, initialize it with `hosted=True`")
+        if self._hosting:
+            raise RuntimeError("Window is already being hosted")
+        logger.info(f'{self!r} is being hosted by {asyncio.get_running_loop()!r}')
+        self.running = True
+        self._hosting = True
+        try:
+            if self.renderer is not None and self._deferred_renderer:
+                self._deferred_renderer = False
+                self.renderer._run()
+            interval = self.poll_interval
+            while self.running:
+                idle = True
+                for event in self._wait_for_events(0):
+                    idle = False
+                    self._dispatch(event)
+                if self.bus.pending:
+                    idle = False
+                    self._drain_bus()
+                interval = min(interval * 2, self.max_poll_interval) if idle else self.poll_interval
+                # Left over events are handled straight after other tasks had a turn
+                await asyncio.sleep(0 if self._pending_events or self.bus.pending else interval)
+        finally:
+            self._hosting = False
+            self.running = False
+        logger.info(f'{self!r} stopped being hosted')
+
     def stop(self) -> None:
         self.running = False
     def is_running(self) -> bool:
@@ -617,7 +1750,7 @@ class Window(asyncio.AbstractEventLoop):
     # Init via `Window(windowSurface)`, 
     # Get the current window via `Window()`
     __instance: Self | None = None
-    def __new__(cls, window: pygame.Surface | EllipsisType = ..., unscaled_size: tuple[int, int] | EllipsisType = ..., title: str | EllipsisType = ...) -> 'Window':
+    def __new__(cls, window: pygame.Surface | EllipsisType = ..., unscaled_size: tuple[int, int] | EllipsisType = ..., title: str | EllipsisType = ..., *, hosted: bool = False) -> 'Window':
         #Check if no instance is set
         if cls.__instance is None:
             #if no instance is set, then initiazliation must be happening
@@ -638,69 +1771,89 @@ class Window(asyncio.AbstractEventLoop):
         return self.__instance is not None
 
 
-    # A pile of bullshit I don't know how to implement in pygame
+    # Watching file descriptors, pygame can't wait on them so a `SelectorThread` does
+    @property
+    def selector(self) -> SelectorThread:
+        if self._selector is None:
+            self._selector = SelectorThread(self)
+        return self._selector
     def add_reader(self, fileno: FileDescriptorLike, callback: Callable[[*Ts], T], *args: *Ts) -> None:
-        raise NotImplementedError("pygame event loop does not support readers")
+        self.selector.add_reader(fileno, callback, *args)
     def remove_reader(self, fileno: FileDescriptorLike) -> bool:
-        raise NotImplementedError("pygame event loop does not support readers")
+        return self._selector is not None and self._selector.remove_reader(fileno)
     def add_writer(self, fileno: FileDescriptorLike, callback: Callable[[*Ts], T], *args: *Ts) -> None:
-        raise NotImplementedError("pygame event loop does not support writers")
+        self.selector.add_writer(fileno, callback, *args)
     def remove_writer(self, fileno: FileDescriptorLike) -> bool:
-        raise NotImplementedError("pygame event loop does not support writers")
+        return self._selector is not None and self._selector.remove_writer(fileno)
+
+    # A pile of bullshit I don't know how to implement in pygame
     
+    # Sockets, implemented in `sockets` on top of add_reader/add_writer
     async def sock_recv(self, sock: socket, nbytes: int) -> bytes:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_recv_into(self, sock: socket, buffer: object) -> int:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_recvfrom(self, stock: socket, bufferSize: int) -> tuple[bytes, Any]:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_recvfrom_into(self, stock: socket, buffer: object, nbytes: int = 0) -> tuple[int, Any]:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_sendall(self, stock: socket, data: object) -> None:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_sendto(self, sock: socket, data: object, address: Any) -> int:
-            raise NotImplementedError("pygame event loop does not support sockets")
+        return await sockets.sock_recv(self, sock, nbytes)
+    async def sock_recv_into(self, sock: socket, buffer: Any) -> int:
+        return await sockets.sock_recv_into(self, sock, buffer)
+    async def sock_recvfrom(self, sock: socket, bufferSize: int) -> tuple[bytes, Any]:
+        return await sockets.sock_recvfrom(self, sock, bufferSize)
+    async def sock_recvfrom_into(self, sock: socket, buffer: Any, nbytes: int = 0) -> tuple[int, Any]:
+        return await sockets.sock_recvfrom_into(self, sock, buffer, nbytes)
+    async def sock_sendall(self, sock: socket, data: Any) -> None:
+        return await sockets.sock_sendall(self, sock, data)
+    async def sock_sendto(self, sock: socket, data: Any, address: Any) -> int:
+        return await sockets.sock_sendto(self, sock, data, address)
     async def sock_connect(self, sock: socket, address: Any) -> None:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_accept(self, sock: socket) -> Any:
-        raise NotImplementedError("pygame event loop does not support sockets")
-    async def sock_sendfile(self, sock: socket, file: object, offset: int = 0, count: int | None = None, fallback: bool | None = True) -> int:
-        raise NotImplementedError("pygame event loop does not support sockets")
-
-    async def getaddrinfo(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support DNS")
-    async def getnameinfo(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support DNS")
+        return await sockets.sock_connect(self, sock, address)
+    async def sock_accept(self, sock: socket) -> tuple[socket, Any]:
+        return await sockets.sock_accept(self, sock)
+    async def sock_sendfile(self, sock: socket, file: Any, offset: int = 0, count: int | None = None, *, fallback: bool | None = True) -> int:
+        return await sockets.sock_sendfile(self, sock, file, offset, count, fallback)
+
+    # DNS lookups block, so they're done in the default executor
+    async def getaddrinfo(self, host: bytes | str | None, port: bytes | str | int | None, *, family: int = 0, type: int = 0, proto: int = 0, flags: int = 0) -> Any:
+        return await self.run_in_executor(None, getaddrinfo, host, port, family, type, proto, flags)
+    async def getnameinfo(self, sockaddr: tuple[str, int] | tuple[str, int, int, int], flags: int = 0) -> tuple[str, str]:
+        return await self.run_in_executor(None, getnameinfo, sockaddr, flags)
     
-    async def connect_read_pipe(self, protocol_factory: Any, pipe: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support pipes")
-    async def connect_write_pipe(self, protocol_factory: Any, pipe: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support pipes")
+    # Pipes and child processes, implemented in `processes` on top of add_reader/add_writer
+    async def connect_read_pipe(self, protocol_factory: Callable[[], Any], pipe: Any) -> Any:
+        return await processes.connect_read_pipe(self, protocol_factory, pipe)
+    async def connect_write_pipe(self, protocol_factory: Callable[[], Any], pipe: Any) -> Any:
+        return await processes.connect_write_pipe(self, protocol_factory, pipe)
+    async def subprocess_exec(self, protocol_factory: Callable[[], Any], *args: Any, **kwargs: Any) -> Any:
+        return await processes.subprocess_exec(self, protocol_factory, *args, **kwargs)
+    async def subprocess_shell(self, protocol_factory: Callable[[], Any], cmd: Any, **kwargs: Any) -> Any:
+        return await processes.subprocess_shell(self, protocol_factory, cmd, **kwargs)
+
     def add_signal_handler(self, signum: int, callback: Callable[..., object], *args: Any) -> None:
         raise NotImplementedError("pygame event loop does not support signal handlers")
     def remove_signal_handler(self, sig: int) -> bool:
         raise NotImplementedError("pygame event loop does not support signal handlers")
     
-    async def subprocess_exec(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support subprocesses")
-    async def subprocess_shell(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support subprocesses")
-    
-    async def create_connection(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support creating network connections")
+    async def create_connection(self, protocol_factory: Callable[[], Any], host: str | None = None, port: int | None = None, **kwargs: Any) -> Any:
+        return await sockets.create_connection(self, protocol_factory, host, port, **kwargs)
     async def create_datagram_endpoint(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError("pygame event loop does not support creating datagram endpoints")
-    async def create_unix_connection(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support creating Unix connections")
-    async def create_server(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support creating network servers")
-    async def create_unix_server(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support creating Unix servers")
-    async def connect_accepted_socket(self, *args: Any, **kwargs: Any) -> Any:
-        raise NotImplementedError("pygame event loop does not support connecting accepted sockets")
+    async def create_unix_connection(self, protocol_factory: Callable[[], Any], path: Any = None, **kwargs: Any) -> Any:
+        return await sockets.create_unix_connection(self, protocol_factory, path, **kwargs)
+    async def create_server(self, protocol_factory: Callable[[], Any], host: Any = None, port: int | None = None, **kwargs: Any) -> Any:
+        return await sockets.create_server(self, protocol_factory, host, port, **kwargs)
+    async def create_unix_server(self, protocol_factory: Callable[[], Any], path: Any = None, **kwargs: Any) -> Any:
+        return await sockets.create_unix_server(self, protocol_factory, path, **kwargs)
+    async def connect_accepted_socket(self, protocol_factory: Callable[[], Any], sock: socket, **kwargs: Any) -> Any:
+        return await sockets.connect_accepted_socket(self, protocol_factory, sock, **kwargs)
     
     async def sendfile(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError("pygame event loop does not support sendfile")
     async def start_tls(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError("pygame event loop does not support start_tls")
+
+    # Defined last, since the name hides the `events` module in the rest of the class body
+    def events(self, event_type: Type[EventT], *predicates: Callable[[EventT], bool], maxsize: int = 256,
+               policy: Overflow = Overflow.DROP_OLDEST, merge: Merge = keep_latest, priority: int = 0) -> EventStream[EventT]:
+        """
+        Subscribe to the events of a type, returning an `EventStream` to iterate over with `async for`.
+        Only events every predicate returns True for are kept, up to `maxsize` at a time, `policy` and `merge` say what
+        happens to events when the buffer is full(see `EventStream`), and `priority` is the priority of the stream's handler
+        """
+        return EventStream(event_type, predicates, maxsize, policy, merge, priority)
     
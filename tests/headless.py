@@ -0,0 +1,16 @@
+"""
+Creates the `Window` singleton for tests, using SDL's dummy video driver so no display is needed
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+from asyncui.window import Window
+
+def headless_window() -> Window:
+    try:
+        return Window()
+    except RuntimeError:
+        pygame.init()
+        return Window(pygame.display.set_mode((100, 100)), (100, 100), "test")
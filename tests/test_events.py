@@ -1,7 +1,20 @@
+from headless import headless_window
 import unittest
+import asyncio
+import threading
+import time
 import asyncui.events as events
+from asyncui.events import coalescing, bus
+from dataclasses import dataclass
 import pygame
 
+@dataclass
+class Progress(events.Event):
+    done: int
+@dataclass
+class Status(events.Event):
+    done: int
+
 class TestEvents(unittest.TestCase):
     #Fake key down
     pygame_key_down = pygame.event.Event(pygame.KEYDOWN,  {
@@ -43,5 +56,157 @@ class TestEvents(unittest.TestCase):
         # but it should always contain at least the same keys and values as the orginal event.
         print(events.to_pygame_event(down), self.pygame_key_down)
         assert vars(events.to_pygame_event(down)).items() >= vars(self.pygame_key_down).items(), "to_pygame_event does not properly generate pygame event from asyncui event"
+    def test_marshal_enums(self) -> None:
+        down = events.marshal(self.pygame_key_down)
+        assert isinstance(down, events.KeyDown)
+        assert down.mod == events.keyboard.ModifierKeys.Shift, "flag values are not converted"
+
+        combined = pygame.event.Event(pygame.KEYUP, {'key': 1_000_000, 'mod': pygame.KMOD_LCTRL | pygame.KMOD_LALT, 'unicode': ''})
+        up = events.marshal(combined)
+        assert isinstance(up, events.KeyUp)
+        assert up.key == events.keyboard.Keys.ErrorKey, "unknown keys should become ErrorKey"
+        assert up.mod == events.keyboard.ModifierKeys.LeftControl | events.keyboard.ModifierKeys.LeftAlt, "combined flags are not converted"
+    def test_builtin_events_use_slots(self) -> None:
+        down = events.marshal(self.pygame_key_down)
+        assert not hasattr(down, '__dict__'), "built in events should not have a __dict__"
+
+class TestCoalescing(unittest.TestCase):
+    @staticmethod
+    def motion(pos: tuple[int, int], rel: tuple[int, int], buttons: tuple[int, int, int] = (0, 0, 0)) -> pygame.event.Event:
+        return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=buttons, touch=False)
+    def test_motion_is_merged(self) -> None:
+        coalescer = coalescing.default_coalescer()
+        click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(3, 3), button=1, touch=False)
+        merged = coalescer.coalesce([
+            self.motion((1, 1), (1, 1)),
+            self.motion((3, 2), (2, 1)),
+            self.motion((3, 3), (0, 1)),
+            click,
+            self.motion((4, 3), (1, 0), (1, 0, 0)),
+        ])
+        assert len(merged) == 3, f"expected 2 motion events around the click, got {merged}"
+        assert merged[0].pos == (3, 3) and merged[0].rel == (3, 3), "merged motion should keep the last pos and sum rel"
+        assert merged[1] is click, "events of other types must not be reordered"
+        assert coalescer.merged[events.MouseMove] == 2 and coalescer.total_merged == 2
+    def test_wheel_and_resize(self) -> None:
+        coalescer = coalescing.default_coalescer()
+        wheel = dict(flipped=False, touch=False, precise_x=0., x=0)
+        resize = [pygame.event.Event(pygame.VIDEORESIZE, size=(w, w), w=w, h=w) for w in (100, 200, 300)]
+        merged = coalescer.coalesce([
+            pygame.event.Event(pygame.MOUSEWHEEL, dict(wheel, y=1, precise_y=1.)),
+            pygame.event.Event(pygame.MOUSEWHEEL, dict(wheel, y=2, precise_y=2.)),
+            *resize
+        ])
+        assert [event.type for event in merged] == [pygame.MOUSEWHEEL, pygame.VIDEORESIZE]
+        assert merged[0].y == 3 and merged[0].precise_y == 3.
+        assert merged[1] is resize[-1], "only the latest resize should be kept"
+    def test_no_policy(self) -> None:
+        coalescer = coalescing.Coalescer()
+        moves = [self.motion((i, i), (1, 1)) for i in range(3)]
+        assert coalescer.coalesce(moves) == moves, "events without a policy should never be merged"
+
+class TestBus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wakeups = 0
+        self.bus = bus.EventBus(self.wakeup)
+    def wakeup(self) -> None:
+        self.wakeups += 1
+    def drain(self, limit: int = 100) -> list[int]:
+        handled: list[int] = []
+        self.bus.drain(lambda event: handled.append(event.done), limit) #type: ignore
+        return handled
+
+    def test_drop_oldest(self) -> None:
+        self.bus.configure(Progress, 3, bus.Overflow.DROP_OLDEST)
+        for done in range(5):
+            assert self.bus.publish(Progress(done))
+        assert self.bus.pending == 3 and self.bus.dropped[Progress] == 2
+        assert self.drain(2) == [2, 3] and self.drain() == [4]
+        assert self.bus.pending == 0
+    def test_coalesce(self) -> None:
+        def add(older: events.Event, newer: events.Event) -> events.Event:
+            return Progress(older.done + newer.done) #type: ignore
+        self.bus.configure(Progress, 2, bus.Overflow.COALESCE, add)
+        for done in range(1, 6):
+            self.bus.publish(Progress(done))
+        assert self.drain() == [1, 2 + 3 + 4 + 5]
+        assert self.bus.coalesced[Progress] == 3 and self.bus.total_dropped == 0
+    def test_unconfigured(self) -> None:
+        with self.assertRaises(KeyError):
+            self.bus.publish(Progress(0))
+        with self.assertRaises(ValueError):
+            self.bus.configure(Progress, 0)
+
+    def test_block_waits_for_room(self) -> None:
+        self.bus.configure(Progress, 2, bus.Overflow.BLOCK)
+        def produce() -> None:
+            for done in range(10):
+                self.bus.publish(Progress(done))
+        thread = threading.Thread(target=produce)
+        thread.start()
+        handled: list[int] = []
+        while len(handled) < 10:
+            handled += self.drain()
+            time.sleep(0.001)
+        thread.join()
+        assert handled == list(range(10)) and self.bus.total_dropped == 0
+        # The thread which created the bus(the event loop's) can't block
+        self.bus.publish(Progress(0))
+        self.bus.publish(Progress(1))
+        with self.assertRaises(asyncio.QueueFull):
+            self.bus.publish(Progress(2))
+    def test_block_timeout(self) -> None:
+        self.bus.configure(Progress, 1, bus.Overflow.BLOCK)
+        results: list[bool] = []
+        def produce() -> None:
+            results.append(self.bus.publish(Progress(0), 0.01))
+            results.append(self.bus.publish(Progress(1), 0.01))
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+        assert results == [True, False] and self.bus.dropped[Progress] == 1
+    def test_put(self) -> None:
+        self.bus.configure(Progress, 1, bus.Overflow.BLOCK)
+        async def main() -> list[int]:
+            await self.bus.put(Progress(0))
+            putter = asyncio.ensure_future(self.bus.put(Progress(1)))
+            await asyncio.sleep(0)
+            assert not putter.done(), "put didn't wait for room"
+            handled = self.drain()
+            await putter
+            return handled + self.drain()
+        # asyncio.run refuses to start once the window has made itself the running loop
+        assert headless_window().run_until_complete(main()) == [0, 1]
+
+    def test_drain_is_fair(self) -> None:
+        self.bus.configure(Progress)
+        self.bus.configure(Status)
+        for done in range(10):
+            self.bus.publish(Progress(done))
+        for done in range(3):
+            self.bus.publish(Status(done))
+        handled: list[tuple[str, int]] = []
+        self.bus.drain(lambda event: handled.append((type(event).__name__, event.done)), 4) #type: ignore
+        assert sorted(handled) == [('Progress', 0), ('Progress', 1), ('Status', 0), ('Status', 1)], "a busy type starved the others"
+        handled.clear()
+        self.bus.drain(lambda event: handled.append((type(event).__name__, event.done)), 1) #type: ignore
+        self.bus.drain(lambda event: handled.append((type(event).__name__, event.done)), 1) #type: ignore
+        assert sorted(handled) == [('Progress', 2), ('Status', 2)], "drains should take turns starting from each type"
+        assert self.drain() == list(range(3, 10))
+
+    def test_one_wakeup_per_drain(self) -> None:
+        self.bus.configure(Progress)
+        def produce() -> None:
+            for done in range(100):
+                self.bus.publish(Progress(done))
+        for _ in range(2):
+            thread = threading.Thread(target=produce)
+            thread.start()
+            thread.join()
+            self.drain(1000)
+        assert self.wakeups == 2, f"{self.wakeups} wakeups for 2 drains"
+        self.bus.publish(Progress(0))
+        assert self.wakeups == 2, "publishing from the loop's thread woke it up"
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+from headless import headless_window
+import unittest
+import pygame
+from asyncui.display import Color
+from asyncui.graphics import Group, CachedGroup, Box
+
+class TestCachedGroup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.surface = pygame.Surface((100, 100))
+    def boxes(self) -> list[Box]:
+        return [Box((index * 10, index * 5), (8, 8), Color(index * 20, 0, 255 - index * 20)) for index in range(8)]
+
+    def test_draws_like_a_group(self) -> None:
+        expected = pygame.Surface((100, 100))
+        Group((10, 10), self.boxes()).draw(expected, 1)
+        CachedGroup((10, 10), self.boxes()).draw(self.surface, 1)
+        assert pygame.image.tobytes(self.surface, 'RGB') == pygame.image.tobytes(expected, 'RGB'), "the cached group drew differently to a group"
+
+    def test_rerendered_only_when_changed(self) -> None:
+        group = CachedGroup((10, 10), self.boxes())
+        for _ in range(3):
+            group.draw(self.surface, 1)
+        assert (group.hits, group.misses) == (2, 1)
+        group.draw(self.surface, 0.5)
+        assert group.misses == 2, "a new scale didn't re-render the group"
+        group.widgets[0] = group.widgets[0].reposition((12, 12))
+        group.draw(self.surface, 0.5)
+        assert group.misses == 3, "replacing a widget didn't re-render the group"
+        group.invalidate()
+        group.draw(self.surface, 0.5)
+        group.draw(self.surface, 0.5)
+        assert (group.hits, group.misses) == (3, 4)
+
+    def test_memory_is_reported(self) -> None:
+        group = CachedGroup((0, 0), self.boxes())
+        assert group.cache_bytes == 0
+        before = CachedGroup.total_bytes()
+        group.draw(self.surface, 1)
+        # 78x43 widgets, plus a 2 pixel margin, at 4 bytes per pixel
+        assert group.cache_bytes >= 80 * 45 * 4, group.cache_bytes
+        assert CachedGroup.total_bytes() == before + group.cache_bytes
+        group.invalidate()
+        assert group.cache_bytes == 0
@@ -0,0 +1,93 @@
+from headless import headless_window
+import unittest
+import asyncio
+import os
+import signal
+import sys
+
+# Echoes stdin back reversed, then exits with the status given as it's argument
+reverse = "import sys; data = sys.stdin.buffer.read(); sys.stdout.buffer.write(data[::-1]); sys.exit(int(sys.argv[1]))"
+
+class TestProcesses(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def run_async(self, coroutine: object, timeout: float = 10) -> None:
+        self.window.run_until_complete(asyncio.wait_for(coroutine, timeout)) #type: ignore
+
+    def test_communicate(self) -> None:
+        async def main() -> None:
+            process = await asyncio.create_subprocess_exec(sys.executable, '-c', reverse, '3', stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+            payload = os.urandom(512 * 1024)
+            stdout, _ = await process.communicate(payload)
+            assert stdout == payload[::-1], "child's output does not match"
+            assert process.returncode == 3, f"expected return code 3, got {process.returncode}"
+        self.run_async(main())
+
+    def test_shell_streams(self) -> None:
+        async def main() -> None:
+            process = await asyncio.create_subprocess_shell('echo first; echo second >&2', stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            assert process.stdout is not None and process.stderr is not None
+            assert await process.stdout.readline() == b'first\n'
+            assert await process.stderr.readline() == b'second\n'
+            assert await process.wait() == 0
+        self.run_async(main())
+
+    def test_kill(self) -> None:
+        async def main() -> None:
+            process = await asyncio.create_subprocess_exec(sys.executable, '-c', 'import time; time.sleep(30)')
+            process.kill()
+            assert await process.wait() == -signal.SIGKILL
+        self.run_async(main())
+
+    def test_concurrent_children(self) -> None:
+        async def child(index: int) -> None:
+            process = await asyncio.create_subprocess_exec(sys.executable, '-c', reverse, str(index % 7), stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+            payload = str(index).encode() * 1000
+            stdout, _ = await process.communicate(payload)
+            assert stdout == payload[::-1], f"child {index}'s output does not match"
+            assert process.returncode == index % 7, f"child {index} has the wrong return code"
+        async def main() -> None:
+            await asyncio.gather(*(child(index) for index in range(50)))
+        self.run_async(main(), 60)
+
+    def test_pipes(self) -> None:
+        async def main() -> None:
+            read_end, write_end = os.pipe()
+            reader = asyncio.StreamReader()
+            await self.window.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_end, 'rb'))
+            transport, _ = await self.window.connect_write_pipe(asyncio.Protocol, os.fdopen(write_end, 'wb'))
+            transport.write(b'through a pipe\n') #type: ignore
+            transport.close()
+            assert await reader.read() == b'through a pipe\n'
+        self.run_async(main())
+
+    def test_pipe_reads_are_budgeted(self) -> None:
+        from asyncui.processes import _read_budget, _read_size
+        read_end, write_end = os.pipe()
+        os.set_blocking(write_end, False)
+        chunk = bytes(64 * 1024)
+        class Flood(asyncio.Protocol):
+            # The writer always has more, up to a limit so an unbudgeted read still ends
+            received = refills = 0
+            def data_received(self, data: bytes) -> None:
+                self.received += len(data)
+                if self.refills < 200:
+                    self.refills += 1
+                    try:
+                        os.write(write_end, chunk)
+                    except BlockingIOError:
+                        pass
+        async def main() -> None:
+            transport, protocol = await self.window.connect_read_pipe(Flood, os.fdopen(read_end, 'rb'))
+            os.write(write_end, chunk)
+            # Nothing runs between the write and the call, so this is the only read callback
+            transport._read_ready() #type: ignore
+            assert protocol.received <= _read_budget + _read_size, f"one callback read {protocol.received} bytes"
+            transport.close()
+        try:
+            self.run_async(main())
+        finally:
+            os.close(write_end)
+
+if __name__ == '__main__':
+    unittest.main()
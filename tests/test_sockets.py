@@ -0,0 +1,122 @@
+from headless import headless_window
+import unittest
+import asyncio
+import os
+import socket
+import tempfile
+
+async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while data := await reader.read(65536):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+class TestSockets(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def run_async(self, coroutine: 'asyncio.Future[None] | asyncio.Task[None] | object') -> None:
+        self.window.run_until_complete(asyncio.wait_for(coroutine, 5)) #type: ignore
+
+    def test_tcp_streams(self) -> None:
+        async def main() -> None:
+            server = await asyncio.start_server(echo, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('localhost', port)
+            payload = os.urandom(1024 * 1024)
+            writer.write(payload)
+            writer.write_eof()
+            await writer.drain()
+            assert await reader.read() == payload, "echoed data does not match"
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+        self.run_async(main())
+
+    def test_unix_streams(self) -> None:
+        async def main(path: str) -> None:
+            server = await asyncio.start_unix_server(echo, path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            for line in (b'first\n', b'second\n'):
+                writer.write(line)
+                assert await reader.readline() == line
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            assert not os.path.exists(path), "closing a unix server should remove its socket file"
+        with tempfile.TemporaryDirectory() as directory:
+            self.run_async(main(os.path.join(directory, 'socket')))
+
+    def test_low_level_operations(self) -> None:
+        async def main() -> None:
+            listener = socket.socket()
+            listener.bind(('127.0.0.1', 0))
+            listener.listen()
+            listener.setblocking(False)
+            client = socket.socket()
+            client.setblocking(False)
+            with listener, client:
+                accepted, (connection, _) = await asyncio.gather(
+                    self.window.sock_connect(client, listener.getsockname()),
+                    self.window.sock_accept(listener),
+                )
+                with connection:
+                    await self.window.sock_sendall(client, b'ping')
+                    assert await self.window.sock_recv(connection, 4) == b'ping'
+        self.run_async(main())
+
+    def test_getaddrinfo(self) -> None:
+        async def main() -> None:
+            infos = await self.window.getaddrinfo('127.0.0.1', 80, type=socket.SOCK_STREAM)
+            assert infos[0][4] == ('127.0.0.1', 80)
+        self.run_async(main())
+
+    def test_blocking_socket_is_rejected(self) -> None:
+        async def main() -> None:
+            with socket.socket() as sock:
+                with self.assertRaises(ValueError):
+                    await self.window.sock_recv(sock, 1)
+        self.run_async(main())
+
+    def test_unsupported_options_are_rejected(self) -> None:
+        async def main() -> None:
+            server = await self.window.create_server(asyncio.Protocol, '127.0.0.1', 0, ssl_handshake_timeout=None)
+            port = server.sockets[0].getsockname()[1]
+            with self.assertRaises(NotImplementedError):
+                await self.window.create_connection(asyncio.Protocol, '127.0.0.1', port, happy_eyeballs_delay=0.25)
+            with self.assertRaises(NotImplementedError):
+                await self.window.create_server(asyncio.Protocol, '127.0.0.1', 0, keep_alive=True)
+            with socket.socket(socket.AF_UNIX) as sock, self.assertRaises(TypeError):
+                await self.window.create_unix_server(asyncio.Protocol, sock=sock, reuse_port=True)
+            server.close()
+            await server.wait_closed()
+        self.run_async(main())
+
+    def test_reads_are_budgeted(self) -> None:
+        from asyncui.sockets import _read_budget, _read_size
+        local, peer = socket.socketpair()
+        peer.setblocking(False)
+        chunk = bytes(64 * 1024)
+        class Flood(asyncio.Protocol):
+            # The peer always has more to send, up to a limit so an unbudgeted read still ends
+            received = refills = 0
+            def data_received(self, data: bytes) -> None:
+                self.received += len(data)
+                if self.refills < 200:
+                    self.refills += 1
+                    try:
+                        peer.send(chunk)
+                    except BlockingIOError:
+                        pass
+        async def main() -> None:
+            transport, protocol = await self.window.create_connection(Flood, sock=local)
+            peer.send(chunk)
+            # Nothing runs between the send and the call, so this is the only read callback
+            transport._read_ready() #type: ignore
+            assert protocol.received <= _read_budget + _read_size, f"one callback read {protocol.received} bytes"
+            transport.close()
+        with peer:
+            self.run_async(main())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,991 @@
+from headless import headless_window
+import unittest
+import asyncio
+import threading
+import socket
+import subprocess
+import sys
+import os
+import typing
+import time
+import functools
+import pygame
+import gc
+import math
+import tracemalloc
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.window import Window, Renderer, FrameStats, WakeupEvent, Priority, priority, event_handler, event_handler_method, HandlerGroup
+from asyncui.events.bus import Overflow
+from asyncui.clock import Clock, VirtualClock
+
+@dataclass
+class Ping(events.Event):
+    value: int
+
+class TestTimers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def test_timers_fire_in_order(self) -> None:
+        fired: list[float] = []
+        for delay in (0.03, 0.01, 0.02):
+            self.window.call_later(delay, fired.append, delay)
+        self.window.run_until_complete(asyncio.sleep(0.05))
+        assert fired == [0.01, 0.02, 0.03], f"timers fired out of order: {fired}"
+    def test_cancelled_timers_do_not_fire(self) -> None:
+        fired: list[int] = []
+        handles = [self.window.call_later(0.01, fired.append, i) for i in range(300)]
+        for handle in handles[::2]:
+            handle.cancel()
+        assert len(self.window.timers) == 150, "cancelled timers are still counted as pending"
+        self.window.run_until_complete(asyncio.sleep(0.03))
+        assert fired == list(range(1, 300, 2)), "a cancelled timer was executed"
+        assert len(self.window.timers.timers) == 0, "cancelled timers were never removed from the heap"
+
+    def test_sub_millisecond_timers_are_not_early(self) -> None:
+        for delay in (0.0003, 0.0015, 0.004):
+            start = time.perf_counter()
+            fired = self.window.create_future()
+            self.window.call_later(delay, fired.set_result, None)
+            self.window.run_until_complete(fired)
+            assert time.perf_counter() - start >= delay, f"a timer of {delay}s fired early"
+
+class TestReadyQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def test_call_soon_runs_in_order(self) -> None:
+        ran: list[int] = []
+        for i in range(5):
+            self.window.call_soon(ran.append, i)
+        self.window.call_soon(self.window.stop)
+        self.window.run()
+        assert ran == list(range(5)), f"callbacks ran out of order: {ran}"
+    def test_call_soon_threadsafe_wakes_loop(self) -> None:
+        future = self.window.create_future()
+        # The loop has nothing to do, so it blocks in pygame.event.wait until the thread wakes it
+        timer = threading.Timer(0.01, self.window.call_soon_threadsafe, (future.set_result, 42))
+        timer.start()
+        assert self.window.run_until_complete(future) == 42
+        timer.join()
+
+    def produce(self, threads: int, per_thread: int) -> tuple[list[threading.Thread], dict[int, list[int]], asyncio.Future[None]]:
+        received: dict[int, list[int]] = {thread: [] for thread in range(threads)}
+        done = self.window.create_future()
+        remaining = threads * per_thread
+        def record(thread: int, value: int) -> None:
+            nonlocal remaining
+            received[thread].append(value)
+            remaining -= 1
+            if not remaining:
+                done.set_result(None)
+        def producer(thread: int) -> None:
+            for value in range(per_thread):
+                self.window.call_soon_threadsafe(record, thread, value)
+        return [threading.Thread(target=producer, args=(thread,)) for thread in range(threads)], received, done
+    def test_call_soon_threadsafe_posts_one_wakeup(self) -> None:
+        wakeups = 0
+        def count(event: WakeupEvent) -> None:
+            nonlocal wakeups
+            wakeups += 1
+        pygame.event.get(WakeupEvent.type)
+        self.window.register_event_handler(WakeupEvent, count)
+        try:
+            producers, received, done = self.produce(16, 500)
+            # The loop isn't running, so every callback lands in the inbox before it's drained
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+            self.window.run_until_complete(done)
+        finally:
+            self.window.unregister_event_handler(WakeupEvent, count)
+        wakeups += len(pygame.event.get(WakeupEvent.type))
+        assert wakeups == 1, f"{wakeups} wakeup events were posted for one batch"
+        assert all(values == list(range(500)) for values in received.values()), "callbacks ran out of order"
+    def test_call_soon_threadsafe_ordering(self) -> None:
+        producers, received, done = self.produce(32, 2000)
+        for producer in producers:
+            producer.start()
+        self.window.run_until_complete(asyncio.wait_for(done, 30))
+        for producer in producers:
+            producer.join()
+        for thread, values in received.items():
+            assert values == list(range(2000)), f"callbacks from thread {thread} ran out of order"
+    def test_executor_completions(self) -> None:
+        async def main() -> list[int]:
+            return await asyncio.gather(*(self.window.run_in_executor(None, abs, -value) for value in range(2000)))
+        assert self.window.run_until_complete(main()) == list(range(2000))
+
+class TestEventBatching(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.window.batch_events = True
+        self.window.max_events_per_iteration = 4
+    def tearDown(self) -> None:
+        self.window.batch_events = False
+        self.window.max_events_per_iteration = 256
+    def test_batches_are_capped(self) -> None:
+        handled: list[int] = []
+        handled_before_callback: list[int] = []
+        def on_ping(event: Ping) -> None:
+            handled.append(event.value)
+            if event.value == 9:
+                self.window.stop()
+        self.window.register_event_handler(Ping, on_ping)
+        try:
+            for i in range(10):
+                self.window.post_event(Ping(i))
+            self.window.call_soon(lambda: handled_before_callback.append(len(handled)))
+            self.window.run()
+        finally:
+            self.window.unregister_event_handler(Ping, on_ping)
+        assert handled == list(range(10)), f"events were lost or reordered: {handled}"
+        assert handled_before_callback == [4], "ready callbacks should run after the first capped batch"
+
+class TestEventFiltering(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def test_unhandled_types_are_blocked(self) -> None:
+        def on_ping(event: Ping) -> None:
+            pass
+        assert pygame.event.get_blocked(Ping.type), "event types without handlers should be blocked"
+        self.window.register_event_handler(Ping, on_ping)
+        assert not pygame.event.get_blocked(Ping.type), "registering a handler should allow its event type"
+        self.window.unregister_event_handler(Ping, on_ping)
+        assert pygame.event.get_blocked(Ping.type), "unregistering the last handler should block its event type"
+        assert not pygame.event.get_blocked(events.VideoResize.type), "the window's own handlers were blocked"
+    def test_inactive_groups_block_their_types(self) -> None:
+        def on_ping(event: Ping) -> None:
+            pass
+        page = HandlerGroup(enabled=False)
+        with page.collect():
+            self.window.register_event_handler(Ping, on_ping)
+            menu = HandlerGroup()
+            with menu.collect():
+                self.window.register_event_handler(Ping, lambda event: None)
+        assert pygame.event.get_blocked(Ping.type), "a type whose handlers are all in inactive groups should be blocked"
+        with page:
+            assert not pygame.event.get_blocked(Ping.type), "enabling a group should allow its event types"
+            menu.disable()
+            assert not pygame.event.get_blocked(Ping.type)
+        menu.enable()
+        assert pygame.event.get_blocked(Ping.type), "a subgroup of a disabled group is inactive"
+        self.window.register_event_handler(Ping, on_ping)
+        assert not pygame.event.get_blocked(Ping.type), "moving a handler out of an inactive group should allow its type"
+        page.close()
+        assert not pygame.event.get_blocked(Ping.type)
+        self.window.unregister_event_handler(Ping, on_ping)
+        assert pygame.event.get_blocked(Ping.type)
+
+class TestReaders(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.reader, self.writer = socket.socketpair()
+        self.reader.setblocking(False)
+    def tearDown(self) -> None:
+        self.window.remove_reader(self.reader)
+        self.window.remove_writer(self.writer)
+        self.reader.close()
+        self.writer.close()
+    def test_reader(self) -> None:
+        received: list[bytes] = []
+        done = self.window.create_future()
+        def on_readable() -> None:
+            received.append(self.reader.recv(1024))
+            if b''.join(received) == b'hello world':
+                done.set_result(None)
+        self.window.add_reader(self.reader, on_readable)
+        threading.Timer(0.01, self.writer.sendall, (b'hello ',)).start()
+        threading.Timer(0.02, self.writer.sendall, (b'world',)).start()
+        self.window.run_until_complete(asyncio.wait_for(done, 1))
+        assert self.window.remove_reader(self.reader) is True
+        assert self.window.remove_reader(self.reader) is False, "removing twice should return False"
+    def test_writer(self) -> None:
+        done = self.window.create_future()
+        def on_writable() -> None:
+            self.window.remove_writer(self.writer)
+            self.writer.send(b'x')
+            done.set_result(None)
+        self.window.add_writer(self.writer, on_writable)
+        self.window.run_until_complete(asyncio.wait_for(done, 1))
+        assert self.reader.recv(1) == b'x'
+
+# A hosted window can't share a process with the other tests' window, so it's run in it's own interpreter
+hosted_app = '''
+import headless, asyncio, pygame
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.window import Window, event_handler_method
+
+@dataclass
+class Ping(events.Event):
+    value: int
+
+class Widget:
+    def __init__(self) -> None:
+        self.values: list[int] = []
+    @event_handler_method
+    def on_ping(self, event: Ping) -> None:
+        self.values.append(event.value)
+
+pygame.init()
+window = Window(pygame.display.set_mode((100, 100)), (50, 50), "hosted", hosted=True)
+frames: list[float] = []
+window.start_renderer(100, lambda window: frames.append(window.scale_factor))
+widget = Widget()
+widget.on_ping.register()
+
+async def main() -> None:
+    assert asyncio.get_running_loop() is not window, "the window replaced the host loop"
+    host = asyncio.create_task(window.host())
+    for value in range(3):
+        window.post_event(Ping(value))
+    assert (await window.get_event(Ping)).value == 0
+    await asyncio.sleep(0.1)
+    window.stop()
+    await host
+    assert widget.values == [0, 1, 2], widget.values
+    assert frames and set(frames) == {2.0}, frames
+asyncio.run(main())
+'''
+
+hosted_stream_app = '''
+import headless, asyncio, pygame
+from dataclasses import dataclass
+from asyncui import events
+from asyncui.window import Window
+
+@dataclass
+class Ping(events.Event):
+    value: int
+
+pygame.init()
+window = Window(pygame.display.set_mode((100, 100)), (50, 50), "hosted", hosted=True)
+
+async def main() -> None:
+    host = asyncio.create_task(window.host())
+    received: list[int] = []
+    async with window.events(Ping) as pings:
+        async def post() -> None:
+            for value in range(3):
+                await asyncio.sleep(0.01)
+                window.post_event(Ping(value))
+        poster = asyncio.create_task(post())
+        async for event in pings:
+            received.append(event.value)
+            if len(received) == 3:
+                break
+        await poster
+    window.stop()
+    await host
+    assert received == [0, 1, 2], received
+asyncio.run(main())
+'''
+
+hosted_idle_app = '''
+import headless, asyncio, pygame
+from asyncui.window import Window
+
+pygame.init()
+window = Window(pygame.display.set_mode((100, 100)), (50, 50), "hosted", hosted=True)
+polls = 0
+wait_for_events = window._wait_for_events
+def counted(timeout: float) -> list[pygame.event.Event]:
+    global polls
+    polls += 1
+    return wait_for_events(timeout)
+window._wait_for_events = counted #type: ignore
+
+async def main() -> None:
+    host = asyncio.create_task(window.host())
+    await asyncio.sleep(0.5)
+    window.stop()
+    await host
+    # Polling every `poll_interval` would check about 125 times
+    assert polls < 0.5 / window.max_poll_interval + 10, polls
+asyncio.run(main())
+'''
+
+class TestHosted(unittest.TestCase):
+    def run_app(self, app: str) -> None:
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run([sys.executable, '-c', app], cwd=os.path.dirname(__file__), env=environment, capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0, result.stderr
+    def test_hosted_window(self) -> None:
+        self.run_app(hosted_app)
+    def test_hosted_event_stream(self) -> None:
+        self.run_app(hosted_stream_app)
+    def test_idle_hosted_window_backs_off(self) -> None:
+        self.run_app(hosted_idle_app)
+
+class TestTaskFactory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def tearDown(self) -> None:
+        self.window.set_task_factory(None)
+
+    def test_task_factory(self) -> None:
+        made: list[asyncio.Task[object]] = []
+        def factory(loop: asyncio.AbstractEventLoop, coro: typing.Any, **kwargs: typing.Any) -> asyncio.Task[object]:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+            made.append(task)
+            return task
+        self.window.set_task_factory(factory)
+        assert self.window.get_task_factory() is factory
+        async def main() -> str:
+            task = asyncio.create_task(asyncio.sleep(0, 'result'), name='named')
+            assert task.get_name() == 'named'
+            return await task
+        assert self.window.run_until_complete(main()) == 'result'
+        assert len(made) == 2, "the task factory wasn't used for every task"
+    def test_invalid_task_factory(self) -> None:
+        with self.assertRaises(TypeError):
+            self.window.set_task_factory(1) #type: ignore
+
+    @unittest.skipUnless(hasattr(asyncio, 'eager_task_factory'), "eager tasks need Python 3.12+")
+    def test_eager_task_factory(self) -> None:
+        self.window.set_task_factory(asyncio.eager_task_factory) #type: ignore
+        async def immediate() -> int:
+            return 1
+        async def main() -> None:
+            task = self.window.create_task(immediate())
+            assert task.done() and task.result() == 1, "eager task didn't run it's first step immediately"
+            assert await asyncio.sleep(0.001, 2) == 2
+        self.window.run_until_complete(main())
+
+class TestPriorities(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        pygame.event.get()
+
+    def test_priority_order(self) -> None:
+        ran: list[str] = []
+        def on_ping(event: Ping) -> None:
+            self.window.call_soon(ran.append, 'input')
+        with priority(Priority.IDLE):
+            self.window.call_soon(ran.append, 'idle')
+        self.window.call_soon(ran.append, 'normal')
+        with priority(Priority.FRAME):
+            self.window.call_soon(ran.append, 'frame')
+        assert self.window.queue_depths() == {Priority.INPUT: 0, Priority.FRAME: 1, Priority.NORMAL: 1, Priority.IDLE: 1}
+        self.window.register_event_handler(Ping, on_ping)
+        try:
+            self.window.post_event(Ping(0))
+            self.window.call_soon(self.window.stop)
+            self.window.run()
+        finally:
+            self.window.unregister_event_handler(Ping, on_ping)
+        assert ran == ['input', 'frame', 'normal', 'idle'], f"callbacks ran in the wrong order: {ran}"
+
+    def test_idle_waits_for_normal_callbacks(self) -> None:
+        ran: list[str] = []
+        async def busy() -> None:
+            for _ in range(5):
+                ran.append('normal')
+                await asyncio.sleep(0)
+        with priority(Priority.IDLE):
+            self.window.call_soon(ran.append, 'idle')
+        self.window.run_until_complete(busy())
+        self.window.run_until_complete(asyncio.sleep(0.001))
+        assert ran == ['normal'] * 5 + ['idle'], ran
+
+    def test_frames_are_not_delayed_by_callbacks(self) -> None:
+        frames: list[float] = []
+        renderer = self.window.start_renderer(100, lambda window: frames.append(time.perf_counter()))
+        async def main() -> None:
+            await asyncio.sleep(0.02)
+            # 300ms of background work, scheduled at once
+            for _ in range(300):
+                self.window.call_soon(time.sleep, 0.001)
+            while sum(self.window.queue_depths().values()):
+                await asyncio.sleep(0.01)
+        try:
+            self.window.run_until_complete(main())
+        finally:
+            renderer.stop()
+        gaps = [after - before for before, after in zip(frames, frames[1:])]
+        assert max(gaps) < 0.05, f"a frame was delayed by {max(gaps) * 1000:.0f}ms"
+
+class TestSlicedWork(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+
+    def test_result_and_progress(self) -> None:
+        def squares(count: int) -> typing.Generator[None, None, list[int]]:
+            values = []
+            for index in range(count):
+                values.append(index * index)
+                yield
+            return values
+        reports: list[float | None] = []
+        work = self.window.run_sliced(squares(1000), 1, total=1000, on_progress=lambda work: reports.append(work.progress()))
+        result = self.window.run_until_complete(work)
+        assert result == [index * index for index in range(1000)]
+        assert work.completed == 1000 and work.progress() == 1.0
+        assert reports[-1] == 1.0 and reports == sorted(reports), f"progress went backwards: {reports}"
+        work = self.window.run_sliced(range(10))
+        assert work.total == 10, "the total wasn't taken from len()"
+        assert self.window.run_until_complete(work) is None
+
+    def test_slices_let_other_tasks_run(self) -> None:
+        ticks = 0
+        def slow() -> typing.Iterator[None]:
+            for _ in range(50):
+                time.sleep(0.001)
+                yield
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        async def main() -> int:
+            task = asyncio.ensure_future(ticker())
+            work = self.window.run_sliced(slow(), 5)
+            await work
+            task.cancel()
+            return work.slices
+        slices = self.window.run_until_complete(main())
+        assert slices > 5, f"the work ran in only {slices} slices"
+        assert ticks >= slices - 1, f"other tasks ran {ticks} times in {slices} slices"
+
+    def test_cancel_closes_generator(self) -> None:
+        closed = False
+        def endless() -> typing.Iterator[None]:
+            nonlocal closed
+            try:
+                while True:
+                    time.sleep(0.0005)
+                    yield
+            finally:
+                closed = True
+        async def main() -> None:
+            work = self.window.run_sliced(endless(), 1)
+            await asyncio.sleep(0.01)
+            work.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await work
+            assert work.completed > 0
+        self.window.run_until_complete(main())
+        assert closed, "the generator wasn't closed"
+
+class TestVirtualClock(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.clock = VirtualClock(1000)
+        self.window.set_clock(self.clock)
+    def tearDown(self) -> None:
+        self.window.set_clock(Clock())
+
+    def test_timers_fire_at_their_time(self) -> None:
+        fired: list[tuple[float, float]] = []
+        start = self.window.time()
+        for delay in (30.0, 0.5, 600.0, 2.0):
+            self.window.call_later(delay, lambda delay: fired.append((delay, self.window.time() - start)), delay)
+        wall = time.perf_counter()
+        self.window.run_until_complete(asyncio.sleep(3600))
+        assert time.perf_counter() - wall < 1, "virtual time waited in real time"
+        assert fired == [(0.5, 0.5), (2.0, 2.0), (30.0, 30.0), (600.0, 600.0)], fired
+        assert self.window.time() == start + 3600
+
+    def test_renderer_frames_are_paced(self) -> None:
+        frames: list[float] = []
+        renderer = self.window.start_renderer(60, lambda window: frames.append(window.time()))
+        try:
+            self.window.run_until_complete(asyncio.sleep(10))
+        finally:
+            renderer.stop()
+        gaps = {round(after - before, 9) for before, after in zip(frames, frames[1:])}
+        assert 599 <= len(frames) <= 601, f"{len(frames)} frames in 10 seconds at 60 FPS"
+        assert gaps == {round(1/60, 9)}, gaps
+
+    def test_ready_callbacks_stop_the_clock(self) -> None:
+        async def busy() -> float:
+            start = self.window.time()
+            for _ in range(100):
+                await asyncio.sleep(0)
+            return self.window.time() - start
+        self.window.call_later(5, lambda: None)
+        assert self.window.run_until_complete(busy()) == 0, "the clock moved while callbacks were ready"
+
+    def test_set_clock_keeps_time_left(self) -> None:
+        handle = self.window.call_later(10, lambda: None)
+        self.window.set_clock(VirtualClock(-50))
+        assert handle.when() == -40
+        handle.cancel()
+        with self.assertRaises(ValueError):
+            self.clock.advance(-1)
+        with self.assertRaises(TypeError):
+            Clock().advance_to(0)
+
+class TestBus(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.window.bus.configure(Ping, 64)
+    def tearDown(self) -> None:
+        self.window.bus.remove(Ping)
+
+    def test_events_skip_pygame(self) -> None:
+        received: list[Ping] = []
+        sent = [Ping(value) for value in range(10)]
+        self.window.register_event_handler(Ping, received.append)
+        try:
+            for event in sent:
+                self.window.post_event(event)
+            assert not pygame.event.peek(Ping.type), "a bus event went through pygame's queue"
+            self.window.run_until_complete(asyncio.sleep(0))
+        finally:
+            self.window.unregister_event_handler(Ping, received.append)
+        assert received == sent and all(a is b for a, b in zip(received, sent)), "events weren't handed over as they are"
+
+    def test_threads_wake_the_loop(self) -> None:
+        received: list[int] = []
+        done = self.window.create_future()
+        def on_ping(event: Ping) -> None:
+            received.append(event.value)
+            if event.value == 999:
+                done.set_result(None)
+        def produce() -> None:
+            for value in range(1000):
+                self.window.post_event(Ping(value))
+                if value % 50 == 0:
+                    time.sleep(0.001)
+        self.window.register_event_handler(Ping, on_ping)
+        thread = threading.Thread(target=produce)
+        try:
+            thread.start()
+            self.window.run_until_complete(asyncio.wait_for(done, 5))
+        finally:
+            thread.join()
+            self.window.unregister_event_handler(Ping, on_ping)
+        dropped = self.window.bus.dropped[Ping]
+        assert len(received) + dropped == 1000 and received == sorted(received)
+
+class TestHandlerOrder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.called: list[str] = []
+    def handler(self, name: str, consume: bool = False) -> typing.Callable[[Ping], None]:
+        def handle(event: Ping) -> None:
+            self.called.append(name)
+            if consume:
+                event.consume()
+        return handle
+    def dispatch(self, event: Ping) -> None:
+        self.window._handle_event(event)
+
+    def test_priorities(self) -> None:
+        handlers = [(self.handler('low'), -1), (self.handler('first'), 0), (self.handler('high'), 5), (self.handler('second'), 0)]
+        for handler, level in handlers:
+            self.window.register_event_handler(Ping, handler, level)
+        try:
+            self.dispatch(Ping(0))
+            assert self.called == ['high', 'first', 'second', 'low'], self.called
+            # Registering again changes the priority
+            self.window.register_event_handler(Ping, handlers[0][0], 10)
+            self.called.clear()
+            self.dispatch(Ping(0))
+            assert self.called == ['low', 'high', 'first', 'second'], self.called
+        finally:
+            for handler, _ in handlers:
+                self.window.unregister_event_handler(Ping, handler)
+
+    def test_consume(self) -> None:
+        @event_handler(Ping, priority=1)
+        def modal(event: Ping) -> None:
+            if event.value:
+                event.consume()
+        below = self.handler('below')
+        self.window.register_event_handler(Ping, below)
+        try:
+            with modal:
+                event = Ping(1)
+                self.dispatch(event)
+                assert event.consumed and self.called == []
+                self.dispatch(Ping(0))
+                assert self.called == ['below']
+        finally:
+            self.window.unregister_event_handler(Ping, below)
+        assert 'consumed' not in repr(event._get_pygame_event())
+
+    def test_changes_apply_from_next_event(self) -> None:
+        late = self.handler('late')
+        def once(event: Ping) -> None:
+            self.called.append('once')
+            self.window.unregister_event_handler(Ping, once)
+            self.window.register_event_handler(Ping, late)
+        self.window.register_event_handler(Ping, once)
+        try:
+            self.dispatch(Ping(0))
+            self.dispatch(Ping(0))
+        finally:
+            self.window.unregister_event_handler(Ping, late)
+        assert self.called == ['once', 'late'], self.called
+        assert not self.window.event_handlers[Ping.type]
+
+class TestEventStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+
+    def test_no_events_are_missed(self) -> None:
+        async def main() -> list[int]:
+            received: list[int] = []
+            async with self.window.events(Ping) as pings:
+                for value in range(5):
+                    self.window._handle_event(Ping(value))
+                async for event in pings:
+                    received.append(event.value)
+                    if event.value == 4:
+                        break
+            assert pings.closed and not self.window.event_handlers[Ping.type], "the stream's handler is still registered"
+            return received
+        assert self.window.run_until_complete(main()) == [0, 1, 2, 3, 4]
+
+    def test_wakes_up_for_posted_events(self) -> None:
+        async def main() -> int:
+            stream = self.window.events(Ping)
+            try:
+                self.window.call_later(0.01, self.window.post_event, Ping(7))
+                return (await asyncio.wait_for(stream.get(), 1)).value
+            finally:
+                await stream.aclose()
+        assert self.window.run_until_complete(main()) == 7
+
+    def test_policies_and_predicates(self) -> None:
+        def add(older: events.Event, newer: events.Event) -> events.Event:
+            return Ping(older.value + newer.value) #type: ignore
+        dropping = self.window.events(Ping, lambda event: event.value % 2 == 0, maxsize=2)
+        coalescing = self.window.events(Ping, maxsize=2, policy=Overflow.COALESCE, merge=add)
+        try:
+            for value in range(6):
+                self.window._handle_event(Ping(value))
+            assert [event.value for event in dropping.buffer] == [2, 4] and dropping.dropped == 1
+            assert [event.value for event in coalescing.buffer] == [0, 1 + 2 + 3 + 4 + 5] and coalescing.coalesced == 4
+        finally:
+            dropping.close()
+            coalescing.close()
+        with self.assertRaises(ValueError):
+            self.window.events(Ping, policy=Overflow.BLOCK)
+
+    def test_cancelled_get_event_unregisters(self) -> None:
+        async def main() -> None:
+            waiter = asyncio.ensure_future(self.window.get_event(Ping))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        self.window.run_until_complete(main())
+        assert not self.window.event_handlers[Ping.type], "a cancelled get_event left it's handler registered"
+
+    def test_close_stops_waiting_consumer(self) -> None:
+        async def main() -> None:
+            stream = self.window.events(Ping)
+            consumer = asyncio.ensure_future(stream.get())
+            await asyncio.sleep(0)
+            stream.close()
+            with self.assertRaises(StopAsyncIteration):
+                await consumer
+        self.window.run_until_complete(main())
+
+class TestHandlerGroups(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.called: list[str] = []
+    def handler(self, name: str) -> typing.Callable[[Ping], None]:
+        return lambda event: self.called.append(name)
+    def dispatch(self) -> list[str]:
+        self.called.clear()
+        self.window._handle_event(Ping(0))
+        return sorted(self.called)
+
+    def test_groups_are_flags(self) -> None:
+        page = HandlerGroup(enabled=False)
+        with page.collect():
+            self.window.register_event_handler(Ping, self.handler('page'))
+            menu = HandlerGroup()
+            with menu.collect():
+                self.window.register_event_handler(Ping, self.handler('menu'))
+        self.window.register_event_handler(Ping, outside := self.handler('outside'))
+        try:
+            assert menu.parent is page and len(page.handlers) == 1 and len(self.window.event_handlers[Ping.type]) == 3
+            assert self.dispatch() == ['outside'], "handlers of a disabled group were called"
+            with page:
+                assert self.dispatch() == ['menu', 'outside', 'page']
+                menu.disable()
+                assert self.dispatch() == ['outside', 'page']
+            menu.enable()
+            assert not menu.active and self.dispatch() == ['outside'], "a subgroup is active while it's parent is disabled"
+            page.close()
+            assert len(self.window.event_handlers[Ping.type]) == 1 and not menu.handlers
+        finally:
+            self.window.unregister_event_handler(Ping, outside)
+
+    def test_group_counts(self) -> None:
+        def active_handlers() -> int:
+            return sum(group is None or group.active for _, group in self.window.event_handlers[Ping.type].snapshot)
+        page = HandlerGroup(enabled=False)
+        with page.collect():
+            for name in 'ab':
+                self.window.register_event_handler(Ping, self.handler(name))
+            menu = HandlerGroup()
+            with menu.collect():
+                self.window.register_event_handler(Ping, self.handler('menu'))
+                options = HandlerGroup(enabled=False)
+                with options.collect():
+                    self.window.register_event_handler(Ping, self.handler('option'))
+        assert page.event_types == {Ping.type: 3} and menu.event_types == {Ping.type: 1}, "disabled subgroups shouldn't be counted"
+        for group, enabled in [(page, True), (options, True), (menu, False), (page, False), (menu, True), (page, True), (options, False)]:
+            group.enable() if enabled else group.disable()
+            assert self.window.event_handlers[Ping.type].active == active_handlers(), f"wrong count after toggling {group}"
+        assert page.event_types == {Ping.type: 3}
+        page.close()
+        assert not page.event_types and Ping.type not in menu.event_types
+
+    def test_widget_groups(self) -> None:
+        from asyncui.graphics import Group, Button, Box, OptionMenu
+        from asyncui.display import Color
+        clicks: list[int] = []
+        def click(pos: tuple[int, int]) -> None:
+            for event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.window._handle_event(events.marshal(pygame.event.Event(event_type, pos=pos, button=1, touch=False)))
+        buttons = Group((0, 0), [Button((index * 10, 0), Box(..., (10, 10), Color.BLACK), lambda index=index: clicks.append(index)) for index in range(5)]) #type: ignore
+        handlers = len(self.window.event_handlers.get(pygame.MOUSEBUTTONUP, ()))
+        with buttons:
+            click((15, 5))
+            registered = len(self.window.event_handlers[pygame.MOUSEBUTTONUP])
+        click((15, 5))
+        with buttons:
+            click((45, 5))
+        assert clicks == [1, 4], clicks
+        assert len(self.window.event_handlers[pygame.MOUSEBUTTONUP]) == registered == handlers + 5, "disabling a group unregistered it's handlers"
+        buttons.handler_group.close()
+        assert len(self.window.event_handlers[pygame.MOUSEBUTTONUP]) == handlers
+
+        switch = Button(..., Box(..., (10, 10), Color.BLACK), ...)
+        options = [Button(..., Box(..., (10, 10), Color.BLACK), lambda index=index: clicks.append(index)) for index in (10, 11)]  #type: ignore
+        menu = OptionMenu((50, 50), (10, 30), switch, options)
+        clicks.clear()
+        with menu:
+            click((55, 65))
+            click((55, 55))
+            click((55, 65))
+            click((55, 55))
+            click((55, 65))
+        assert clicks == [10], clicks
+        menu.handler_group.close()
+
+        # Opening a menu before it's first enabled
+        menu = OptionMenu((50, 50), (10, 30), switch, options)
+        menu._close_or_open()
+        clicks.clear()
+        with menu:
+            click((55, 65))
+        assert menu.open and clicks == [10], clicks
+        menu.handler_group.close()
+
+class Pinged:
+    def __init__(self) -> None:
+        self.pings: list[int] = []
+    @event_handler_method(Ping, weak=True)
+    def on_ping(self, event: Ping) -> None:
+        self.pings.append(event.value)
+    @event_handler_method
+    def on_ping_strong(self, event: Ping) -> None:
+        self.pings.append(event.value)
+
+class TestWeakHandlers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+    def test_dropped_instances_are_unregistered(self) -> None:
+        pinged = Pinged()
+        pinged.on_ping.register()
+        self.window._handle_event(Ping(1))
+        assert pinged.pings == [1]
+        handler = pinged.on_ping.function
+        del pinged
+        gc.collect()
+        assert self.window._dead_handlers, "the weak handler kept it's instance alive"
+        handler(Ping(2))
+        self.window._handle_event(Ping(3))
+        assert not self.window.is_event_handler_registered(Ping, handler), "the handler of a collected instance is still registered"
+    def test_strong_by_default(self) -> None:
+        pinged = Pinged()
+        pinged.on_ping_strong.register()
+        pings = pinged.pings
+        del pinged
+        gc.collect()
+        self.window._handle_event(Ping(1))
+        assert pings == [1], "a strong handler's instance was collected"
+        handlers = self.window.event_handlers[Ping.type]
+        for handler, _ in handlers.snapshot:
+            self.window.unregister_event_handler(Ping, handler)
+
+    def test_widgets_are_strong_by_default(self) -> None:
+        from asyncui.graphics import Clickable
+        clicks: list[tuple[int, int]] = []
+        # An invisible hit region, which nothing else references
+        Clickable((0, 0), (10, 10), lambda event: clicks.append(event.pos)).enable()
+        gc.collect()
+        for event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            self.window._handle_event(events.marshal(pygame.event.Event(event_type, pos=(5, 5), button=1, touch=False)))
+        assert clicks == [(5, 5)], "an enabled widget was collected"
+        for event_type in (events.MouseButtonDown, events.MouseButtonUp):
+            for handler, _ in self.window.event_handlers[event_type.type].snapshot:
+                if isinstance(handler, functools.partial) and isinstance(handler.args[0], Clickable):
+                    self.window.unregister_event_handler(event_type, handler)
+
+    def test_widgets_soak(self) -> None:
+        """Enabled widgets which are dropped are collected, ASYNCUI_SOAK_WIDGETS sets how many are built, 1,000,000 for a full soak"""
+        from asyncui.graphics import Button, Box
+        from asyncui.display import Color
+        class WeakButton(Button[Box]):
+            weak_handlers = True
+        total = int(os.environ.get('ASYNCUI_SOAK_WIDGETS', 20_000))
+        def churn(count: int) -> int:
+            for index in range(count):
+                WeakButton((index % 100, 0), Box(..., (10, 10), Color.BLACK), lambda: None).enable()
+            gc.collect()
+            # The dead handlers are unregistered with the next event
+            self.window._handle_event(Ping(0))
+            current, _ = tracemalloc.get_traced_memory()
+            return current
+        tracemalloc.start()
+        try:
+            warm = churn(total // 10)
+            end = churn(total - total // 10)
+        finally:
+            tracemalloc.stop()
+        assert len(self.window.event_handlers.get(pygame.MOUSEBUTTONUP, ())) == 0, "dropped widgets' handlers are still registered"
+        assert end - warm < 256 * 1024, f"memory grew by {(end - warm) / 1024:.0f}KiB while building and dropping {total} widgets"
+
+class TestDamageTracking(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.clips: list[pygame.Rect] = []
+        self.renderer = Renderer(60, lambda window: self.clips.append(window.window.get_clip()), damage_tracking=True)
+    def frame(self) -> list[pygame.Rect]:
+        self.clips.clear()
+        self.renderer.render_frame(self.window)
+        return sorted(self.clips)
+
+    def test_only_damage_is_rendered(self) -> None:
+        screen = self.window.window.get_rect()
+        assert self.frame() == [screen], "the first frame isn't rendered in full"
+        assert self.frame() == [], "a frame without damage was rendered"
+        self.renderer.damage(pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10), pygame.Rect(50, 50, 5, 5), pygame.Rect(-10, -10, 5, 5))
+        assert self.frame() == [pygame.Rect(0, 0, 15, 15), pygame.Rect(50, 50, 5, 5)], "overlapping rects weren't merged, or rects outside the screen were rendered"
+        assert self.window.window.get_clip() == screen, "the clip wasn't restored"
+        self.renderer.damage(*(pygame.Rect(index * 3, 0, 1, 1) for index in range(Renderer.max_damaged_rects + 1)))
+        assert self.frame() == [pygame.Rect(0, 0, Renderer.max_damaged_rects * 3 + 1, 1)]
+        self.renderer.damage_all()
+        assert self.frame() == [screen]
+
+    def test_groups_skip_widgets_outside_the_clip(self) -> None:
+        from asyncui.graphics import Group, Box
+        from asyncui.display import Color
+        drawn: list[int] = []
+        class Counted(Box):
+            def draw(self, window: pygame.Surface, scale: float) -> None:
+                drawn.append(self.position[0])
+            def reposition(self, position: typing.Any) -> 'Counted':
+                return Counted(position, self.size, self.color)
+        group = Group((0, 0), [Counted((index * 10, 0), (10, 10), Color.BLACK) for index in range(10)])
+        group.draw(self.window.window, 1)
+        assert len(drawn) == 10
+        drawn.clear()
+        surface = self.window.window
+        surface.set_clip(pygame.Rect(35, 0, 10, 10))
+        try:
+            group.draw(surface, 1)
+        finally:
+            surface.set_clip(None)
+        assert drawn == [30, 40], drawn
+
+class TestOnDemandRendering(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.window.set_clock(VirtualClock(self.window.time()))
+    def tearDown(self) -> None:
+        self.window.set_clock(Clock())
+
+    def test_frames_are_only_rendered_when_invalidated(self) -> None:
+        frames: list[float] = []
+        renderer = self.window.start_renderer(60, lambda window: frames.append(window.time()), on_demand=True)
+        async def main() -> None:
+            await asyncio.sleep(10)
+            assert len(frames) == 1, f"{len(frames)} frames were rendered without the window being invalidated"
+            assert self.window.frame_deadline == math.inf, "an idle renderer has a frame deadline"
+            self.window.invalidate()
+            self.window.invalidate()
+            await asyncio.sleep(1)
+            assert len(frames) == 2
+            # An animation invalidating the window every millisecond is capped at 60 FPS
+            start = len(frames)
+            for _ in range(1000):
+                self.window.invalidate()
+                await asyncio.sleep(0.001)
+            assert 59 <= len(frames) - start <= 61, f"{len(frames) - start} frames in a second at 60 FPS"
+        try:
+            self.window.run_until_complete(main())
+        finally:
+            renderer.stop()
+        self.window.run_until_complete(asyncio.sleep(0))
+        assert not renderer.running()
+
+class TestFramePacing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.window = headless_window()
+        self.clock = VirtualClock(self.window.time())
+        self.window.set_clock(self.clock)
+    def tearDown(self) -> None:
+        self.window.set_clock(Clock())
+
+    def render(self, frame_time: typing.Callable[[int], float]) -> tuple[list[float], FrameStats]:
+        window = self.window
+        starts: list[float] = []
+        def renderer(window: Window) -> None:
+            starts.append(window.time())
+            self.clock.advance(frame_time(len(starts)))
+        renderer_ = window.start_renderer(50, renderer)
+        try:
+            window.run_until_complete(asyncio.sleep(10))
+        finally:
+            renderer_.stop()
+        window.run_until_complete(asyncio.sleep(0.05))
+        return starts, renderer_.stats
+
+    def test_frames_keep_to_absolute_deadlines(self) -> None:
+        # Frames taking most of their budget don't push the following frames back
+        starts, stats = self.render(lambda frame: 0.015)
+        assert len(starts) in (500, 501), f"{len(starts)} frames in 10 seconds at 50 FPS"
+        assert stats.missed == stats.skipped == 0
+        assert round(stats.fps, 6) == 50 and round(stats.p50, 9) == round(stats.p99, 9) == 0.02, stats
+        assert stats.frames == len(starts) and len(stats.frame_times) == stats.size
+
+    def test_switching_clocks_keeps_the_frame_grid(self) -> None:
+        frames: list[float] = []
+        self.window.set_clock(Clock())
+        renderer = self.window.start_renderer(60, lambda window: frames.append(window.time()))
+        async def main() -> None:
+            await asyncio.sleep(0.1)
+            self.window.set_clock(VirtualClock(0.0))
+            start = len(frames)
+            await asyncio.sleep(10)
+            assert 599 <= len(frames) - start <= 601, f"{len(frames) - start} frames in 10 virtual seconds at 60 FPS"
+        try:
+            self.window.run_until_complete(main())
+        finally:
+            renderer.stop()
+        self.window.run_until_complete(asyncio.sleep(0.05))
+        assert min(renderer.stats.frame_times) > 0, "a frame time spans both clocks"
+        assert round(renderer.stats.fps, 3) == 60, renderer.stats
+
+    def test_late_frames_are_skipped(self) -> None:
+        # Every 10th frame takes 2.5 frames, the 2 frames which are already late are skipped
+        starts, stats = self.render(lambda frame: 0.05 if frame % 10 == 0 else 0.001)
+        assert stats.missed == len(starts) // 10, stats
+        assert stats.skipped == 2 * stats.missed
+        slots = [(start - starts[0]) / 0.02 for start in starts]
+        assert all(abs(slot - round(slot)) < 1e-6 for slot in slots), "a frame started off the frame grid"
+        assert round(stats.p99, 9) == 0.06 and round(stats.p50, 9) == 0.02, stats
+
+if __name__ == "__main__":
+    unittest.main()